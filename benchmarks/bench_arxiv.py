@@ -0,0 +1,89 @@
+"""
+arXiv metadata lookups and PDF downloads against a local stand-in.
+
+Compares one lookup per ID with a single batched ``id_list`` query, sequential
+downloads with pooled concurrent ones, and a warm run served from the PDF cache.
+Per-ID lookups are slow by design: the arxiv library spaces API requests 3s apart.
+
+Usage:
+    python -m benchmarks.bench_arxiv --papers 8 --concurrency 4 --latency 0.2 --json arxiv.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from typing import Any, Callable, Dict
+
+from summazier import arxiv_client
+from summazier.arxiv_client import PdfDownloader, fetch_papers, search_arxiv
+
+from .fake_arxiv_server import FakeArxivServer
+
+
+def _timed(fn: Callable[[], Any]) -> float:
+    start = time.perf_counter()
+    fn()
+    return round(time.perf_counter() - start, 4)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--papers", type=int, default=8)
+    parser.add_argument("--pages", type=int, default=12, help="Pages per synthetic PDF")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.2, help="Server latency per request (s)")
+    parser.add_argument("--json", dest="json_out", type=str, default=None, help="Write results to this file")
+    args = parser.parse_args()
+
+    ids = [f"2401.{i:05d}" for i in range(1, args.papers + 1)]
+    results: Dict[str, Any] = {"papers": args.papers, "concurrency": args.concurrency, "latency": args.latency}
+
+    with FakeArxivServer({i: 1 for i in ids}, pages=args.pages, latency=args.latency) as server, \
+            tempfile.TemporaryDirectory() as tmp:
+        results["lookup_per_id_s"] = _timed(lambda: [search_arxiv(arxiv_id=i, api_url=server.api_url) for i in ids])
+        arxiv_client._clients.clear()  # don't let the per-ID run's request spacing leak into the next one
+        server.stats = type(server.stats)()
+        start = time.perf_counter()
+        papers = fetch_papers(ids, api_url=server.api_url)
+        results["lookup_batched_s"] = round(time.perf_counter() - start, 4)
+        results["lookup_batched_api_requests"] = server.stats.api_requests
+        if len(papers) != len(ids):
+            raise SystemExit(f"Expected {len(ids)} papers, got {len(papers)}")
+
+        sequential = PdfDownloader(os.path.join(tmp, "seq"), concurrency=1)
+        results["download_sequential_s"] = _timed(lambda: [sequential.download(p) for p in papers])
+        sequential.close()
+
+        concurrent = PdfDownloader(os.path.join(tmp, "conc"), concurrency=args.concurrency)
+
+        async def download_all() -> None:
+            for path in await concurrent.download_many(papers):
+                if isinstance(path, BaseException):
+                    raise path
+            await concurrent.aclose()
+
+        server.stats = type(server.stats)()
+        results["download_concurrent_s"] = _timed(lambda: asyncio.run(download_all()))
+        results["download_concurrent_max_in_flight"] = server.stats.max_in_flight
+
+        before = server.stats.pdf_requests
+        warm = PdfDownloader(os.path.join(tmp, "conc"), concurrency=args.concurrency)
+        results["download_cached_s"] = _timed(lambda: [warm.download(p) for p in papers])
+        results["download_cached_network_requests"] = server.stats.pdf_requests - before
+        results["download_cached_hits"] = warm.cache_hits
+        warm.close()
+
+    for key, value in results.items():
+        print(f"{key:<36} {value}")
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
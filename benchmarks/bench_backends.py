@@ -0,0 +1,113 @@
+"""
+Throughput of concurrent papers spread over several LLM backends.
+
+Starts ``--backends`` fake Ollama servers (each with ``--latency`` before replying) and
+runs ``--papers`` synthetic papers through ``run_pipeline_async`` at once, first against
+a single backend and then balanced across all of them (``OLLAMA_URLS``). Reports wall
+time and how calls were spread. With ``--fail_one``, the first backend goes down halfway
+through a second balanced run to show eviction and re-routing.
+
+Usage:
+    python -m benchmarks.bench_backends --backends 1 2 4 --papers 8 --per_backend 4 --json backends.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import tempfile
+import threading
+import time
+from contextlib import ExitStack
+from dataclasses import replace
+from typing import Any, Dict, List
+
+from summazier import balancer
+from summazier.config import AppConfig
+from summazier.pipeline import run_pipeline_async
+
+from .eval_compression import synthetic_sections
+from .fake_llm_server import FakeLLMServer, ServerSettings
+
+
+async def _run_papers(config: AppConfig, papers: int, seed: int) -> None:
+    await asyncio.gather(
+        *(
+            run_pipeline_async(config, synthetic_sections(3, seed + i), model="fake", use_cache=False, dedup=False)
+            for i in range(papers)
+        )
+    )
+
+
+def run_once(servers: List[FakeLLMServer], papers: int, per_backend: int, fail_after: float, seed: int) -> Dict[str, Any]:
+    balancer.close_backend_pools()
+    for server in servers:
+        server.reset_stats()
+        server.down = False
+    config = replace(
+        AppConfig.from_env(),
+        provider="ollama",
+        base_url=None,
+        output_dir=tempfile.mkdtemp(),
+        cache_enabled=False,
+        max_concurrency=per_backend,
+        ollama_urls=",".join(f"{s.url}={per_backend}" for s in servers),
+        backend_health_interval=0.5,
+        llm_retry_base_delay=0.1,
+    )
+    timer = threading.Timer(fail_after, lambda: setattr(servers[0], "down", True)) if fail_after > 0 else None
+    start = time.perf_counter()
+    if timer is not None:
+        timer.start()
+    asyncio.run(_run_papers(config, papers, seed))
+    wall = time.perf_counter() - start
+    if timer is not None:
+        timer.cancel()
+    stats = balancer.backend_stats()
+    return {
+        "backends": len(servers),
+        "papers": papers,
+        "failed_one": fail_after > 0,
+        "wall_seconds": round(wall, 3),
+        "requests": [s.stats.requests for s in servers],
+        "max_in_flight": [s.stats.max_in_flight for s in servers],
+        "evictions": sum(b["evictions"] for pool in stats for b in pool["backends"]),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--papers", type=int, default=8, help="Papers summarized concurrently")
+    parser.add_argument("--per_backend", type=int, default=4, help="Concurrent calls per backend")
+    parser.add_argument("--latency", type=float, default=0.3, help="Seconds each fake backend takes per call")
+    parser.add_argument("--fail_one", action="store_true", help="Also take one backend down mid-run")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", dest="json_out", type=str, default=None, help="Write results to this file")
+    args = parser.parse_args()
+
+    rows = []
+    settings = ServerSettings(latency=args.latency, tokens_per_second=0)
+    with ExitStack() as stack:
+        servers = [stack.enter_context(FakeLLMServer(settings)) for _ in range(max(args.backends))]
+        runs = [(n, 0.0) for n in args.backends]
+        if args.fail_one:
+            runs += [(n, args.latency * 2) for n in args.backends if n > 1]
+        for n, fail_after in runs:
+            row = run_once(servers[:n], args.papers, args.per_backend, fail_after, args.seed)
+            failed = "  (one down mid-run, {} evictions)".format(row["evictions"]) if row["failed_one"] else ""
+            print(
+                f"backends={n:<2} wall {row['wall_seconds']:>6.2f}s  requests {row['requests']}  "
+                f"max in flight {row['max_in_flight']}{failed}"
+            )
+            rows.append(row)
+        balancer.close_backend_pools()
+
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump({"latency": args.latency, "per_backend": args.per_backend, "results": rows}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+LLM work for a burst of identical uploads, with and without in-flight coalescing.
+
+Starts the app under uvicorn with a slow fake LLM server behind it and posts the same
+synthetic PDF to ``/analyze`` ``--uploads`` times at once (cache off, so only coalescing
+can save work), once with ``COALESCE_ENABLED=0`` and once with it on. Reports wall time,
+how many requests reached the LLM server and how many uploads shared another's run.
+
+Usage:
+    python -m benchmarks.bench_coalescing --uploads 8 --latency 0.3 --json coalescing.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict
+
+import httpx
+import uvicorn
+
+from .bench_web_parsing import _free_port
+from .fake_llm_server import FakeLLMServer, ServerSettings
+from .synthetic import LAYOUTS, make_paper_pdf
+
+
+def run_once(pdf: bytes, uploads: int, coalesce: bool, llm: FakeLLMServer) -> Dict[str, Any]:
+    os.environ["COALESCE_ENABLED"] = "1" if coalesce else "0"
+    llm.reset_stats()
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config("summazier.web:app", host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+
+    def upload(_: int) -> Dict[str, Any]:
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=600) as client:
+            resp = client.post(
+                "/analyze",
+                files={"pdf_file": ("paper.pdf", pdf, "application/pdf")},
+                data={"model": "fake", "no_cache": "true"},
+            )
+            resp.raise_for_status()
+            return resp.json()
+
+    try:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=uploads) as pool:
+            responses = list(pool.map(upload, range(uploads)))
+        wall = time.perf_counter() - start
+    finally:
+        server.should_exit = True
+        thread.join()
+
+    return {
+        "coalesce": coalesce,
+        "uploads": uploads,
+        "wall_seconds": round(wall, 3),
+        "llm_requests": llm.stats.requests,
+        "coalesced_uploads": sum(bool(r.get("coalesced")) for r in responses),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=8)
+    parser.add_argument("--uploads", type=int, default=8, help="Identical concurrent /analyze requests")
+    parser.add_argument("--latency", type=float, default=0.3, help="Seconds the fake LLM takes per call")
+    parser.add_argument("--json", dest="json_out", type=str, default=None, help="Write results to this file")
+    args = parser.parse_args()
+
+    results = []
+    settings = ServerSettings(latency=args.latency, tokens_per_second=0)
+    with tempfile.TemporaryDirectory() as tmp, FakeLLMServer(settings) as llm:
+        os.environ.update({
+            "PROVIDER": "ollama",
+            "BASE_URL": llm.url,
+            "CACHE_ENABLED": "0",
+            "DEDUP_ENABLED": "0",
+            "OUTPUT_DIR": os.path.join(tmp, "output"),
+            "TMP_DIR": os.path.join(tmp, "tmp"),
+        })
+        with open(make_paper_pdf(os.path.join(tmp, "paper.pdf"), args.pages, LAYOUTS["standard"]), "rb") as f:
+            pdf = f.read()
+        for coalesce in (False, True):
+            row = run_once(pdf, args.uploads, coalesce, llm)
+            print(
+                f"coalesce={'on ' if coalesce else 'off'} wall {row['wall_seconds']:>6.2f}s  "
+                f"LLM requests {row['llm_requests']:>4}  shared uploads {row['coalesced_uploads']}/{args.uploads}"
+            )
+            results.append(row)
+
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump({"pages": args.pages, "latency": args.latency, "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
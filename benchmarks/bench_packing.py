@@ -0,0 +1,83 @@
+"""
+LLM calls and wall time with and without packing short sections into one call.
+
+Runs synthetic papers (``--paragraphs`` per section; fewer = shorter sections) through
+``run_pipeline_async`` against a fake Ollama server that takes ``--latency`` per request
+and serves one request at a time, like a default local Ollama. Reports calls, prompt
+tokens and wall time per setting, with ``PACK_SECTIONS`` off and on.
+
+Usage:
+    python -m benchmarks.bench_packing --paragraphs 1 2 4 --latency 0.5 --json packing.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import tempfile
+import time
+from dataclasses import replace
+from typing import Any, Dict
+
+from summazier.chunking import estimate_tokens
+from summazier.config import AppConfig
+from summazier.pipeline import run_pipeline_async
+
+from .eval_compression import synthetic_sections
+from .fake_llm_server import FakeLLMServer, ServerSettings
+
+
+def run_once(llm: FakeLLMServer, model: str, paragraphs: int, pack: bool, seed: int) -> Dict[str, Any]:
+    config = replace(
+        AppConfig.from_env(),
+        provider="ollama",
+        base_url=llm.url,
+        output_dir=tempfile.mkdtemp(),
+        cache_enabled=False,
+        max_concurrency=1,
+    )
+    sections = synthetic_sections(paragraphs, seed)
+    llm.reset_stats()
+    start = time.perf_counter()
+    result = asyncio.run(run_pipeline_async(config, sections, model=model, pack=pack, use_cache=False, dedup=False))
+    wall = time.perf_counter() - start
+    return {
+        "paragraphs": paragraphs,
+        "section_tokens": {key: estimate_tokens(text) for key, text in sections.items()},
+        "pack": pack,
+        "llm_calls": llm.stats.requests,
+        "prompt_tokens": llm.stats.prompt_tokens,
+        "wall_seconds": round(wall, 3),
+        "section_calls": sorted({stage for stage in result.models if stage.startswith("section:")}),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--paragraphs", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--model", type=str, default="llama3.2:1b", help="Decides the chunk budget packs must fit")
+    parser.add_argument("--latency", type=float, default=0.5, help="Seconds the fake Ollama takes per request")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", dest="json_out", type=str, default=None, help="Write results to this file")
+    args = parser.parse_args()
+
+    rows = []
+    with FakeLLMServer(ServerSettings(latency=args.latency, tokens_per_second=0)) as llm:
+        for paragraphs in args.paragraphs:
+            for pack in (False, True):
+                row = run_once(llm, args.model, paragraphs, pack, args.seed)
+                print(
+                    f"paragraphs={paragraphs} pack={'on ' if pack else 'off'} calls {row['llm_calls']:>2}  "
+                    f"prompt tok {row['prompt_tokens']:>5}  wall {row['wall_seconds']:>5.2f}s  "
+                    f"sections {' '.join(row['section_calls'])}"
+                )
+                rows.append(row)
+
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump({"model": args.model, "latency": args.latency, "results": rows}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Serial vs. parallel PDF text extraction.
+
+Usage:
+    python -m benchmarks.bench_pdf_extract --pages 50 200 400 --repeat 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from summazier.pdf_utils import extract_text_from_pdf
+
+from .synthetic import make_paper_pdf
+
+
+def _best_of(repeat: int, fn) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, nargs="+", default=[50, 200, 400])
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", dest="json_out", type=str, default=None, help="Write results to this file")
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for num_pages in args.pages:
+            path = make_paper_pdf(os.path.join(tmp, f"paper_{num_pages}.pdf"), num_pages)
+            serial_text = extract_text_from_pdf(path, workers=1)
+            parallel_text = extract_text_from_pdf(path, workers=args.workers, min_pages_for_parallel=0)
+            if serial_text != parallel_text:
+                raise SystemExit(f"Parallel output differs from serial for {num_pages} pages")
+
+            serial = _best_of(args.repeat, lambda: extract_text_from_pdf(path, workers=1))
+            parallel = _best_of(
+                args.repeat,
+                lambda: extract_text_from_pdf(path, workers=args.workers, min_pages_for_parallel=0),
+            )
+            row = {
+                "pages": num_pages,
+                "workers": args.workers,
+                "serial_s": round(serial, 4),
+                "parallel_s": round(parallel, 4),
+                "serial_pages_per_s": round(num_pages / serial, 1),
+                "parallel_pages_per_s": round(num_pages / parallel, 1),
+                "speedup": round(serial / parallel, 2),
+            }
+            results.append(row)
+            print(
+                f"{num_pages:>5} pages  serial {row['serial_s']:.3f}s ({row['serial_pages_per_s']} p/s)  "
+                f"parallel {row['parallel_s']:.3f}s ({row['parallel_pages_per_s']} p/s)  x{row['speedup']}"
+            )
+
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
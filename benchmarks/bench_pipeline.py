@@ -0,0 +1,240 @@
+"""
+End-to-end and per-stage benchmark against a local fake LLM server.
+
+Generates synthetic papers, starts :mod:`benchmarks.fake_llm_server`, and times
+``extract_text_from_pdf``, ``split_into_sections``, ``run_pipeline_sync``,
+``run_pipeline_async`` and ``POST /analyze``. Results are written as JSON; pass
+``--baseline`` with an earlier results file to fail on regressions.
+
+Usage:
+    python -m benchmarks.bench_pipeline --pages 8 32 --layouts standard numbered --json results.json
+    python -m benchmarks.bench_pipeline --json new.json --baseline results.json --tolerance 0.25
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import replace
+from typing import Any, Callable, Dict, List, Tuple
+
+from summazier.config import AppConfig
+from summazier.fused import PIPELINE_MODES
+from summazier.pdf_utils import extract_text_from_pdf, split_into_sections
+from summazier.pipeline import run_pipeline_async, run_pipeline_sync
+
+from .fake_llm_server import FakeLLMServer, add_server_arguments, settings_from_args
+from .synthetic import LAYOUTS, make_paper_pdf
+
+MODEL = "fake"
+
+
+def _timed(repeat: int, fn: Callable[[], Any]) -> Tuple[List[float], Any]:
+    times = []
+    value = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        value = fn()
+        times.append(time.perf_counter() - start)
+    return times, value
+
+
+def _summary(times: List[float]) -> Dict[str, float]:
+    return {"seconds": round(min(times), 4), "median_seconds": round(statistics.median(times), 4)}
+
+
+def _endpoint(server: FakeLLMServer, provider: str) -> str:
+    return server.url + "/v1" if provider == "openai" else server.url
+
+
+def _pipeline_config(base: AppConfig, server: FakeLLMServer, provider: str, concurrency: int) -> AppConfig:
+    return replace(
+        base,
+        provider=provider,
+        base_url=_endpoint(server, provider),
+        openai_api_key="sk-fake",
+        openai_model=MODEL,
+        cache_enabled=False,  # every run must reach the server
+        max_concurrency=concurrency,
+    )
+
+
+def _stage_seconds(timings: Dict[str, Any]) -> Dict[str, float]:
+    # Fold "section:<name>" entries into one figure; they overlap in the async pipeline
+    out: Dict[str, float] = {}
+    for name, values in timings.get("stages", {}).items():
+        if not name.startswith("section:"):
+            out[name] = values["seconds"]
+    return out
+
+
+def bench_cpu(path: str, layout: str, pages: int, repeat: int) -> Tuple[List[Dict[str, Any]], Dict[str, str]]:
+    times, text = _timed(repeat, lambda: extract_text_from_pdf(path))
+    extract = {"benchmark": "extract", "layout": layout, "pages": pages, **_summary(times)}
+    extract["pages_per_second"] = round(pages / extract["seconds"], 1)
+
+    times, sections = _timed(repeat, lambda: split_into_sections(text))
+    split = {"benchmark": "split", "layout": layout, "pages": pages, **_summary(times)}
+    split["mb_per_second"] = round(len(text.encode("utf-8")) / 1e6 / split["seconds"], 2) if split["seconds"] else None
+    split["sections_found"] = sorted(k for k, v in sections.items() if v.strip())
+    return [extract, split], sections
+
+
+def bench_pipelines(
+    config: AppConfig,
+    server: FakeLLMServer,
+    sections: Dict[str, str],
+    layout: str,
+    pages: int,
+    repeat: int,
+    mode: str,
+) -> List[Dict[str, Any]]:
+    kwargs = dict(
+        role=config.default_role, model=MODEL, provider=config.provider, base_url=config.base_url,
+        use_cache=False, mode=mode,
+    )
+    runners = {
+        "pipeline_sync": lambda: run_pipeline_sync(config, sections, **kwargs),
+        "pipeline_async": lambda: asyncio.run(run_pipeline_async(config, sections, **kwargs)),
+    }
+    rows = []
+    for name, run in runners.items():
+        server.reset_stats()
+        times, result = _timed(repeat, run)
+        row = {"benchmark": name, "layout": layout, "pages": pages, "provider": config.provider, **_summary(times)}
+        row["mode"] = mode
+        row["result_mode"] = result.mode
+        row["llm_calls"] = result.timings.get("llm_calls", 0)
+        row["server"] = server.stats.to_dict()
+        row["stages"] = _stage_seconds(result.timings)
+        rows.append(row)
+    return rows
+
+
+def bench_analyze(
+    server: FakeLLMServer,
+    provider: str,
+    path: str,
+    layout: str,
+    pages: int,
+    repeat: int,
+    concurrency: int,
+) -> Dict[str, Any]:
+    # The app reads its config from the environment at startup
+    os.environ.update({
+        "PROVIDER": provider,
+        "BASE_URL": _endpoint(server, provider),
+        "OPENAI_API_KEY": "sk-fake",
+        "MAX_CONCURRENCY": str(concurrency),
+        "CACHE_ENABLED": "0",
+    })
+    from fastapi.testclient import TestClient
+
+    from summazier.web import app
+
+    with open(path, "rb") as f:
+        pdf = f.read()
+    form = {"provider": provider, "model": MODEL, "no_cache": "true"}
+
+    with TestClient(app) as client:
+        def post() -> Dict[str, Any]:
+            resp = client.post("/analyze", files={"pdf_file": ("paper.pdf", pdf, "application/pdf")}, data=form)
+            resp.raise_for_status()
+            return resp.json()
+
+        server.reset_stats()
+        times, body = _timed(repeat, post)
+    row = {"benchmark": "analyze", "layout": layout, "pages": pages, "provider": provider, **_summary(times)}
+    row["llm_calls"] = body.get("timings", {}).get("llm_calls", 0)
+    row["server"] = server.stats.to_dict()
+    row["stages"] = _stage_seconds(body.get("timings", {}))
+    return row
+
+
+def _row_key(row: Dict[str, Any]) -> Tuple[Any, ...]:
+    return (row["benchmark"], row["layout"], row["pages"], row.get("provider", ""), row.get("mode", ""))
+
+
+def compare(results: List[Dict[str, Any]], baseline_path: str, tolerance: float) -> List[str]:
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = {_row_key(row): row for row in json.load(f)["results"]}
+    regressions = []
+    for row in results:
+        old = baseline.get(_row_key(row))
+        if old is None or not old["seconds"]:
+            continue
+        ratio = row["seconds"] / old["seconds"]
+        row["vs_baseline"] = round(ratio, 3)
+        if ratio > 1 + tolerance:
+            regressions.append(f"{'/'.join(map(str, _row_key(row)))}: {old['seconds']}s -> {row['seconds']}s (x{ratio:.2f})")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, nargs="+", default=[8, 32])
+    parser.add_argument("--layouts", nargs="+", choices=sorted(LAYOUTS), default=["standard", "numbered"])
+    parser.add_argument("--providers", nargs="+", choices=["ollama", "openai"], default=["ollama", "openai"])
+    parser.add_argument("--modes", nargs="+", choices=list(PIPELINE_MODES), default=["stepwise"])
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per CPU benchmark")
+    parser.add_argument("--llm_repeat", type=int, default=1, help="Runs per pipeline/endpoint benchmark")
+    parser.add_argument("--concurrency", type=int, default=4, help="MAX_CONCURRENCY for the async pipeline")
+    parser.add_argument("--skip_analyze", action="store_true", help="Don't benchmark the /analyze endpoint")
+    parser.add_argument("--json", dest="json_out", type=str, default=None, help="Write results to this file")
+    parser.add_argument("--baseline", type=str, default=None, help="Earlier results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed slowdown vs. baseline (0.2 = 20%%)")
+    add_server_arguments(parser)
+    args = parser.parse_args()
+
+    settings = settings_from_args(args)
+    base_config = AppConfig.from_env()
+    results: List[Dict[str, Any]] = []
+
+    with tempfile.TemporaryDirectory() as tmp, FakeLLMServer(settings) as server:
+        base_config = replace(base_config, output_dir=os.path.join(tmp, "output"), tmp_dir=os.path.join(tmp, "tmp"))
+        os.environ.update({"OUTPUT_DIR": base_config.output_dir, "TMP_DIR": base_config.tmp_dir})
+        for layout in args.layouts:
+            for pages in args.pages:
+                path = make_paper_pdf(os.path.join(tmp, f"{layout}_{pages}.pdf"), pages, LAYOUTS[layout])
+                rows, sections = bench_cpu(path, layout, pages, args.repeat)
+                for provider in args.providers:
+                    config = _pipeline_config(base_config, server, provider, args.concurrency)
+                    for mode in args.modes:
+                        rows.extend(bench_pipelines(config, server, sections, layout, pages, args.llm_repeat, mode))
+                    if not args.skip_analyze:
+                        rows.append(bench_analyze(server, provider, path, layout, pages, args.llm_repeat, args.concurrency))
+                for row in rows:
+                    extra = f"  {row['provider']:<6} {row['llm_calls']:>3} calls" if "provider" in row else ""
+                    if "mode" in row:
+                        extra += f"  {row['mode']} -> {row['result_mode']}"
+                    print(f"{row['benchmark']:<15} {layout:<9} {pages:>4}p  {row['seconds']:>8.3f}s{extra}")
+                results.extend(rows)
+
+    report = {
+        "environment": {
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "server": vars(settings),
+        "results": results,
+    }
+    regressions = compare(results, args.baseline, args.tolerance) if args.baseline else []
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    if regressions:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
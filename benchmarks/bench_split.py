@@ -0,0 +1,118 @@
+"""
+Section splitting on large inputs: span-based splitter vs. the previous regex/concatenation one.
+
+Usage:
+    python -m benchmarks.bench_split --mb 1 4 16 --json split.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+import regex as re
+
+from summazier.pdf_utils import find_section_spans, split_into_sections
+
+from .synthetic import LAYOUTS, paper_lines
+
+
+def legacy_split_into_sections(text: str) -> Dict[str, str]:
+    # The splitter as it was before spans, kept verbatim for comparison
+    normalized = re.sub(r"\n\s*\n", "\n\n", text)
+    sections = {k: "" for k in ("abstract", "introduction", "methods", "results", "discussion", "conclusion", "other")}
+    abs_match = re.search(r"(?is)\babstract\b\s*[:\-]?\s*(.+?)(?=\n\n\s*\b(introduction|background)\b|\Z)", normalized)
+    if abs_match:
+        sections["abstract"] = abs_match.group(1).strip()
+    pattern = re.compile(
+        r"(?im)^(abstract|introduction|background|methods?|materials and methods|experiments|results|discussion|conclusion|acknowledgments?|references)\s*$"
+    )
+    parts = []
+    last_idx = 0
+    current_label = "other"
+    for m in pattern.finditer(normalized):
+        if m.start() > last_idx:
+            parts.append((current_label, normalized[last_idx:m.start()].strip()))
+        current_label = m.group(1).lower()
+        last_idx = m.end()
+    if last_idx < len(normalized):
+        parts.append((current_label, normalized[last_idx:].strip()))
+    for label, body in parts:
+        if not body:
+            continue
+        label_key = (
+            "methods"
+            if label in {"method", "methods", "materials and methods", "experiments"}
+            else "results" if label == "results" else "discussion" if label == "discussion" else "introduction" if label in {"introduction", "background"} else "conclusion" if label == "conclusion" else "other"
+        )
+        sections[label_key] = (sections[label_key] + "\n\n" + body).strip()
+    return sections
+
+
+def make_text(megabytes: float, layout: str) -> str:
+    # Concatenate many synthetic papers so headings repeat, as in proceedings or bundled supplements
+    target = int(megabytes * 1_000_000)
+    papers: List[str] = []
+    size = 0
+    seed = 0
+    while size < target:
+        pages = paper_lines(20, LAYOUTS[layout], seed=seed)
+        paper = "\n\n".join("\n".join(lines) for lines in pages)
+        papers.append(paper)
+        size += len(paper) + 2
+        seed += 1
+    return "\n\n".join(papers)[:target]
+
+
+def measure(fn: Callable[[str], object], text: str, repeat: int) -> Dict[str, float]:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(text)
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    fn(text)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"seconds": round(best, 4), "peak_mb": round(peak / 1e6, 2)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mb", type=float, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--layout", choices=sorted(LAYOUTS), default="standard")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", dest="json_out", type=str, default=None, help="Write results to this file")
+    args = parser.parse_args()
+
+    results = []
+    for mb in args.mb:
+        text = make_text(mb, args.layout)
+        row = {
+            "mb": mb,
+            "layout": args.layout,
+            "headings": len(find_section_spans(text)),
+            "legacy": measure(legacy_split_into_sections, text, args.repeat),
+            "spans": measure(find_section_spans, text, args.repeat),
+            "spans_materialized": measure(split_into_sections, text, args.repeat),
+        }
+        row["speedup"] = round(row["legacy"]["seconds"] / row["spans_materialized"]["seconds"], 2)
+        results.append(row)
+        print(
+            f"{mb:>6} MB  {row['headings']:>6} spans  "
+            f"legacy {row['legacy']['seconds']:.3f}s/{row['legacy']['peak_mb']}MB  "
+            f"spans {row['spans']['seconds']:.3f}s/{row['spans']['peak_mb']}MB  "
+            f"materialized {row['spans_materialized']['seconds']:.3f}s/{row['spans_materialized']['peak_mb']}MB  "
+            f"x{row['speedup']}"
+        )
+
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
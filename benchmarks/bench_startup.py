@@ -0,0 +1,151 @@
+"""
+Import time and CLI startup latency, with and without the daemon.
+
+Measures, each in a fresh interpreter:
+
+- ``imports``: wall time to import each summazier module (median of ``--repeat`` runs),
+  plus the slowest imports under ``summazier.cli`` from ``python -X importtime``
+- ``commands``: wall time of short CLI commands (``--help``, ``search``, a full
+  ``--id`` run against the fake arXiv and LLM servers) run in-process
+  (``DAEMON_FORWARD=0``) and forwarded to a running ``daemon``
+
+Usage:
+    python -m benchmarks.bench_startup --repeat 5 --json startup.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Tuple
+
+from .fake_arxiv_server import FakeArxivServer
+from .fake_llm_server import FakeLLMServer, ServerSettings
+
+MODULES = [
+    "summazier.config",
+    "summazier.cli",
+    "summazier.results_store",
+    "summazier.llm",
+    "summazier.pipeline",
+    "summazier.web",
+]
+PAPER = "2401.00001"
+# The arxiv package spaces API calls 3s apart per client; a daemon's client outlives commands
+ARXIV_DELAY = 3.1
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _import_seconds(module: str, env: Dict[str, str]) -> float:
+    code = f"import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+    out = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True)
+    return float(out.stdout.strip())
+
+
+def slowest_imports(module: str, env: Dict[str, str], top: int) -> List[Dict[str, Any]]:
+    """``module``'s direct imports by cumulative import time (``-X importtime``)."""
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"], env=env, capture_output=True, text=True, check=True
+    )
+    children: List[Tuple[str, int]] = []
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2  # children are listed before their parent, indented
+        if depth == 1:
+            children.append((name.strip(), int(cumulative)))
+        elif depth == 0:
+            if name.strip() == module:
+                break
+            children = []
+    ranked = sorted(children, key=lambda kv: kv[1], reverse=True)[:top]
+    return [{"module": name, "ms": round(us / 1000, 1)} for name, us in ranked]
+
+
+def _command_seconds(args: List[str], env: Dict[str, str], cwd: str) -> float:
+    if "--id" in args and args[0] != "search":
+        time.sleep(ARXIV_DELAY)  # not timed
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-m", "summazier.cli", *args], env=env, cwd=cwd, capture_output=True, check=True)
+    return time.perf_counter() - start
+
+
+def _median(fn, repeat: int) -> float:
+    return round(statistics.median(fn() for _ in range(repeat)), 3)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--pages", type=int, default=8, help="Pages of the fake arXiv paper")
+    parser.add_argument("--top", type=int, default=10, help="Slowest imports to list")
+    parser.add_argument("--json", dest="json_out", type=str, default=None, help="Write results to this file")
+    args = parser.parse_args()
+
+    base_env = dict(os.environ, PYTHONPATH=ROOT + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    report: Dict[str, Any] = {"imports": {}, "commands": {}}
+
+    print("import time (median s)")
+    for module in MODULES:
+        seconds = _median(lambda: _import_seconds(module, base_env), args.repeat)
+        report["imports"][module] = seconds
+        print(f"  {module:<26} {seconds:.3f}")
+    report["slowest_cli_imports"] = slowest_imports("summazier.cli", base_env, args.top)
+    print("slowest imports of summazier.cli: " + ", ".join(f"{r['module']} {r['ms']}ms" for r in report["slowest_cli_imports"]))
+
+    commands = {
+        "help": ["--help"],
+        "search": ["search", "--id", PAPER],
+        "run": ["--id", PAPER, "--model", "fake", "--no_cache", "--no_dedup"],
+    }
+    with tempfile.TemporaryDirectory() as tmp, FakeLLMServer(ServerSettings(latency=0.0, tokens_per_second=0)) as llm, \
+            FakeArxivServer({PAPER: 1}, pages=args.pages, latency=0.0) as arxiv:
+        env = dict(
+            base_env,
+            PROVIDER="ollama",
+            BASE_URL=llm.url,
+            ARXIV_API_URL=arxiv.api_url,
+            DAEMON_SOCKET=os.path.join(tmp, "daemon.sock"),
+            PDF_WORKERS="1",
+        )
+        _command_seconds(commands["run"], dict(env, DAEMON_FORWARD="0"), tmp)  # download the PDF, store a result
+
+        for name, argv in commands.items():
+            report["commands"][name] = {
+                "in_process": _median(lambda: _command_seconds(argv, dict(env, DAEMON_FORWARD="0"), tmp), args.repeat)
+            }
+
+        daemon = subprocess.Popen(
+            [sys.executable, "-m", "summazier.cli", "daemon"], env=env, cwd=tmp, stdout=subprocess.DEVNULL
+        )
+        try:
+            started = time.perf_counter()
+            while not os.path.exists(env["DAEMON_SOCKET"]):
+                if daemon.poll() is not None:
+                    raise SystemExit("daemon exited before listening")
+                time.sleep(0.02)
+            report["daemon_startup_seconds"] = round(time.perf_counter() - started, 3)
+            for name, argv in commands.items():
+                report["commands"][name]["daemon"] = _median(lambda: _command_seconds(argv, env, tmp), args.repeat)
+        finally:
+            _command_seconds(["daemon", "--stop"], env, tmp)
+            daemon.wait(timeout=30)
+
+    print(f"command wall time (median s; daemon took {report['daemon_startup_seconds']}s to start)")
+    for name, row in report["commands"].items():
+        print(f"  {name:<8} in-process {row['in_process']:>6.3f}  daemon {row['daemon']:>6.3f}  ({row['in_process'] / row['daemon']:.1f}x)")
+
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
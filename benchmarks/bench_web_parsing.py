@@ -0,0 +1,131 @@
+"""
+Event-loop responsiveness of the web app while it parses PDFs.
+
+Starts the app under uvicorn with the fake LLM server behind it, posts several large
+synthetic PDFs to ``/analyze`` at once, and meanwhile polls ``/health``. Probe latency
+shows whether parsing blocks the loop; wall time shows how it scales with ``PDF_WORKERS``.
+
+Usage:
+    python -m benchmarks.bench_web_parsing --pages 32 --uploads 4 --pdf_workers 1 4 --json parsing.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+import httpx
+import uvicorn
+
+from .fake_llm_server import FakeLLMServer, ServerSettings
+from .synthetic import LAYOUTS, make_paper_pdf
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _percentile(values: List[float], q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))] if values else 0.0
+
+
+def run_once(pdf: bytes, uploads: int, pdf_workers: int, probe_interval: float) -> Dict[str, Any]:
+    os.environ["PDF_WORKERS"] = str(pdf_workers)
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config("summazier.web:app", host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+
+    url = f"http://127.0.0.1:{port}"
+    probes: List[float] = []
+    stop = threading.Event()
+
+    def probe() -> None:
+        with httpx.Client(base_url=url, timeout=60) as client:
+            while not stop.is_set():
+                start = time.perf_counter()
+                client.get("/health").raise_for_status()
+                probes.append(time.perf_counter() - start)
+                time.sleep(probe_interval)
+
+    def upload(_: int) -> None:
+        with httpx.Client(base_url=url, timeout=600) as client:
+            resp = client.post(
+                "/analyze",
+                files={"pdf_file": ("paper.pdf", pdf, "application/pdf")},
+                data={"model": "fake", "no_cache": "true"},
+            )
+            resp.raise_for_status()
+
+    prober = threading.Thread(target=probe, daemon=True)
+    try:
+        prober.start()
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=uploads) as pool:
+            list(pool.map(upload, range(uploads)))
+        wall = time.perf_counter() - start
+    finally:
+        stop.set()
+        prober.join()
+        server.should_exit = True
+        thread.join()
+
+    return {
+        "pdf_workers": pdf_workers,
+        "uploads": uploads,
+        "wall_seconds": round(wall, 3),
+        "probe_p50_ms": round(statistics.median(probes) * 1000, 1) if probes else None,
+        "probe_p99_ms": round(_percentile(probes, 0.99) * 1000, 1),
+        "probe_max_ms": round(max(probes, default=0.0) * 1000, 1),
+        "probes": len(probes),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=32)
+    parser.add_argument("--uploads", type=int, default=4, help="Concurrent /analyze requests")
+    parser.add_argument("--pdf_workers", type=int, nargs="+", default=[1, os.cpu_count() or 1])
+    parser.add_argument("--probe_interval", type=float, default=0.05, help="Seconds between /health probes")
+    parser.add_argument("--json", dest="json_out", type=str, default=None, help="Write results to this file")
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp, FakeLLMServer(ServerSettings(latency=0.0, tokens_per_second=0)) as llm:
+        os.environ.update({
+            "PROVIDER": "ollama",
+            "BASE_URL": llm.url,
+            "CACHE_ENABLED": "0",
+            "OUTPUT_DIR": os.path.join(tmp, "output"),
+            "TMP_DIR": os.path.join(tmp, "tmp"),
+        })
+        with open(make_paper_pdf(os.path.join(tmp, "paper.pdf"), args.pages, LAYOUTS["standard"]), "rb") as f:
+            pdf = f.read()
+        for workers in args.pdf_workers:
+            row = run_once(pdf, args.uploads, workers, args.probe_interval)
+            print(
+                f"pdf_workers={workers:<3} wall {row['wall_seconds']:>7.2f}s  /health p50 {row['probe_p50_ms']}ms"
+                f"  p99 {row['probe_p99_ms']}ms  max {row['probe_max_ms']}ms"
+            )
+            results.append(row)
+
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump({"pages": args.pages, "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
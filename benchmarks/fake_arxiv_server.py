@@ -0,0 +1,155 @@
+"""
+Local stand-in for the arXiv export API and PDF host.
+
+Serves an Atom feed for ``GET /api/query?id_list=...`` (or any ``search_query``) and
+synthetic PDFs at ``/pdf/<id>``, with configurable latency. Point the app at it with
+``ARXIV_API_URL=http://127.0.0.1:<port>/api/query``.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+from xml.sax.saxutils import escape
+
+from .synthetic import paper_lines, pdf_bytes
+
+_VERSION = re.compile(r"v\d+$")
+
+_FEED_HEAD = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<feed xmlns="http://www.w3.org/2005/Atom" xmlns:opensearch="http://a9.com/-/spec/opensearch/1.1/" '
+    'xmlns:arxiv="http://arxiv.org/schemas/atom">\n'
+    "<title>ArXiv Query</title>\n"
+    "<opensearch:totalResults>{total}</opensearch:totalResults>\n"
+    "<opensearch:startIndex>0</opensearch:startIndex>\n"
+    "<opensearch:itemsPerPage>{total}</opensearch:itemsPerPage>\n"
+)
+
+
+@dataclass
+class ArxivStats:
+    api_requests: int = 0
+    pdf_requests: int = 0
+    max_in_flight: int = 0
+    in_flight: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def to_dict(self) -> Dict[str, int]:
+        return {"api_requests": self.api_requests, "pdf_requests": self.pdf_requests, "max_in_flight": self.max_in_flight}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "FakeArxivServer"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+        stats = self.server.stats
+        with stats._lock:
+            stats.in_flight += 1
+            stats.max_in_flight = max(stats.max_in_flight, stats.in_flight)
+        try:
+            time.sleep(self.server.latency)
+            if url.path == "/api/query":
+                with stats._lock:
+                    stats.api_requests += 1
+                self._send(200, "application/atom+xml", self.server.feed(parse_qs(url.query)).encode("utf-8"))
+            elif url.path.startswith("/pdf/"):
+                with stats._lock:
+                    stats.pdf_requests += 1
+                pdf = self.server.pdf(url.path[len("/pdf/"):])
+                if pdf is None:
+                    self._send(404, "text/plain", b"not found")
+                else:
+                    self._send(200, "application/pdf", pdf)
+            else:
+                self._send(404, "text/plain", b"not found")
+        finally:
+            with stats._lock:
+                stats.in_flight -= 1
+
+    def _send(self, status: int, content_type: str, body: bytes) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class FakeArxivServer(ThreadingHTTPServer):
+    """Threaded fake arXiv; papers are ``{id: version}``. Use as a context manager."""
+
+    daemon_threads = True
+
+    def __init__(self, papers: Dict[str, int], pages: int = 8, latency: float = 0.05, port: int = 0) -> None:
+        super().__init__(("127.0.0.1", port), _Handler)
+        self.papers = dict(papers)
+        self.pages = pages
+        self.latency = latency
+        self.stats = ArxivStats()
+        self._pdfs: Dict[str, bytes] = {}
+        self._pdf_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def api_url(self) -> str:
+        return self.url + "/api/query"
+
+    def _entry(self, arxiv_id: str) -> str:
+        short_id = f"{arxiv_id}v{self.papers[arxiv_id]}"
+        return (
+            "<entry>\n"
+            f"<id>http://arxiv.org/abs/{escape(short_id)}</id>\n"
+            "<updated>2024-01-02T00:00:00Z</updated>\n"
+            "<published>2024-01-01T00:00:00Z</published>\n"
+            f"<title>Synthetic paper {escape(arxiv_id)}</title>\n"
+            "<summary>A synthetic abstract for benchmarking.</summary>\n"
+            "<author><name>A. Author</name></author>\n"
+            "<author><name>B. Author</name></author>\n"
+            f'<link href="http://arxiv.org/abs/{escape(short_id)}" rel="alternate" type="text/html"/>\n'
+            f'<link title="pdf" href="{self.url}/pdf/{escape(short_id)}" rel="related" type="application/pdf"/>\n'
+            '<arxiv:primary_category term="cs.CL" scheme="http://arxiv.org/schemas/atom"/>\n'
+            '<category term="cs.CL" scheme="http://arxiv.org/schemas/atom"/>\n'
+            "</entry>\n"
+        )
+
+    def feed(self, params: Dict[str, List[str]]) -> str:
+        id_list = ",".join(params.get("id_list", [])).split(",")
+        ids = [_VERSION.sub("", i) for i in id_list if i]
+        if not ids:  # a search query: return everything
+            ids = list(self.papers)[: int(params.get("max_results", ["10"])[0])]
+        found = [i for i in ids if i in self.papers]
+        return _FEED_HEAD.format(total=len(found)) + "".join(self._entry(i) for i in found) + "</feed>\n"
+
+    def pdf(self, short_id: str) -> Optional[bytes]:
+        if short_id not in {f"{i}v{v}" for i, v in self.papers.items()}:
+            return None
+        with self._pdf_lock:
+            if short_id not in self._pdfs:
+                self._pdfs[short_id] = pdf_bytes(paper_lines(self.pages, seed=len(self._pdfs)))
+            return self._pdfs[short_id]
+
+    def __enter__(self) -> "FakeArxivServer":
+        self._thread = threading.Thread(target=self.serve_forever, name="fake-arxiv-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
@@ -0,0 +1,376 @@
+"""
+Local stand-in for Ollama and OpenAI chat endpoints, for benchmarking without a GPU or API key.
+
+Speaks ``POST /api/chat`` and ``GET /api/tags`` (Ollama) and ``POST /v1/chat/completions``
+and ``GET /v1/models`` (OpenAI), streaming or not, with configurable latency, generation
+speed and error rate. Setting ``server.down`` answers everything with 503, like a backend
+that is restarting.
+
+Usage:
+    python -m benchmarks.fake_llm_server --port 11500 --latency 0.2 --tokens_per_second 80
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, List, Optional
+
+_WORDS = (
+    "the model results show that our method improves accuracy over baseline approaches "
+    "on benchmark datasets while reducing cost and latency for downstream analysis"
+).split()
+
+
+@dataclass
+class ServerSettings:
+    latency: float = 0.1  # seconds before the first token
+    tokens_per_second: float = 200.0  # 0 = emit everything at once
+    completion_tokens: int = 80
+    error_rate: float = 0.0  # fraction of requests answered with error_status
+    error_status: int = 429
+    retry_after: float = 0.0  # sent with 429s
+    json_error_rate: float = 0.0  # fraction of JSON-mode replies that are not valid JSON
+    seed: Optional[int] = None
+    models: List[str] = field(default_factory=lambda: ["fake:latest"])  # listed by /api/tags and /v1/models
+
+
+@dataclass
+class ServerStats:
+    requests: int = 0
+    errors: int = 0
+    in_flight: int = 0
+    max_in_flight: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def to_dict(self) -> Dict[str, int]:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "max_in_flight": self.max_in_flight,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+        }
+
+
+_JSON_KEYS = re.compile(r"must have exactly these keys: ([^\n]*)")
+
+
+def _wants_json(body: Dict[str, Any]) -> bool:
+    return body.get("format") == "json" or (body.get("response_format") or {}).get("type") == "json_object"
+
+
+def _json_reply(messages: List[Dict[str, Any]], tokens: List[str]) -> List[str]:
+    # Shaped like the fused pipeline's schema; section keys are read back from the prompt
+    prompt = str(messages[-1].get("content", "")) if messages else ""
+    m = _JSON_KEYS.search(prompt)
+    keys = re.findall(r'"([^"]+)"', m.group(1)) if m else []
+    text = "".join(tokens).strip()
+    payload: Dict[str, Any] = {"consolidated": text, "refined": text, "questions": [text[:80] + "?"] * 3}
+    if keys:
+        payload["section_summaries"] = {k: text for k in keys}
+    raw = json.dumps(payload)
+    # Re-split into roughly as many pieces as the plain reply had tokens
+    step = max(1, len(raw) // max(1, len(tokens)))
+    return [raw[i:i + step] for i in range(0, len(raw), step)]
+
+
+_PACK_HEADINGS = re.compile(r"Headings, in order: ([^\n]*)")
+
+
+def _packed_reply(messages: List[Dict[str, Any]], tokens: List[str]) -> List[str]:
+    # One "=== KEY ===" block per section a packed summary prompt asks for; other prompts are left alone
+    prompt = str(messages[-1].get("content", "")) if messages else ""
+    m = _PACK_HEADINGS.search(prompt)
+    if m is None:
+        return tokens
+    out: List[str] = []
+    for heading in re.findall(r"=== [^=]+ ===", m.group(1)):
+        out += [heading, "\n"] + tokens + ["\n\n"]
+    return out
+
+
+def _prompt_tokens(messages: List[Dict[str, Any]]) -> int:
+    # Same ~4 chars/token heuristic the app uses for budgeting
+    return sum(len(str(m.get("content", ""))) for m in messages) // 4
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so client connection pools are exercised
+    server: "FakeLLMServer"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        models = self.server.settings.models
+        if self.server.down:
+            self._send_json(503, {"error": "unavailable"})
+        elif self.path == "/api/tags":
+            self._send_json(200, {"models": [{"name": m, "model": m, "size": 0} for m in models]})
+        elif self.path == "/v1/models":
+            self._send_json(200, {"object": "list", "data": [{"id": m, "object": "model"} for m in models]})
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length) or b"{}")
+        if self.path not in ("/api/chat", "/v1/chat/completions"):
+            self._send_json(404, {"error": "not found"})
+            return
+        if self.server.down:
+            self._send_json(503, {"error": "unavailable"})
+            return
+
+        stats = self.server.stats
+        with stats._lock:
+            stats.requests += 1
+            stats.in_flight += 1
+            stats.max_in_flight = max(stats.max_in_flight, stats.in_flight)
+        try:
+            if self.server.should_fail():
+                with stats._lock:
+                    stats.errors += 1
+                self._send_error_response()
+                return
+            messages = body.get("messages") or []
+            prompt_tokens = _prompt_tokens(messages)
+            tokens = self.server.completion()
+            if _wants_json(body):
+                tokens = _json_reply(messages, tokens) if not self.server.json_should_fail() else tokens
+            else:
+                tokens = _packed_reply(messages, tokens)
+            with stats._lock:
+                stats.prompt_tokens += prompt_tokens
+                stats.completion_tokens += len(tokens)
+            model = body.get("model") or "fake"
+            if self.path == "/api/chat":
+                self._ollama(model, tokens, prompt_tokens, bool(body.get("stream", True)))
+            else:
+                include_usage = bool((body.get("stream_options") or {}).get("include_usage"))
+                self._openai(model, tokens, prompt_tokens, bool(body.get("stream", False)), include_usage)
+        finally:
+            with stats._lock:
+                stats.in_flight -= 1
+
+    def _send_json(self, status: int, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> None:
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_error_response(self) -> None:
+        settings = self.server.settings
+        time.sleep(settings.latency)
+        headers = {}
+        if settings.error_status == 429:
+            headers["Retry-After"] = str(settings.retry_after)
+        error = {"message": "simulated failure", "type": "rate_limit_error" if settings.error_status == 429 else "server_error"}
+        self._send_json(settings.error_status, {"error": error}, headers)
+
+    def _paced(self, tokens: List[str]) -> Iterator[str]:
+        settings = self.server.settings
+        time.sleep(settings.latency)
+        delay = 1.0 / settings.tokens_per_second if settings.tokens_per_second > 0 else 0.0
+        for token in tokens:
+            if delay:
+                time.sleep(delay)
+            yield token
+
+    def _start_chunked(self, content_type: str) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+    def _write_chunk(self, data: str) -> None:
+        raw = data.encode("utf-8")
+        self.wfile.write(f"{len(raw):x}\r\n".encode("ascii") + raw + b"\r\n")
+        self.wfile.flush()
+
+    def _end_chunked(self) -> None:
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+    def _ollama(self, model: str, tokens: List[str], prompt_tokens: int, stream: bool) -> None:
+        started = time.perf_counter()
+        created = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        if not stream:
+            text = "".join(self._paced(tokens))
+            self._send_json(200, {
+                "model": model,
+                "created_at": created,
+                "message": {"role": "assistant", "content": text},
+                "done": True,
+                "total_duration": int((time.perf_counter() - started) * 1e9),
+                "prompt_eval_count": prompt_tokens,
+                "eval_count": len(tokens),
+            })
+            return
+        self._start_chunked("application/x-ndjson")
+        for token in self._paced(tokens):
+            self._write_chunk(json.dumps({
+                "model": model,
+                "created_at": created,
+                "message": {"role": "assistant", "content": token},
+                "done": False,
+            }) + "\n")
+        self._write_chunk(json.dumps({
+            "model": model,
+            "created_at": created,
+            "message": {"role": "assistant", "content": ""},
+            "done": True,
+            "total_duration": int((time.perf_counter() - started) * 1e9),
+            "prompt_eval_count": prompt_tokens,
+            "eval_count": len(tokens),
+        }) + "\n")
+        self._end_chunked()
+
+    def _openai(self, model: str, tokens: List[str], prompt_tokens: int, stream: bool, include_usage: bool) -> None:
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+        created = int(time.time())
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": len(tokens),
+            "total_tokens": prompt_tokens + len(tokens),
+        }
+        if not stream:
+            text = "".join(self._paced(tokens))
+            self._send_json(200, {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+                "usage": usage,
+            })
+            return
+
+        def chunk(choices: List[Dict[str, Any]], **extra: Any) -> str:
+            payload = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": choices,
+                **extra,
+            }
+            return f"data: {json.dumps(payload)}\n\n"
+
+        self._start_chunked("text/event-stream")
+        self._write_chunk(chunk([{"index": 0, "delta": {"role": "assistant", "content": ""}, "finish_reason": None}]))
+        for token in self._paced(tokens):
+            self._write_chunk(chunk([{"index": 0, "delta": {"content": token}, "finish_reason": None}]))
+        self._write_chunk(chunk([{"index": 0, "delta": {}, "finish_reason": "stop"}]))
+        if include_usage:
+            self._write_chunk(chunk([], usage=usage))
+        self._write_chunk("data: [DONE]\n\n")
+        self._end_chunked()
+
+
+class FakeLLMServer(ThreadingHTTPServer):
+    """Threaded fake LLM server; use as a context manager to run it in the background."""
+
+    daemon_threads = True
+
+    def __init__(self, settings: Optional[ServerSettings] = None, host: str = "127.0.0.1", port: int = 0) -> None:
+        super().__init__((host, port), _Handler)
+        self.settings = settings or ServerSettings()
+        self.stats = ServerStats()
+        self.down = False
+        self._rng = random.Random(self.settings.seed)
+        self._rng_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def should_fail(self) -> bool:
+        with self._rng_lock:
+            return self._rng.random() < self.settings.error_rate
+
+    def json_should_fail(self) -> bool:
+        with self._rng_lock:
+            return self._rng.random() < self.settings.json_error_rate
+
+    def completion(self) -> List[str]:
+        with self._rng_lock:
+            words = [self._rng.choice(_WORDS) for _ in range(self.settings.completion_tokens)]
+        return [w if i == 0 else " " + w for i, w in enumerate(words)]
+
+    def reset_stats(self) -> None:
+        self.stats = ServerStats()
+
+    def __enter__(self) -> "FakeLLMServer":
+        self._thread = threading.Thread(target=self.serve_forever, name="fake-llm-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+
+def add_server_arguments(parser: argparse.ArgumentParser) -> None:
+    defaults = ServerSettings()
+    parser.add_argument("--latency", type=float, default=defaults.latency, help="Seconds before the first token")
+    parser.add_argument("--tokens_per_second", type=float, default=defaults.tokens_per_second)
+    parser.add_argument("--completion_tokens", type=int, default=defaults.completion_tokens)
+    parser.add_argument("--error_rate", type=float, default=defaults.error_rate)
+    parser.add_argument("--error_status", type=int, default=defaults.error_status)
+    parser.add_argument("--retry_after", type=float, default=defaults.retry_after)
+    parser.add_argument("--json_error_rate", type=float, default=defaults.json_error_rate)
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def settings_from_args(args: argparse.Namespace) -> ServerSettings:
+    return ServerSettings(
+        latency=args.latency,
+        tokens_per_second=args.tokens_per_second,
+        completion_tokens=args.completion_tokens,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        retry_after=args.retry_after,
+        json_error_rate=args.json_error_rate,
+        seed=args.seed,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", type=str, default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11500)
+    add_server_arguments(parser)
+    args = parser.parse_args()
+
+    server = FakeLLMServer(settings_from_args(args), host=args.host, port=args.port)
+    print(f"Fake LLM server on {server.url} (Ollama: {server.url}, OpenAI: {server.url}/v1)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(json.dumps(server.stats.to_dict()))
+
+
+if __name__ == "__main__":
+    main()
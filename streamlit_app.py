@@ -1,7 +1,5 @@
 from __future__ import annotations
 
-import os
-import tempfile
 from typing import List
 import asyncio
 import json
@@ -45,6 +43,19 @@ def main() -> None:
             help="Analyze only the sections you care about. Fewer sections → faster.",
         )
 
+        mode = st.selectbox(
+            "Pipeline mode",
+            ["stepwise", "fused"],
+            index=0,
+            help="Fused asks for every summary and the questions in one structured call when the paper fits.",
+        )
+
+        compress = st.checkbox(
+            "Compress sections before prompting",
+            value=False,
+            help="Drops equations, references, duplicates and peripheral sentences to cut prompt tokens.",
+        )
+
         num_questions = st.slider("Number of research questions", min_value=1, max_value=10, value=5)
 
         role = st.text_area(
@@ -71,36 +82,16 @@ def main() -> None:
             config = AppConfig.from_env()
             ensure_directories_exist(config)
 
-            # Save uploaded PDF to a temporary file
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_file:
-                tmp_file.write(uploaded_file.read())
-                tmp_path = tmp_file.name
-
-            try:
-                text = extract_text_from_pdf(tmp_path)
-                sections_map = split_into_sections(text)
-                only_sections = parse_sections_input(sections_str)
-
-                # Decide base_url for Ollama (local only; for cloud use OpenAI)
-                base_url = "http://localhost:11434" if provider == "ollama" else None
-
-                # Use async pipeline for providers that support it to parallelize section summaries
-                if provider in ("ollama", "openai"):
-                    result = asyncio.run(
-                        run_pipeline_async(
-                            config=config,
-                            sections=sections_map,
-                            role=role or config.default_role,
-                            model=model or config.openai_model,
-                            max_words=0,
-                            num_questions=num_questions,
-                            provider=provider,
-                            base_url=base_url,
-                            only_sections=only_sections,
-                        )
-                    )
-                else:
-                    result = run_pipeline_sync(
+            # Streamlit keeps the upload in memory; parse that buffer directly instead of
+            # writing a temporary copy for pypdf to read back
+            text = extract_text_from_pdf(uploaded_file)
+            sections_map = split_into_sections(text)
+            only_sections = parse_sections_input(sections_str)
+
+            # Use async pipeline for providers that support it to parallelize section summaries
+            if provider in ("ollama", "openai"):
+                result = asyncio.run(
+                    run_pipeline_async(
                         config=config,
                         sections=sections_map,
                         role=role or config.default_role,
@@ -108,17 +99,32 @@ def main() -> None:
                         max_words=0,
                         num_questions=num_questions,
                         provider=provider,
-                        base_url=base_url,
                         only_sections=only_sections,
+                        compress=compress,
+                        mode=mode,
                     )
-            finally:
-                try:
-                    os.unlink(tmp_path)
-                except OSError:
-                    pass
+                )
+            else:
+                result = run_pipeline_sync(
+                    config=config,
+                    sections=sections_map,
+                    role=role or config.default_role,
+                    model=model or config.openai_model,
+                    max_words=0,
+                    num_questions=num_questions,
+                    provider=provider,
+                    only_sections=only_sections,
+                    compress=compress,
+                    mode=mode,
+                )
 
         # Display results
         st.success("Analysis complete!")
+        if result.compression:
+            st.caption(
+                f"Compression kept {result.compression['kept_tokens']} of "
+                f"{result.compression['original_tokens']} section tokens ({result.compression['ratio']:.0%})."
+            )
 
         st.markdown("### 2️⃣ Analysis results")
 
@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, TypeVar
+
+from . import metrics
+
+# Bump when a stage's output format or meaning changes so old artifacts stop matching
+ARTIFACT_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+
+T = TypeVar("T")
+
+
+def input_key(stage: str, inputs: Dict[str, Any]) -> str:
+    payload = json.dumps([ARTIFACT_VERSION, stage, inputs], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def file_sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def run_dirname(paper_id: str) -> str:
+    # Old-style IDs contain a slash (e.g. hep-th/9901001)
+    return paper_id.replace("/", "_")
+
+
+def _write_json(path: str, data: Any) -> None:
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+class ArtifactStore:
+    """Stage outputs for one paper under ``<root>/<paper>/``, keyed by a hash of each stage's inputs.
+
+    Every computed stage is written as it finishes, and ``manifest.json`` records the key,
+    file and outcome of each stage of the latest run. With ``resume=True`` a stage whose
+    inputs hash to a stored key is loaded instead of recomputed; since downstream inputs
+    include upstream outputs, a change anywhere reruns exactly the stages after it.
+    """
+
+    def __init__(self, root: str, paper_id: str, resume: bool = False, meta: Optional[Dict[str, Any]] = None) -> None:
+        self.path = os.path.join(root, run_dirname(paper_id))
+        self.resume = resume
+        self.reused: List[str] = []
+        self.computed: List[str] = []
+        self._lock = threading.Lock()
+        os.makedirs(self.path, exist_ok=True)
+        previous = self._read_manifest()
+        self.manifest: Dict[str, Any] = {
+            "paper_id": paper_id,
+            **(meta or {}),
+            "status": "running",
+            "resume": resume,
+            "started_at": time.time(),
+            "finished_at": None,
+            "error": "",
+            # Kept from the last run until overwritten, so a failed resume can be resumed again
+            "stages": previous.get("stages", {}),
+        }
+        self._touched: Dict[str, None] = {}
+        self._write_manifest()
+
+    @property
+    def manifest_path(self) -> str:
+        return os.path.join(self.path, MANIFEST_NAME)
+
+    def _read_manifest(self) -> Dict[str, Any]:
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_manifest(self) -> None:
+        _write_json(self.manifest_path, self.manifest)
+
+    def _file(self, stage: str, key: str) -> str:
+        return os.path.join(self.path, f"{stage.replace(':', '_')}-{key[:16]}.json")
+
+    def _record(self, stage: str, key: str, status: str, seconds: float) -> None:
+        with self._lock:
+            (self.reused if status == "reused" else self.computed).append(stage)
+            self._touched[stage] = None
+            self.manifest["stages"][stage] = {
+                "key": key,
+                "file": os.path.basename(self._file(stage, key)),
+                "status": status,
+                "seconds": round(seconds, 4),
+                "updated_at": time.time(),
+            }
+            self._write_manifest()
+
+    def get(self, stage: str, inputs: Dict[str, Any]) -> Optional[Any]:
+        """The stored output for these inputs, or None if not resuming or nothing valid is stored."""
+        if not self.resume:
+            return None
+        key = input_key(stage, inputs)
+        try:
+            with open(self._file(stage, key), "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict) or data.get("key") != key:
+            return None
+        self._record(stage, key, "reused", 0.0)
+        metrics.ARTIFACT_REUSE.inc(stage=stage.split(":", 1)[0])
+        return data.get("value")
+
+    def put(self, stage: str, inputs: Dict[str, Any], value: Any, seconds: float = 0.0) -> None:
+        key = input_key(stage, inputs)
+        _write_json(self._file(stage, key), {"stage": stage, "key": key, "value": value})
+        self._record(stage, key, "computed", seconds)
+
+    def run(self, stage: str, inputs: Dict[str, Any], compute: Callable[[], T]) -> T:
+        """Return the stored output for ``inputs`` or compute and store it; None results aren't stored."""
+        hit = self.get(stage, inputs)
+        if hit is not None:
+            return hit
+        start = time.perf_counter()
+        value = compute()
+        if value is not None:
+            self.put(stage, inputs, value, time.perf_counter() - start)
+        return value
+
+    async def arun(self, stage: str, inputs: Dict[str, Any], compute: Callable[[], Awaitable[T]]) -> T:
+        hit = self.get(stage, inputs)
+        if hit is not None:
+            return hit
+        start = time.perf_counter()
+        value = await compute()
+        if value is not None:
+            self.put(stage, inputs, value, time.perf_counter() - start)
+        return value
+
+    def finish(self, error: str = "", **meta: Any) -> None:
+        """Mark the run complete (dropping artifacts it no longer references) or failed."""
+        with self._lock:
+            self.manifest.update(meta)
+            self.manifest["status"] = "failed" if error else "complete"
+            self.manifest["error"] = error
+            self.manifest["finished_at"] = time.time()
+            if not error:
+                stages = self.manifest["stages"]
+                self.manifest["stages"] = {name: stages[name] for name in self._touched}
+            self._write_manifest()
+        if not error:
+            self._prune()
+
+    def _prune(self) -> None:
+        keep = {entry["file"] for entry in self.manifest["stages"].values()} | {MANIFEST_NAME}
+        for name in os.listdir(self.path):
+            if name not in keep and name.endswith(".json"):
+                try:
+                    os.unlink(os.path.join(self.path, name))
+                except OSError:
+                    pass
+
+    @contextmanager
+    def running(self) -> Iterator["ArtifactStore"]:
+        # BaseException so Ctrl-C also leaves a resumable "failed" manifest
+        try:
+            yield self
+        except BaseException as e:
+            self.finish(error=f"{type(e).__name__}: {e}")
+            raise
+
+
+def checkpoint(store: Optional[ArtifactStore], stage: str, inputs: Dict[str, Any], compute: Callable[[], T]) -> T:
+    return compute() if store is None else store.run(stage, inputs, compute)
+
+
+async def acheckpoint(
+    store: Optional[ArtifactStore],
+    stage: str,
+    inputs: Dict[str, Any],
+    compute: Callable[[], Awaitable[T]],
+) -> T:
+    return await compute() if store is None else await store.arun(stage, inputs, compute)
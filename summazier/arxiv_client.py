@@ -1,10 +1,24 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import json
 import os
+import re
+import threading
+import time
+import uuid
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Sequence, Union
 
 import arxiv  # type: ignore
+import httpx
+
+DEFAULT_API_URL = "https://export.arxiv.org/api/query"
+# arXiv accepts long id_list queries, but keep URLs a sane length
+ID_BATCH_SIZE = 100
+
+_VERSION = re.compile(r"v(\d+)$")
 
 
 @dataclass(frozen=True)
@@ -17,48 +31,262 @@ class ArxivPaper:
     arxiv_id: str
     pdf_url: str
 
+    @property
+    def version(self) -> Optional[int]:
+        m = _VERSION.search(self.arxiv_id)
+        return int(m.group(1)) if m else None
+
+    @property
+    def base_id(self) -> str:
+        return _VERSION.sub("", self.arxiv_id)
+
+
+_clients: Dict[str, arxiv.Client] = {}
+_clients_lock = threading.Lock()
+
 
-def search_arxiv(query: Optional[str] = None, arxiv_id: Optional[str] = None, max_results: int = 3) -> List[ArxivPaper]:
+def _client(api_url: Optional[str]) -> arxiv.Client:
+    # One client per API endpoint so arXiv's request spacing is honoured across calls
+    url = api_url or DEFAULT_API_URL
+    with _clients_lock:
+        client = _clients.get(url)
+        if client is None:
+            client = arxiv.Client(page_size=ID_BATCH_SIZE)
+            client.query_url_format = url + "?{}"
+            _clients[url] = client
+        return client
+
+
+def _to_paper(result: Any) -> ArxivPaper:
+    return ArxivPaper(
+        title=result.title,
+        authors=[a.name for a in result.authors],
+        summary=result.summary,
+        published=str(result.published),
+        updated=str(result.updated),
+        arxiv_id=result.get_short_id(),
+        pdf_url=result.pdf_url,
+    )
+
+
+def search_arxiv(
+    query: Optional[str] = None,
+    arxiv_id: Optional[str] = None,
+    max_results: int = 3,
+    api_url: Optional[str] = None,
+) -> List[ArxivPaper]:
     if not query and not arxiv_id:
         raise ValueError("Provide either query or arxiv_id")
 
     if arxiv_id:
-        search = arxiv.Search(id_list=[arxiv_id])
-    else:
-        search = arxiv.Search(
-            query=query or "",
-            max_results=max_results,
-            sort_by=arxiv.SortCriterion.Relevance,
-        )
-
-    results: List[ArxivPaper] = []
-    for result in search.results():  # type: ignore[attr-defined]
-        paper_id = result.get_short_id()
-        results.append(
-            ArxivPaper(
-                title=result.title,
-                authors=[a.name for a in result.authors],
-                summary=result.summary,
-                published=str(result.published),
-                updated=str(result.updated),
-                arxiv_id=paper_id,
-                pdf_url=result.pdf_url,
+        return fetch_papers([arxiv_id], api_url=api_url)
+    search = arxiv.Search(
+        query=query or "",
+        max_results=max_results,
+        sort_by=arxiv.SortCriterion.Relevance,
+    )
+    return [_to_paper(result) for result in _client(api_url).results(search)]
+
+
+def fetch_papers(arxiv_ids: Sequence[str], api_url: Optional[str] = None) -> List[ArxivPaper]:
+    """Look up many IDs with one ``id_list`` query per :data:`ID_BATCH_SIZE` IDs.
+
+    Unknown IDs are left out; results keep arXiv's order, which follows ``arxiv_ids``.
+    """
+    ids = list(dict.fromkeys(i.strip() for i in arxiv_ids if i.strip()))
+    papers: List[ArxivPaper] = []
+    client = _client(api_url)
+    for start in range(0, len(ids), ID_BATCH_SIZE):
+        batch = ids[start:start + ID_BATCH_SIZE]
+        search = arxiv.Search(id_list=batch, max_results=len(batch))
+        papers.extend(_to_paper(result) for result in client.results(search))
+    return papers
+
+
+def pdf_filename(paper: ArxivPaper) -> str:
+    # Old-style IDs contain a slash (e.g. hep-th/9901001v1)
+    return paper.arxiv_id.replace("/", "_") + ".pdf"
+
+
+class PdfDownloader:
+    """Downloads arXiv PDFs into ``dest_dir`` over one keep-alive connection pool.
+
+    Each PDF gets a ``<name>.pdf.json`` sidecar recording its arXiv version and sha256;
+    a later request for the same version is served from disk if the checksum still matches.
+    """
+
+    def __init__(
+        self,
+        dest_dir: str,
+        concurrency: int = 4,
+        timeout_seconds: float = 60.0,
+        use_cache: bool = True,
+    ) -> None:
+        self.dest_dir = dest_dir
+        self.concurrency = max(1, concurrency)
+        self.timeout_seconds = timeout_seconds
+        self.use_cache = use_cache
+        self.cache_hits = 0
+        self.downloads = 0
+        self._client: Optional[httpx.Client] = None
+        self._async_client: Optional[httpx.AsyncClient] = None
+        self._sem: Optional[asyncio.Semaphore] = None
+        self._lock = threading.Lock()
+
+    def _limits(self) -> httpx.Limits:
+        return httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency)
+
+    def _sync_client(self) -> httpx.Client:
+        with self._lock:
+            if self._client is None:
+                self._client = httpx.Client(
+                    limits=self._limits(), timeout=self.timeout_seconds, follow_redirects=True
+                )
+            return self._client
+
+    def path_for(self, paper: ArxivPaper) -> str:
+        return os.path.join(self.dest_dir, pdf_filename(paper))
+
+    def cached_path(self, paper: ArxivPaper) -> Optional[str]:
+        if not self.use_cache:
+            return None
+        path = self.path_for(paper)
+        try:
+            with open(path + ".json", "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta.get("version") != paper.version:
+                return None
+            if _sha256_file(path) != meta.get("sha256"):
+                return None
+        except (OSError, ValueError):
+            return None
+        return path
+
+    def download(self, paper: ArxivPaper) -> str:
+        path = self.cached_path(paper)
+        if path is not None:
+            self.cache_hits += 1
+            return path
+        with self._sync_client().stream("GET", paper.pdf_url) as resp:
+            resp.raise_for_status()
+            with _PartFile(self.path_for(paper)) as out:
+                for chunk in resp.iter_bytes():
+                    out.write(chunk)
+        return self._finish(paper, out)
+
+    async def adownload(self, paper: ArxivPaper) -> str:
+        path = self.cached_path(paper)
+        if path is not None:
+            self.cache_hits += 1
+            return path
+        if self._async_client is None:
+            self._async_client = httpx.AsyncClient(
+                limits=self._limits(), timeout=self.timeout_seconds, follow_redirects=True
             )
-        )
-    return results
-
-
-def download_pdf(paper: ArxivPaper, dest_dir: str) -> str:
-    os.makedirs(dest_dir, exist_ok=True)
-    filename = f"{paper.arxiv_id}.pdf"
-    dest_path = os.path.join(dest_dir, filename)
-
-    client = arxiv.Client()
-    # Re-fetch to get a result object compatible with download
-    search = arxiv.Search(id_list=[paper.arxiv_id])
-    for result in client.results(search):
-        result.download_pdf(filename=dest_path)
-        break
-    if not os.path.exists(dest_path):
-        raise RuntimeError("Failed to download PDF from arXiv")
-    return dest_path
+            self._sem = asyncio.Semaphore(self.concurrency)
+        assert self._sem is not None
+        async with self._sem:
+            async with self._async_client.stream("GET", paper.pdf_url) as resp:
+                resp.raise_for_status()
+                with _PartFile(self.path_for(paper)) as out:
+                    async for chunk in resp.aiter_bytes():
+                        out.write(chunk)
+        return self._finish(paper, out)
+
+    async def download_many(self, papers: Sequence[ArxivPaper]) -> List[Union[str, BaseException]]:
+        """Download concurrently (up to ``concurrency`` at once); failures are returned, not raised."""
+        return await asyncio.gather(*(self.adownload(p) for p in papers), return_exceptions=True)
+
+    def _finish(self, paper: ArxivPaper, part: "_PartFile") -> str:
+        path = part.commit()
+        self.downloads += 1
+        meta = {
+            "arxiv_id": paper.arxiv_id,
+            "version": paper.version,
+            "sha256": part.sha256,
+            "size": part.size,
+            "url": paper.pdf_url,
+            "downloaded_at": time.time(),
+        }
+        with open(path + ".json", "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        return path
+
+    def close(self) -> None:
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+    async def aclose(self) -> None:
+        self.close()
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+
+
+class _PartFile:
+    # Writes to a temporary name and hashes as it goes; commit() renames it into place
+    # so readers never see a half-written PDF.
+
+    def __init__(self, path: str) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.tmp_path = f"{path}.{uuid.uuid4().hex}.part"
+        self._hash = hashlib.sha256()
+        self.size = 0
+        self._head = b""
+
+    def __enter__(self) -> "_PartFile":
+        self._file = open(self.tmp_path, "wb")
+        return self
+
+    def write(self, chunk: bytes) -> None:
+        if len(self._head) < 5:
+            self._head += chunk[:5]
+        self._hash.update(chunk)
+        self.size += len(chunk)
+        self._file.write(chunk)
+
+    def __exit__(self, exc_type: Any, *exc: Any) -> None:
+        self._file.close()
+        if exc_type is not None:
+            self._discard()
+
+    @property
+    def sha256(self) -> str:
+        return self._hash.hexdigest()
+
+    def commit(self) -> str:
+        # arXiv answers some requests with an HTML page (e.g. while a PDF is being built)
+        if not self._head.startswith(b"%PDF"):
+            self._discard()
+            raise RuntimeError("Failed to download PDF from arXiv: response is not a PDF")
+        os.replace(self.tmp_path, self.path)
+        return self.path
+
+    def _discard(self) -> None:
+        try:
+            os.unlink(self.tmp_path)
+        except OSError:
+            pass
+
+
+def _sha256_file(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+_downloaders: Dict[Any, PdfDownloader] = {}
+
+
+def download_pdf(paper: ArxivPaper, dest_dir: str, use_cache: bool = True) -> str:
+    # Process-wide downloader per directory so repeated calls share connections
+    key = (dest_dir, use_cache)
+    with _clients_lock:
+        downloader = _downloaders.get(key)
+        if downloader is None:
+            downloader = _downloaders[key] = PdfDownloader(dest_dir, use_cache=use_cache)
+    return downloader.download(paper)
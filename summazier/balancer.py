@@ -0,0 +1,337 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Set, Tuple
+
+import httpx
+
+from . import metrics
+from .config import AppConfig
+from .llm import classify_error
+
+logger = logging.getLogger(__name__)
+
+def parse_backends(spec: str, default_max_concurrency: int) -> List[Tuple[str, int]]:
+    """``"http://a:11434=4, http://b:11434"`` -> ``[(url, max_concurrency), ...]``."""
+    backends: List[Tuple[str, int]] = []
+    for entry in spec.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        url, _, cap = entry.rpartition("=") if "=" in entry else (entry, "", "")
+        url = url.strip().rstrip("/")
+        try:
+            max_concurrency = max(1, int(cap)) if cap.strip() else default_max_concurrency
+        except ValueError:
+            raise RuntimeError(
+                f"Invalid backend {entry!r} in OLLAMA_URLS/OPENAI_BASE_URLS/BASE_URL: expected url or "
+                f"url=max_concurrency with an integer cap, e.g. http://gpu1:11434=4"
+            ) from None
+        if url not in (u for u, _ in backends):
+            backends.append((url, max_concurrency))
+    return backends
+
+
+def backend_specs(config: AppConfig, provider: str, base_url: Optional[str]) -> List[Tuple[str, int]]:
+    """Backends for ``provider``: an explicit ``base_url`` (which may itself be a list) wins,
+    then ``OLLAMA_URLS``/``OPENAI_BASE_URLS``, then ``BASE_URL`` for the default provider.
+
+    An empty list means the provider's own default endpoint (localhost:11434 for Ollama).
+    """
+    spec = base_url or {"ollama": config.ollama_urls, "openai": config.openai_urls}.get(provider, "")
+    if not spec and provider == config.provider:
+        spec = config.base_url or ""
+    return parse_backends(spec, config.backend_max_concurrency or config.max_concurrency)
+
+
+def _describe(error: BaseException) -> str:
+    lines = str(error).splitlines()
+    return f"{type(error).__name__}: {lines[0] if lines else ''}"[:200]
+
+
+def _model_names(model: str) -> Set[str]:
+    # Ollama lists "llama3.2:latest" for a model requested as "llama3.2"
+    return {model, model if ":" in model else f"{model}:latest"}
+
+
+@dataclass
+class Backend:
+    url: str
+    max_concurrency: int
+    healthy: bool = True
+    in_flight: int = 0
+    # Models the last probe saw; empty until a probe lists some (then every model is assumed served)
+    models: Set[str] = field(default_factory=set)
+    consecutive_failures: int = 0
+    evicted_at: float = 0.0
+    calls: int = 0
+    failures: int = 0
+    evictions: int = 0
+    last_probe: float = 0.0
+    last_error: str = ""
+
+    def serves(self, model: str) -> bool:
+        return not self.models or bool(self.models & _model_names(model))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "url": self.url,
+            "healthy": self.healthy,
+            "in_flight": self.in_flight,
+            "max_concurrency": self.max_concurrency,
+            "models": sorted(self.models),
+            "calls": self.calls,
+            "failures": self.failures,
+            "evictions": self.evictions,
+            "last_error": self.last_error,
+        }
+
+
+# Without background probes, an evicted backend gets a trial call again after this long
+READMIT_AFTER_SECONDS = 30.0
+
+
+@dataclass(frozen=True)
+class BalancerSettings:
+    health_interval_seconds: float = 15.0  # 0 = no background probes; evicted backends get trial calls instead
+    health_timeout_seconds: float = 2.0
+    max_failures: int = 3  # consecutive connection errors/timeouts before a backend is evicted
+
+
+class BackendPool:
+    """Routes one provider's calls across several backends, least outstanding requests first.
+
+    Each backend takes at most ``max_concurrency`` calls at once. A background thread probes
+    every backend (``/api/tags`` for Ollama, ``/models`` for OpenAI-compatible servers):
+    failing backends are evicted and come back after their next good probe, and the models
+    they list decide which backends a call can go to. Connection errors and timeouts evict
+    a backend early. With probes off (``health_interval_seconds=0``), an evicted backend is
+    re-admitted on trial after ``READMIT_AFTER_SECONDS``: one more failure evicts it again.
+    If no healthy backend serves the model, calls go to any backend with room rather than
+    failing outright.
+    """
+
+    def __init__(
+        self,
+        provider: str,
+        backends: List[Tuple[str, int]],
+        settings: Optional[BalancerSettings] = None,
+        api_key: str = "",
+    ) -> None:
+        self.provider = provider
+        self.backends = [Backend(url, cap) for url, cap in backends]
+        self.settings = settings or BalancerSettings()
+        self.api_key = api_key
+        self.name = ",".join(b.url for b in self.backends)
+        self._headers = {"Authorization": f"Bearer {api_key}"} if provider == "openai" and api_key else {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._prober: Optional[threading.Thread] = None
+
+    @property
+    def capacity(self) -> int:
+        return sum(b.max_concurrency for b in self.backends)
+
+    def _start_prober(self) -> None:
+        if self._prober is None and self.settings.health_interval_seconds > 0:
+            self._prober = threading.Thread(target=self._probe_loop, name=f"probe-{self.provider}", daemon=True)
+            self._prober.start()
+
+    def matches(self, backends: List[Tuple[str, int]], settings: BalancerSettings, api_key: str) -> bool:
+        return (
+            [(b.url, b.max_concurrency) for b in self.backends] == backends
+            and self.settings == settings
+            and self.api_key == api_key
+        )
+
+    def _readmit_stale(self) -> None:
+        # No prober to notice a recovery: give long-evicted backends a trial. Caller holds the lock.
+        now = time.monotonic()
+        for backend in self.backends:
+            if not backend.healthy and now - backend.evicted_at >= READMIT_AFTER_SECONDS:
+                logger.info("%s backend %s re-admitted on trial", self.provider, backend.url)
+                backend.healthy = True
+                backend.consecutive_failures = max(0, self.settings.max_failures - 1)
+
+    def try_acquire(self, model: str) -> Optional[Backend]:
+        with self._lock:
+            self._start_prober()
+            if self.settings.health_interval_seconds <= 0:
+                self._readmit_stale()
+            eligible = [b for b in self.backends if b.healthy and b.serves(model)]
+            if not eligible:
+                eligible = self.backends
+            free = [b for b in eligible if b.in_flight < b.max_concurrency]
+            if not free:
+                return None
+            # Least loaded relative to its cap; fewest calls so far breaks ties, so idle backends take turns
+            backend = min(free, key=lambda b: (b.in_flight / b.max_concurrency, b.calls))
+            backend.in_flight += 1
+            backend.calls += 1
+            return backend
+
+    def acquire(self, model: str) -> Backend:
+        while True:
+            backend = self.try_acquire(model)
+            if backend is not None:
+                return backend
+            time.sleep(0.02)
+
+    async def acquire_async(self, model: str) -> Backend:
+        while True:
+            backend = self.try_acquire(model)
+            if backend is not None:
+                return backend
+            await asyncio.sleep(0.02)
+
+    def release(self, backend: Backend, error: Optional[BaseException] = None) -> None:
+        kind = classify_error(error)[0] if error is not None else None
+        with self._lock:
+            backend.in_flight -= 1
+            if error is None:
+                backend.consecutive_failures = 0
+            elif kind in ("transient", "timeout"):
+                backend.failures += 1
+                backend.consecutive_failures += 1
+                backend.last_error = _describe(error)
+                if backend.healthy and backend.consecutive_failures >= self.settings.max_failures:
+                    self._evict(backend, backend.last_error)
+        metrics.BACKEND_REQUESTS.inc(backend=backend.url, outcome="success" if error is None else (kind or "error"))
+
+    def _evict(self, backend: Backend, reason: str) -> None:
+        backend.healthy = False
+        backend.evicted_at = time.monotonic()
+        backend.evictions += 1
+        logger.warning("%s backend %s evicted: %s", self.provider, backend.url, reason)
+
+    @contextmanager
+    def use(self, model: str) -> Iterator[str]:
+        """Hold a slot on the best backend for ``model`` and yield its URL."""
+        backend = self.acquire(model)
+        try:
+            yield backend.url
+        except Exception as e:
+            self.release(backend, e)
+            raise
+        except BaseException:
+            self.release(backend)  # cancelled or abandoned mid-stream; not the backend's fault
+            raise
+        else:
+            self.release(backend)
+
+    @asynccontextmanager
+    async def ause(self, model: str) -> AsyncIterator[str]:
+        backend = await self.acquire_async(model)
+        try:
+            yield backend.url
+        except Exception as e:
+            self.release(backend, e)
+            raise
+        except BaseException:
+            self.release(backend)
+            raise
+        else:
+            self.release(backend)
+
+    def _probe_url(self, backend: Backend) -> str:
+        return f"{backend.url}/api/tags" if self.provider == "ollama" else f"{backend.url}/models"
+
+    def probe(self, client: httpx.Client, backend: Backend) -> None:
+        """Check one backend now; evicts or re-admits it and refreshes its model list."""
+        try:
+            resp = client.get(self._probe_url(backend), headers=self._headers)
+            resp.raise_for_status()
+            body = resp.json()
+            if self.provider == "ollama":
+                models = {m.get("name") or m.get("model") for m in body.get("models") or []}
+            else:
+                models = {m.get("id") for m in body.get("data") or []}
+            error = ""
+        except (httpx.HTTPError, ValueError, AttributeError) as e:
+            models, error = set(), f"probe failed: {_describe(e)}"
+        with self._lock:
+            backend.last_probe = time.time()
+            if error:
+                backend.last_error = error
+                if backend.healthy:
+                    self._evict(backend, error)
+                return
+            backend.models = {m for m in models if m}
+            if not backend.healthy:
+                logger.info("%s backend %s is back", self.provider, backend.url)
+            backend.healthy = True
+            backend.consecutive_failures = 0
+
+    def probe_all(self) -> None:
+        with httpx.Client(timeout=self.settings.health_timeout_seconds) as client:
+            for backend in self.backends:
+                self.probe(client, backend)
+
+    def _probe_loop(self) -> None:
+        while not self._stop.is_set():
+            self.probe_all()
+            self._stop.wait(self.settings.health_interval_seconds)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "provider": self.provider,
+                "healthy": sum(b.healthy for b in self.backends),
+                "capacity": self.capacity,
+                "backends": [b.to_dict() for b in self.backends],
+            }
+
+    def close(self, wait: bool = True) -> None:
+        self._stop.set()
+        if self._prober is not None and wait:
+            self._prober.join(timeout=self.settings.health_timeout_seconds + 1)
+            self._prober = None
+
+
+_pools: Dict[Tuple[str, str], BackendPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_backend_pool(config: AppConfig, provider: str, backends: List[Tuple[str, int]]) -> BackendPool:
+    """Process-wide pool for this provider and backend list.
+
+    Rebuilt (and the old one's prober stopped) when called with other caps, probe settings
+    or API key, so a long-lived process picks up a changed env like the limiters do.
+    """
+    key = (provider, ",".join(url for url, _ in backends))
+    settings = BalancerSettings(
+        health_interval_seconds=config.backend_health_interval,
+        health_timeout_seconds=config.backend_health_timeout,
+        max_failures=config.backend_max_failures,
+    )
+    stale = None
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None or not pool.matches(backends, settings, config.openai_api_key):
+            stale = pool
+            pool = BackendPool(provider, backends, settings, api_key=config.openai_api_key)
+            _pools[key] = pool
+    if stale is not None:
+        # Don't wait for its prober (this may run on an event loop); calls holding one of its
+        # backends still release normally
+        stale.close(wait=False)
+    return pool
+
+
+def backend_stats() -> List[Dict[str, Any]]:
+    with _pools_lock:
+        pools = list(_pools.values())
+    return [pool.stats() for pool in pools]
+
+
+def close_backend_pools() -> None:
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
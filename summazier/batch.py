@@ -0,0 +1,286 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from . import metrics
+from .arxiv_client import ArxivPaper, PdfDownloader
+from .artifacts import ArtifactStore, file_sha256
+from .config import AppConfig
+from .pdf_utils import extract_text_from_pdf, split_into_sections
+from .pipeline import PipelineResult, run_pipeline_async
+from .results_store import record_result
+
+
+_DONE = object()
+
+
+@dataclass
+class StageStats:
+    name: str
+    concurrency: int
+    items: int = 0
+    errors: int = 0
+    busy_seconds: float = 0.0
+    first_start: Optional[float] = None
+    last_end: Optional[float] = None
+
+    @property
+    def wall_seconds(self) -> float:
+        if self.first_start is None or self.last_end is None:
+            return 0.0
+        return self.last_end - self.first_start
+
+    def to_dict(self) -> Dict[str, Any]:
+        wall = self.wall_seconds
+        return {
+            "name": self.name,
+            "concurrency": self.concurrency,
+            "items": self.items,
+            "errors": self.errors,
+            "busy_seconds": round(self.busy_seconds, 3),
+            "wall_seconds": round(wall, 3),
+            "items_per_second": round(self.items / wall, 3) if wall > 0 else None,
+        }
+
+
+@dataclass
+class BatchItem:
+    paper: ArxivPaper
+    pdf_path: str = ""
+    sections: Dict[str, str] = field(default_factory=dict)
+    result: Optional[PipelineResult] = None
+    output_path: str = ""
+    error: str = ""
+    failed_stage: str = ""
+    run: metrics.RunMetrics = field(default_factory=metrics.RunMetrics)
+    artifacts: Optional[ArtifactStore] = None
+
+
+@dataclass
+class BatchSummary:
+    items: List[BatchItem]
+    stages: List[StageStats]
+    wall_seconds: float
+    summary_path: str = ""
+
+    @property
+    def succeeded(self) -> List[BatchItem]:
+        return [item for item in self.items if not item.error]
+
+    @property
+    def failed(self) -> List[BatchItem]:
+        return [item for item in self.items if item.error]
+
+
+def _extract_and_split(pdf_path: str) -> Tuple[str, Dict[str, str]]:
+    # Runs in a worker process; workers=1 so we don't nest process pools
+    text = extract_text_from_pdf(pdf_path, workers=1)
+    return text, split_into_sections(text)
+
+
+def output_filename(arxiv_id: str) -> str:
+    # Old-style IDs contain a slash (e.g. hep-th/9901001)
+    return arxiv_id.replace("/", "_") + ".json"
+
+
+def paper_payload(paper: ArxivPaper, pdf_path: str, result: PipelineResult) -> Dict[str, Any]:
+    return {
+        "paper": {
+            "title": paper.title,
+            "authors": paper.authors,
+            "arxiv_id": paper.arxiv_id,
+            "summary": paper.summary,
+            "published": paper.published,
+            "pdf_path": pdf_path,
+        },
+        **result.to_dict(),
+    }
+
+
+def open_artifacts(
+    config: AppConfig,
+    paper: ArxivPaper,
+    resume: bool,
+    params: Dict[str, Any],
+) -> Optional[ArtifactStore]:
+    """The run artifact store for ``paper`` under ``output_dir/runs/``, or None if disabled."""
+    if not (config.artifacts_enabled or resume):
+        return None
+    meta = {"arxiv_id": paper.arxiv_id, "title": paper.title, "params": params}
+    return ArtifactStore(os.path.join(config.output_dir, "runs"), paper.arxiv_id, resume=resume, meta=meta)
+
+
+async def _run_stage(
+    stats: StageStats,
+    inbox: "asyncio.Queue[Any]",
+    outbox: Optional["asyncio.Queue[Any]"],
+    downstream_workers: int,
+    handler: Callable[[BatchItem], Awaitable[None]],
+    failed: List[BatchItem],
+) -> None:
+    async def worker() -> None:
+        while True:
+            item = await inbox.get()
+            if item is _DONE:
+                return
+            start = time.perf_counter()
+            if stats.first_start is None:
+                stats.first_start = start
+            try:
+                await handler(item)
+            except Exception as e:  # one bad paper must not sink the batch
+                item.error = f"{type(e).__name__}: {e}"
+                item.failed_stage = stats.name
+                stats.errors += 1
+                failed.append(item)
+            else:
+                stats.items += 1
+                if outbox is not None:
+                    await outbox.put(item)
+            end = time.perf_counter()
+            stats.busy_seconds += end - start
+            stats.last_end = end
+
+    await asyncio.gather(*(worker() for _ in range(stats.concurrency)))
+    if outbox is not None:
+        for _ in range(downstream_workers):
+            await outbox.put(_DONE)
+
+
+async def run_batch(
+    config: AppConfig,
+    papers: List[ArxivPaper],
+    download_concurrency: int = 4,
+    cpu_workers: Optional[int] = None,
+    paper_concurrency: int = 2,
+    queue_size: int = 8,
+    on_item_done: Optional[Callable[[BatchItem], None]] = None,
+    resume: bool = False,
+    **pipeline_kwargs: Any,
+) -> BatchSummary:
+    """Run many papers through download -> extract/split -> LLM stages connected by bounded queues.
+
+    ``pipeline_kwargs`` are passed through to :func:`run_pipeline_async`. With ``resume``,
+    stages whose inputs match a previous run's artifacts are loaded instead of recomputed.
+    """
+    loop = asyncio.get_running_loop()
+    cpu_workers = max(1, cpu_workers or (os.cpu_count() or 1))
+    download_q: "asyncio.Queue[Any]" = asyncio.Queue()
+    extract_q: "asyncio.Queue[Any]" = asyncio.Queue(maxsize=queue_size)
+    llm_q: "asyncio.Queue[Any]" = asyncio.Queue(maxsize=queue_size)
+
+    download_stats = StageStats("download", download_concurrency)
+    extract_stats = StageStats("extract", cpu_workers)
+    llm_stats = StageStats("llm", paper_concurrency)
+    failed: List[BatchItem] = []
+    items = [BatchItem(paper=p) for p in papers]
+    downloader = PdfDownloader(
+        config.tmp_dir,
+        concurrency=download_concurrency,
+        use_cache=config.pdf_cache_enabled,
+    )
+
+    async def do_download(item: BatchItem) -> None:
+        item.run = metrics.RunMetrics()  # start the clock when the paper is picked up, not when queued
+        with metrics.use_run(item.run), metrics.stage("download"):
+            item.pdf_path = await downloader.adownload(item.paper)
+        item.artifacts = open_artifacts(config, item.paper, resume, pipeline_kwargs)
+
+    async def do_llm(item: BatchItem) -> None:
+        with metrics.use_run(item.run):
+            item.result = await run_pipeline_async(
+                config=config, sections=item.sections, artifacts=item.artifacts, **pipeline_kwargs
+            )
+        item.result.timings = item.run.breakdown()
+        item.output_path = os.path.join(config.output_dir, output_filename(item.paper.arxiv_id))
+        payload = paper_payload(item.paper, item.pdf_path, item.result)
+
+        def save() -> None:
+            # File write plus SQLite/FTS insert: off the loop the other papers' calls run on
+            with open(item.output_path, "w", encoding="utf-8") as f:
+                json.dump(payload, f, ensure_ascii=False, indent=2)
+            record_result(config, payload, pipeline_kwargs.get("model") or config.openai_model, "batch")
+
+        await asyncio.to_thread(save)
+        if item.artifacts is not None:
+            item.artifacts.finish(output_path=item.output_path)
+        # Sections aren't needed after this point; don't hold them for the whole run
+        item.sections = {}
+        if on_item_done is not None:
+            on_item_done(item)
+
+    for item in items:
+        download_q.put_nowait(item)
+    for _ in range(download_concurrency):
+        download_q.put_nowait(_DONE)
+
+    started = time.perf_counter()
+    try:
+        with ProcessPoolExecutor(max_workers=cpu_workers) as pool:
+
+            async def do_extract(item: BatchItem) -> None:
+                store = item.artifacts
+                with metrics.use_run(item.run), metrics.stage("extract"):
+                    if store is not None:
+                        pdf = {"pdf_sha256": file_sha256(item.pdf_path)}
+                        text = store.get("extract", pdf)
+                        sections = store.get("split", {"text": text}) if text is not None else None
+                        if sections is not None:
+                            item.sections = sections
+                            return
+                    start = time.perf_counter()
+                    text, item.sections = await loop.run_in_executor(pool, _extract_and_split, item.pdf_path)
+                    if store is not None:
+                        store.put("extract", pdf, text, time.perf_counter() - start)
+                        store.put("split", {"text": text}, item.sections)
+
+            await asyncio.gather(
+                _run_stage(download_stats, download_q, extract_q, cpu_workers, do_download, failed),
+                _run_stage(extract_stats, extract_q, llm_q, paper_concurrency, do_extract, failed),
+                _run_stage(llm_stats, llm_q, None, 0, do_llm, failed),
+            )
+    finally:
+        await downloader.aclose()
+    wall = time.perf_counter() - started
+
+    for item in failed:
+        if item.artifacts is not None:
+            item.artifacts.finish(error=item.error)  # keep what finished so --resume can pick it up
+        if on_item_done is not None:
+            on_item_done(item)
+
+    summary = BatchSummary(items=items, stages=[download_stats, extract_stats, llm_stats], wall_seconds=wall)
+    summary.summary_path = os.path.join(config.output_dir, f"batch_{time.strftime('%Y%m%d-%H%M%S')}.json")
+    with open(summary.summary_path, "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "papers": len(items),
+                "succeeded": len(summary.succeeded),
+                "failed": len(summary.failed),
+                "wall_seconds": round(wall, 3),
+                "papers_per_second": round(len(summary.succeeded) / wall, 4) if wall > 0 else None,
+                "stages": [s.to_dict() for s in summary.stages],
+                "pdf_cache_hits": downloader.cache_hits,
+                "items": [
+                    {
+                        "arxiv_id": item.paper.arxiv_id,
+                        "title": item.paper.title,
+                        "output_path": item.output_path,
+                        "error": item.error,
+                        "failed_stage": item.failed_stage,
+                        "reused_stages": item.artifacts.reused if item.artifacts is not None else [],
+                    }
+                    for item in items
+                ],
+            },
+            f,
+            ensure_ascii=False,
+            indent=2,
+        )
+    return summary
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from .config import AppConfig
+
+
+class LLMCache:
+    """Two-tier cache for LLM completions: in-process LRU in front of SQLite on disk."""
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_memory_entries: int = 1024,
+        max_disk_entries: int = 50000,
+        ttl_seconds: Optional[float] = 7 * 24 * 3600,
+    ) -> None:
+        self.path = path
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+        self.ttl_seconds = ttl_seconds
+        self._memory: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._writes_since_trim = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.writes = 0
+
+        self._db: Optional[sqlite3.Connection] = None
+        if path:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                " key TEXT PRIMARY KEY, value TEXT NOT NULL,"
+                " created REAL NOT NULL, accessed REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS llm_cache_accessed ON llm_cache(accessed)")
+
+    @staticmethod
+    def make_key(
+        provider: str,
+        model: str,
+        base_url: Optional[str],
+        temperature: float,
+        system: str,
+        prompt: str,
+        json_mode: bool = False,
+    ) -> str:
+        parts = [provider, model, base_url or "", temperature, system, prompt]
+        if json_mode:
+            parts.append("json")  # only then, so text-mode entries keep their keys
+        payload = json.dumps(parts, ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _expired(self, created: float, now: float) -> bool:
+        return self.ttl_seconds is not None and now - created > self.ttl_seconds
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                value, created = entry
+                if not self._expired(created, now):
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                    return value
+                del self._memory[key]
+
+            if self._db is not None:
+                row = self._db.execute("SELECT value, created FROM llm_cache WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    value, created = row
+                    if not self._expired(created, now):
+                        self._db.execute("UPDATE llm_cache SET accessed = ? WHERE key = ?", (now, key))
+                        self._remember(key, value, created)
+                        self.disk_hits += 1
+                        return value
+                    self._db.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+
+            self.misses += 1
+            return None
+
+    def set(self, key: str, value: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._remember(key, value, now)
+            self.writes += 1
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO llm_cache (key, value, created, accessed) VALUES (?, ?, ?, ?)",
+                    (key, value, now, now),
+                )
+                self._writes_since_trim += 1
+                if self._writes_since_trim >= 100:
+                    self._trim_disk(now)
+
+    def _remember(self, key: str, value: str, created: float) -> None:
+        self._memory[key] = (value, created)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _trim_disk(self, now: float) -> None:
+        # Caller holds the lock
+        assert self._db is not None
+        self._writes_since_trim = 0
+        if self.ttl_seconds is not None:
+            self._db.execute("DELETE FROM llm_cache WHERE created < ?", (now - self.ttl_seconds,))
+        self._db.execute(
+            "DELETE FROM llm_cache WHERE key IN ("
+            " SELECT key FROM llm_cache ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+            (self.max_disk_entries,),
+        )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM llm_cache")
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "writes": self.writes,
+                "memory_entries": len(self._memory),
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+_caches: Dict[str, LLMCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_cache(config: AppConfig) -> LLMCache:
+    """Return the process-wide cache for ``config.output_dir``, creating it on first use."""
+    path = os.path.abspath(os.path.join(config.output_dir, "llm_cache.sqlite"))
+    with _caches_lock:
+        cache = _caches.get(path)
+        if cache is None:
+            cache = LLMCache(
+                path=path,
+                max_memory_entries=config.cache_max_memory_entries,
+                max_disk_entries=config.cache_max_disk_entries,
+                ttl_seconds=config.cache_ttl_seconds or None,
+            )
+            _caches[path] = cache
+        return cache
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+from typing import List, Optional
+
+import regex as re
+
+
+# Rough per-call input budgets (tokens of section text) by model family.
+# Ollama defaults to a 2048-token context window regardless of model, and
+# silently truncates anything beyond it, so local models get a small budget.
+MODEL_CHUNK_TOKENS = {
+    "llama3.2": 1500,
+    "llama3.1": 1500,
+    "llama3": 1500,
+    "mistral": 1500,
+    "gpt-3.5-turbo": 3000,
+    "gpt-4o-mini": 12000,
+    "gpt-4o": 12000,
+    "gpt-4": 6000,
+}
+DEFAULT_CHUNK_TOKENS = 1500
+
+_PARAGRAPH_SPLIT = re.compile(r"\n\s*\n")
+# Abbreviations whose period doesn't end a sentence ("Smith et al. (2020)", "e.g. BERT", "Fig. 3")
+_ABBREVIATIONS = r"et al|e\.g|i\.e|cf|vs|approx|resp|Figs?|Eqs?|Secs?|Tabs?|Refs?|No|Dr|Mr|Ms"
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])(?<!\b(?:" + _ABBREVIATIONS + r")\.)\s+(?=[\p{Lu}\d(\[])", re.IGNORECASE)
+
+
+def estimate_tokens(text: str) -> int:
+    # ~4 characters per token for English prose; good enough for budgeting.
+    return (len(text) + 3) // 4
+
+
+def chunk_budget_for_model(model: Optional[str], override: int = 0) -> int:
+    if override > 0:
+        return override
+    name = (model or "").lower()
+    # Longest prefix wins so "gpt-4o-mini" doesn't match "gpt-4"
+    for prefix in sorted(MODEL_CHUNK_TOKENS, key=len, reverse=True):
+        if name.startswith(prefix):
+            return MODEL_CHUNK_TOKENS[prefix]
+    return DEFAULT_CHUNK_TOKENS
+
+
+def split_paragraphs(text: str) -> List[str]:
+    return [p for p in _PARAGRAPH_SPLIT.split(text) if p.strip()]
+
+
+def split_sentences(text: str) -> List[str]:
+    return [s for s in _SENTENCE_SPLIT.split(text) if s.strip()]
+
+
+def _split_oversized(unit: str, max_tokens: int) -> List[str]:
+    # Fall back from paragraphs to sentences to plain word windows
+    if estimate_tokens(unit) <= max_tokens:
+        return [unit]
+    sentences = split_sentences(unit)
+    if len(sentences) > 1:
+        out: List[str] = []
+        for sentence in sentences:
+            out.extend(_split_oversized(sentence, max_tokens))
+        return out
+    words = unit.split()
+    max_chars = max_tokens * 4
+    out = []
+    current: List[str] = []
+    size = 0
+    for word in words:
+        if current and size + len(word) + 1 > max_chars:
+            out.append(" ".join(current))
+            current, size = [], 0
+        current.append(word)
+        size += len(word) + 1
+    if current:
+        out.append(" ".join(current))
+    return out
+
+
+def chunk_text(text: str, max_tokens: int, overlap_tokens: int = 0) -> List[str]:
+    """Split ``text`` into chunks of at most ``max_tokens`` on paragraph/sentence boundaries.
+
+    Consecutive chunks share up to ``overlap_tokens`` of trailing context.
+    """
+    text = text.strip()
+    if not text:
+        return []
+    if estimate_tokens(text) <= max_tokens:
+        return [text]
+
+    overlap_tokens = max(0, min(overlap_tokens, max_tokens // 2))
+    units: List[str] = []
+    for para in _PARAGRAPH_SPLIT.split(text):
+        para = para.strip()
+        if para:
+            units.extend(_split_oversized(para, max_tokens - overlap_tokens))
+
+    chunks: List[str] = []
+    current: List[str] = []
+    size = 0
+    for unit in units:
+        unit_tokens = estimate_tokens(unit)
+        if current and size + unit_tokens > max_tokens:
+            chunks.append("\n\n".join(current))
+            # Carry trailing units into the next chunk as overlap
+            carried: List[str] = []
+            carried_size = 0
+            for prev in reversed(current):
+                prev_tokens = estimate_tokens(prev)
+                if carried_size + prev_tokens > overlap_tokens:
+                    break
+                carried.insert(0, prev)
+                carried_size += prev_tokens
+            current, size = carried, carried_size
+        current.append(unit)
+        size += unit_tokens
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
+
+
+def group_for_reduce(summaries: List[str], max_tokens: int) -> List[List[str]]:
+    """Group partial summaries so each group fits ``max_tokens``, always merging at least two."""
+    groups: List[List[str]] = []
+    current: List[str] = []
+    size = 0
+    for summary in summaries:
+        tokens = estimate_tokens(summary)
+        if len(current) >= 2 and size + tokens > max_tokens:
+            groups.append(current)
+            current, size = [], 0
+        current.append(summary)
+        size += tokens
+    if current:
+        if len(current) == 1 and groups:
+            groups[-1].append(current[0])
+        else:
+            groups.append(current)
+    return groups
@@ -1,33 +1,236 @@
 from __future__ import annotations
 
 import json
-from typing import Optional
+import os
+import sys
+from contextlib import nullcontext
+from typing import TYPE_CHECKING, Awaitable, Callable, List, Optional, Tuple, TypeVar
 
 import click
 from rich.console import Console
 from rich.panel import Panel
+from rich.table import Table
 
-from .config import AppConfig, ensure_directories_exist
-from .arxiv_client import search_arxiv, download_pdf
-from .pdf_utils import extract_text_from_pdf, split_into_sections
-from .pipeline import run_pipeline_sync
+from . import metrics
+from .config import PIPELINE_MODES, AppConfig, ensure_directories_exist
+
+if TYPE_CHECKING:
+    from .arxiv_client import ArxivPaper
+    from .artifacts import ArtifactStore
+    from .batch import BatchItem
+    from .pipeline import PipelineResult
+
+# Commands import the pipeline, arXiv client, PDF parsing and provider backends when they
+# run, so `--help` and invocations forwarded to the daemon don't pay for them.
 
 console = Console()
 
+T = TypeVar("T")
+
+
+def _check_stage_models(ctx: click.Context, param: click.Parameter, value: Tuple[str, ...]) -> Tuple[str, ...]:
+    from .routing import parse_stage_models
+
+    try:
+        parse_stage_models(",".join(value))
+    except ValueError as e:
+        raise click.BadParameter(str(e))
+    return value
+
+
+def llm_options(f: Callable) -> Callable:
+    # Options shared by the single-paper command and `batch`
+    options = [
+        click.option("--role", type=str, default=None, help="Role preamble for prompting"),
+        click.option("--model", type=str, default=None, help="LLM model name"),
+        click.option("--provider", type=click.Choice(["openai", "ollama"]), default=None, help="LLM provider"),
+        click.option("--base_url", type=str, default=None, help="Base URL (e.g., http://localhost:11434 for Ollama)"),
+        click.option("--sections", type=str, default=None, help="Comma-separated sections to summarize (e.g., abstract,methods)"),
+        click.option("--max_words", type=int, default=300, help="Max words for summaries"),
+        click.option("--num_questions", type=int, default=5, help="Number of research questions"),
+        click.option("--no_cache", is_flag=True, help="Bypass the LLM response cache"),
+        click.option(
+            "--mode",
+            type=click.Choice(list(PIPELINE_MODES)),
+            default=None,
+            help="stepwise: one call per stage; fused: one structured call when the paper fits (default: PIPELINE_MODE)",
+        ),
+        click.option(
+            "--compress/--no_compress",
+            default=None,
+            help="Drop noise, duplicates and peripheral sentences before prompting (default: COMPRESSION_ENABLED)",
+        ),
+        click.option(
+            "--pack/--no_pack",
+            default=None,
+            help="Summarize short sections together in one LLM call (default: PACK_SECTIONS)",
+        ),
+        click.option(
+            "--dedup/--no_dedup",
+            default=None,
+            help="Reuse summaries of a near-identical paper summarized before (default: DEDUP_ENABLED)",
+        ),
+        click.option(
+            "--stage_model",
+            "stage_models",
+            type=str,
+            multiple=True,
+            callback=_check_stage_models,
+            help="Model for one stage as STAGE=[PROVIDER/]MODEL, e.g. consolidate=openai/gpt-4o (repeatable; "
+            "stages: sections, fused, synthesis, consolidate, refine, questions; default: STAGE_MODELS)",
+        ),
+        click.option(
+            "--small_model",
+            type=str,
+            default=None,
+            help="Send section calls with short prompts to this [PROVIDER/]MODEL (default: ROUTER_SMALL_MODEL)",
+        ),
+    ]
+    for option in reversed(options):
+        f = option(f)
+    return f
+
+
+def join_stage_models(stage_models: Tuple[str, ...]) -> Optional[str]:
+    return ",".join(stage_models) if stage_models else None
+
+
+def parse_sections(sections: Optional[str]) -> Optional[List[str]]:
+    if not sections:
+        return None
+    return [s.strip().lower() for s in sections.split(',') if s.strip()]
+
+
+STAGE_TITLES = {
+    "consolidate": "Consolidated Summary",
+    "refine": "Refined Summary",
+    "questions": "Research Questions",
+}
+
+
+def _print_result(result: PipelineResult) -> None:
+    console.rule("Section Summaries")
+    for k, v in result.section_summaries.items():
+        if v:
+            console.print(Panel(v, title=k.capitalize()))
+
+    for stage, text in (("consolidate", result.consolidated), ("refine", result.refined), ("questions", result.questions)):
+        console.rule(STAGE_TITLES[stage])
+        console.print(text)
+
+
+def _run_async(coro: Awaitable[T]) -> T:
+    # asyncio.run, closing the loop's pooled LLM connections before the loop goes away:
+    # in the daemon every command gets a fresh loop
+    import asyncio
+
+    from .llm import registry
+
+    async def main() -> T:
+        try:
+            return await coro
+        finally:
+            await registry.aclose_loop()
+
+    return asyncio.run(main())
+
+
+def _run_single(config: AppConfig, sections_map: dict, stream: bool, pipeline_kwargs: dict) -> PipelineResult:
+    from .pipeline import run_pipeline_sync
 
-@click.command()
+    if stream:
+        return _run_async(_stream_to_console(config, sections_map, **pipeline_kwargs))
+    result = run_pipeline_sync(config=config, sections=sections_map, **pipeline_kwargs)
+    _print_result(result)
+    return result
+
+
+def _print_resumed(store: ArtifactStore) -> None:
+    total = len(store.reused) + len(store.computed)
+    console.print(f"[dim]Resumed {len(store.reused)}/{total} stages from {store.path}[/dim]")
+
+
+def _print_dedup(dedup: dict) -> None:
+    if dedup["complete"]:
+        console.print(f"[dim]Reused the result of a near-identical paper (similarity {dedup['similarity']:.2f})[/dim]")
+        return
+    changed = ", ".join(dedup["changed_sections"]) or "none"
+    console.print(
+        f"[dim]Near-identical paper (similarity {dedup['similarity']:.2f}): reused "
+        f"{len(dedup['reused_sections'])} section summaries, re-summarized {changed}[/dim]"
+    )
+
+
+def _print_models(models: dict) -> None:
+    # Only worth a line when stages ran on different models
+    by_model: dict = {}
+    for stage, chosen in models.items():
+        by_model.setdefault(chosen, []).append(stage)
+    if len(by_model) > 1:
+        console.print("[dim]Models: " + "; ".join(f"{m} ({', '.join(s)})" for m, s in by_model.items()) + "[/dim]")
+
+
+def _print_timings(timings: dict) -> None:
+    table = Table(title=f"Timing ({timings['total_seconds']:.1f}s total, {timings['llm_calls']} LLM calls)")
+    for column in ("Stage", "Seconds", "LLM calls", "Prompt tok", "Completion tok", "Tok/s", "Cache hits"):
+        table.add_column(column)
+    for name, stage in timings["stages"].items():
+        table.add_row(
+            name,
+            f"{stage['seconds']:.2f}",
+            str(int(stage["llm_calls"])),
+            str(int(stage["prompt_tokens"])),
+            str(int(stage["completion_tokens"])),
+            "-" if stage["tokens_per_second"] is None else f"{stage['tokens_per_second']:.1f}",
+            str(int(stage["cache_hits"])),
+        )
+    console.print(table)
+
+
+async def _stream_to_console(config: AppConfig, sections_map: dict, **kwargs) -> PipelineResult:
+    # Sections run concurrently, so their tokens interleave; show each one when it completes
+    # and stream tokens live only for the sequential synthesis stages.
+    from .pipeline import PipelineResult, stream_pipeline
+
+    console.rule("Section Summaries")
+    current_stage = None
+    result = None
+    async for event in stream_pipeline(config, sections_map, **kwargs):
+        kind = event["event"]
+        if kind == "section" and event["text"]:
+            console.print(Panel(event["text"], title=event["section"].capitalize()))
+        elif kind == "token" and event["stage"] in STAGE_TITLES:
+            if event["stage"] != current_stage:
+                current_stage = event["stage"]
+                console.rule(STAGE_TITLES[current_stage])
+            console.print(event["text"], end="", markup=False, highlight=False)
+        elif kind == "stage_done":
+            if event["stage"] in STAGE_TITLES and event["stage"] != current_stage:
+                # Fused mode sends whole stages without tokens
+                current_stage = event["stage"]
+                console.rule(STAGE_TITLES[current_stage])
+                console.print(event["text"], markup=False, highlight=False)
+            else:
+                console.print()
+        elif kind == "error":
+            raise click.ClickException(event["error"])
+        elif kind == "result":
+            result = PipelineResult(**event["result"])
+    assert result is not None
+    return result
+
+
+@click.group(invoke_without_command=True)
 @click.option("--id", "arxiv_id", type=str, help="arXiv ID to fetch")
 @click.option("--query", type=str, help="Query to search on arXiv")
 @click.option("--top_k", type=int, default=1, help="Top K results to consider (for query)")
-@click.option("--role", type=str, default=None, help="Role preamble for prompting")
-@click.option("--model", type=str, default=None, help="LLM model name")
-@click.option("--provider", type=click.Choice(["openai", "ollama"]), default=None, help="LLM provider")
-@click.option("--base_url", type=str, default=None, help="Base URL (e.g., http://localhost:11434 for Ollama)")
-@click.option("--sections", type=str, default=None, help="Comma-separated sections to summarize (e.g., abstract,methods)")
-@click.option("--max_words", type=int, default=300, help="Max words for summaries")
-@click.option("--num_questions", type=int, default=5, help="Number of research questions")
+@llm_options
 @click.option("--save_json", is_flag=True, help="Save outputs to JSON under output/")
+@click.option("--stream", is_flag=True, help="Print summaries as they are generated")
+@click.option("--resume", is_flag=True, help="Reuse stage outputs from an earlier run whose inputs are unchanged")
+@click.pass_context
 def main(
+    ctx: click.Context,
     arxiv_id: Optional[str],
     query: Optional[str],
     top_k: int,
@@ -38,12 +241,35 @@ def main(
     sections: Optional[str],
     max_words: int,
     num_questions: int,
+    no_cache: bool,
+    mode: Optional[str],
+    compress: Optional[bool],
+    pack: Optional[bool],
+    dedup: Optional[bool],
+    stage_models: Tuple[str, ...],
+    small_model: Optional[str],
     save_json: bool,
+    stream: bool,
+    resume: bool,
 ) -> None:
+    if ctx.invoked_subcommand is not None:
+        return
+    if not arxiv_id and not query:
+        click.echo(ctx.get_help())
+        return
+
+    from .arxiv_client import download_pdf, search_arxiv
+    from .artifacts import checkpoint, file_sha256
+    from .batch import open_artifacts, output_filename, paper_payload
+    from .cache import get_cache
+    from .pdf_utils import split_into_sections
+    from .results_store import record_result
+    from .workers import extract_text
+
     config = AppConfig.from_env()
     ensure_directories_exist(config)
 
-    papers = search_arxiv(query=query, arxiv_id=arxiv_id, max_results=top_k)
+    papers = search_arxiv(query=query, arxiv_id=arxiv_id, max_results=top_k, api_url=config.arxiv_api_url)
     if not papers:
         console.print("[red]No results found.[/red]")
         raise SystemExit(1)
@@ -51,58 +277,305 @@ def main(
     paper = papers[0]
     console.print(Panel.fit(f"[bold]{paper.title}[/bold]\n{', '.join(paper.authors)}\n{paper.arxiv_id}", title="arXiv Paper"))
 
-    pdf_path = download_pdf(paper, dest_dir=config.tmp_dir)
-    text = extract_text_from_pdf(pdf_path)
-    sections_map = split_into_sections(text)
-
-    only_sections = None
-    if sections:
-        only_sections = [s.strip().lower() for s in sections.split(',') if s.strip()]
-
-    result = run_pipeline_sync(
-        config=config,
-        sections=sections_map,
+    pipeline_kwargs = dict(
         role=role or config.default_role,
         model=model,
         max_words=max_words,
         num_questions=num_questions,
         provider=provider,
         base_url=base_url,
-        only_sections=only_sections,
+        only_sections=parse_sections(sections),
+        use_cache=not no_cache,
+        compress=compress,
+        pack=pack,
+        dedup=dedup,
+        mode=mode,
+        stage_models=join_stage_models(stage_models),
+        small_model=small_model,
     )
+    store = open_artifacts(config, paper, resume, pipeline_kwargs)
 
-    console.rule("Section Summaries")
-    for k, v in result.section_summaries.items():
-        if v:
-            console.print(Panel(v, title=k.capitalize()))
+    with metrics.track_run() as run, (store.running() if store is not None else nullcontext()):
+        with metrics.stage("download"):
+            pdf_path = download_pdf(paper, dest_dir=config.tmp_dir, use_cache=config.pdf_cache_enabled)
+        with metrics.stage("extract"):
+            pdf = {"pdf_sha256": file_sha256(pdf_path)} if store is not None else {}
+            text = checkpoint(store, "extract", pdf, lambda: extract_text(pdf_path))
+        with metrics.stage("split"):
+            sections_map = checkpoint(store, "split", {"text": text}, lambda: split_into_sections(text))
+        result = _run_single(config, sections_map, stream, {**pipeline_kwargs, "artifacts": store})
+    result.timings = run.breakdown()
+    _print_timings(result.timings)
+    if result.mode != "stepwise":
+        console.print(f"[dim]Pipeline mode: {result.mode}[/dim]")
+    _print_models(result.models)
+    if result.compression:
+        c = result.compression
+        console.print(
+            f"[dim]Compression: {c['original_tokens']} → {c['kept_tokens']} section tokens ({c['ratio']:.0%} kept)[/dim]"
+        )
+    if result.dedup:
+        _print_dedup(result.dedup)
+    if store is not None and resume:
+        _print_resumed(store)
 
-    console.rule("Consolidated Summary")
-    console.print(result.consolidated)
-
-    console.rule("Refined Summary")
-    console.print(result.refined)
-
-    console.rule("Research Questions")
-    console.print(result.questions)
+    if not no_cache and config.cache_enabled:
+        stats = get_cache(config).stats()
+        console.print(
+            f"[dim]LLM cache: {stats['memory_hits'] + stats['disk_hits']} hits, {stats['misses']} misses[/dim]"
+        )
 
+    payload = paper_payload(paper, pdf_path, result)
+    record_result(config, payload, model or config.openai_model, "cli")
     if save_json:
-        out = {
-            "paper": {
-                "title": paper.title,
-                "authors": paper.authors,
-                "arxiv_id": paper.arxiv_id,
-                "pdf_path": pdf_path,
-            },
-            "section_summaries": result.section_summaries,
-            "consolidated": result.consolidated,
-            "refined": result.refined,
-            "questions": result.questions,
-        }
-        out_path = f"{config.output_dir}/{paper.arxiv_id}.json"
+        out_path = os.path.join(config.output_dir, output_filename(paper.arxiv_id))
         with open(out_path, "w", encoding="utf-8") as f:
-            json.dump(out, f, ensure_ascii=False, indent=2)
+            json.dump(payload, f, ensure_ascii=False, indent=2)
         console.print(f"Saved to {out_path}")
+    if store is not None:
+        store.finish(output_path=out_path if save_json else "")
 
 
-if __name__ == "__main__":
+def _resolve_papers(
+    config: AppConfig,
+    ids: Tuple[str, ...],
+    ids_file: Optional[str],
+    query: Optional[str],
+    top_k: int,
+) -> List[ArxivPaper]:
+    from .arxiv_client import fetch_papers, search_arxiv
+
+    wanted = list(ids)
+    if ids_file:
+        with open(ids_file, "r", encoding="utf-8") as f:
+            wanted.extend(line.split("#", 1)[0].strip() for line in f)
+    wanted = list(dict.fromkeys(i for i in wanted if i))  # dedupe, keep order
+
+    papers = fetch_papers(wanted, api_url=config.arxiv_api_url) if wanted else []
+    found = {p.arxiv_id for p in papers} | {p.base_id for p in papers}
+    for arxiv_id in wanted:
+        if arxiv_id not in found:
+            console.print(f"[yellow]No arXiv entry for {arxiv_id}, skipping[/yellow]")
+    if query:
+        papers.extend(search_arxiv(query=query, max_results=top_k, api_url=config.arxiv_api_url))
+    return papers
+
+
+@main.command()
+@click.option("--id", "ids", type=str, multiple=True, help="arXiv ID to process (repeatable)")
+@click.option("--ids_file", type=click.Path(exists=True, dir_okay=False), help="File with one arXiv ID per line")
+@click.option("--query", type=str, help="Process every hit of this arXiv query")
+@click.option("--top_k", type=int, default=10, help="Number of query hits to process")
+@llm_options
+@click.option("--download_concurrency", type=int, default=None, help="Parallel PDF downloads (default: DOWNLOAD_CONCURRENCY)")
+@click.option("--cpu_workers", type=int, default=None, help="Processes for PDF extraction (default: CPU count)")
+@click.option("--paper_concurrency", type=int, default=2, help="Papers in the LLM stage at once")
+@click.option("--llm_concurrency", type=int, default=None, help="Concurrent LLM calls per provider (default: MAX_CONCURRENCY)")
+@click.option("--resume", is_flag=True, help="Reuse stage outputs from earlier runs whose inputs are unchanged")
+def batch(
+    ids: Tuple[str, ...],
+    ids_file: Optional[str],
+    query: Optional[str],
+    top_k: int,
+    role: Optional[str],
+    model: Optional[str],
+    provider: Optional[str],
+    base_url: Optional[str],
+    sections: Optional[str],
+    max_words: int,
+    num_questions: int,
+    no_cache: bool,
+    mode: Optional[str],
+    compress: Optional[bool],
+    pack: Optional[bool],
+    dedup: Optional[bool],
+    stage_models: Tuple[str, ...],
+    small_model: Optional[str],
+    download_concurrency: Optional[int],
+    cpu_workers: Optional[int],
+    paper_concurrency: int,
+    llm_concurrency: Optional[int],
+    resume: bool,
+) -> None:
+    """Summarize many papers; writes one JSON per paper plus a run summary under output/."""
+    if not ids and not ids_file and not query:
+        raise click.UsageError("Provide --id, --ids_file or --query")
+    from .batch import run_batch
+
+    config = AppConfig.from_env()
+    ensure_directories_exist(config)
+
+    papers = _resolve_papers(config, ids, ids_file, query, top_k)
+    if not papers:
+        console.print("[red]No results found.[/red]")
+        raise SystemExit(1)
+    console.print(f"Processing {len(papers)} papers")
+
+    def on_item_done(item: BatchItem) -> None:
+        if item.error:
+            console.print(f"[red]✗[/red] {item.paper.arxiv_id} ({item.failed_stage}): {item.error}")
+        else:
+            resumed = f" (resumed {len(item.artifacts.reused)} stages)" if item.artifacts and item.artifacts.reused else ""
+            if item.result is not None and item.result.dedup:
+                resumed += f" (near-duplicate, {len(item.result.dedup['reused_sections'])} sections reused)"
+            console.print(f"[green]✓[/green] {item.paper.arxiv_id} → {item.output_path}{resumed}")
+
+    summary = _run_async(
+        run_batch(
+            config,
+            papers,
+            download_concurrency=download_concurrency or config.download_concurrency,
+            cpu_workers=cpu_workers,
+            paper_concurrency=paper_concurrency,
+            on_item_done=on_item_done,
+            resume=resume,
+            role=role or config.default_role,
+            model=model,
+            max_words=max_words,
+            num_questions=num_questions,
+            provider=provider,
+            base_url=base_url,
+            only_sections=parse_sections(sections),
+            max_concurrency=llm_concurrency,
+            use_cache=not no_cache,
+            compress=compress,
+            pack=pack,
+            dedup=dedup,
+            mode=mode,
+            stage_models=join_stage_models(stage_models),
+            small_model=small_model,
+        )
+    )
+
+    table = Table(title=f"Batch: {len(summary.succeeded)}/{len(summary.items)} papers in {summary.wall_seconds:.1f}s")
+    for column in ("Stage", "Concurrency", "Items", "Errors", "Busy s", "Wall s", "Items/s"):
+        table.add_column(column)
+    for stage in summary.stages:
+        row = stage.to_dict()
+        table.add_row(
+            row["name"],
+            str(row["concurrency"]),
+            str(row["items"]),
+            str(row["errors"]),
+            f"{row['busy_seconds']:.1f}",
+            f"{row['wall_seconds']:.1f}",
+            "-" if row["items_per_second"] is None else f"{row['items_per_second']:.2f}",
+        )
+    console.print(table)
+    console.print(f"Run summary saved to {summary.summary_path}")
+    if summary.failed:
+        raise SystemExit(1)
+
+
+@main.command()
+@click.argument("query", required=False, default="")
+@click.option("--author", type=str, default="", help="Only results with an author matching these words")
+@click.option("--id", "paper_id", type=str, default="", help="arXiv ID (any version unless one is given) or upload:<id>")
+@click.option("--limit", type=int, default=20, help="Maximum number of results")
+@click.option("--show", is_flag=True, help="Print the stored summaries of the best match")
+@click.option("--json", "as_json", is_flag=True, help="Print matches as JSON")
+def search(query: str, author: str, paper_id: str, limit: int, show: bool, as_json: bool) -> None:
+    """Search summaries already generated (keywords, author, ID) without running the pipeline."""
+    from .results_store import get_results_store
+
+    config = AppConfig.from_env()
+    store = get_results_store(config)
+    hits = store.search(query, author=author, paper_id=paper_id, limit=limit)
+    if as_json:
+        click.echo(json.dumps(hits, ensure_ascii=False, indent=2))
+        return
+    if not hits:
+        console.print("[yellow]No stored results match.[/yellow]")
+        raise SystemExit(1)
+    table = Table(title=f"{len(hits)} stored results")
+    for column in ("ID", "Title", "Authors", "Model", "Match"):
+        table.add_column(column)
+    for hit in hits:
+        authors = ", ".join(hit["authors"][:3]) + (" et al." if len(hit["authors"]) > 3 else "")
+        table.add_row(hit["paper_id"], hit["title"], authors, hit["model"], hit["snippet"].replace("\n", " "))
+    console.print(table)
+    if show:
+        payload = store.get(hits[0]["id"])
+        if payload is not None:
+            from .pipeline import PipelineResult
+
+            _print_result(
+                PipelineResult(
+                    section_summaries=payload.get("section_summaries", {}),
+                    consolidated=payload.get("consolidated", ""),
+                    refined=payload.get("refined", ""),
+                    questions=payload.get("questions", ""),
+                )
+            )
+
+
+@main.command()
+@click.argument("query", required=False, default="")
+@click.option("--author", type=str, default="", help="Only results with an author matching these words")
+@click.option("--id", "paper_id", type=str, default="", help="Only this arXiv ID (any version unless one is given)")
+@click.option("--output", "-o", type=click.File("w", encoding="utf-8"), default="-", help="File to write (default: stdout)")
+def export(query: str, author: str, paper_id: str, output) -> None:
+    """Export stored results (all, or those matching the filters) as JSON lines."""
+    from .results_store import get_results_store
+
+    config = AppConfig.from_env()
+    count = get_results_store(config).export(output, query, author=author, paper_id=paper_id)
+    click.echo(f"Exported {count} results", err=True)
+
+
+@main.command()
+@click.option("--socket", "socket_path", type=str, default=None, help="Unix socket to listen on (default: DAEMON_SOCKET)")
+@click.option("--pdf_workers", type=int, default=None, help="Warm PDF parsing processes (default: PDF_WORKERS)")
+@click.option("--status", is_flag=True, help="Print the running daemon's status and exit")
+@click.option("--stop", is_flag=True, help="Stop the running daemon")
+def daemon(socket_path: Optional[str], pdf_workers: Optional[int], status: bool, stop: bool) -> None:
+    """Run in the foreground, keeping clients, caches and PDF workers warm for other CLI runs.
+
+    While it listens, every other `python -m summazier.cli` command is forwarded to it
+    (set DAEMON_FORWARD=0 to run one in-process instead).
+    """
+    from .daemon import Daemon, forward_request
+    from .daemon import socket_path as default_socket_path
+
+    config = AppConfig.from_env()
+    path = socket_path or default_socket_path(config)
+    if status or stop:
+        code = forward_request({"op": "stop" if stop else "status"}, path)
+        if code is None:
+            console.print(f"[yellow]No daemon listening on {path}[/yellow]")
+            raise SystemExit(1)
+        if stop:
+            console.print(f"Stopped daemon on {path}")
+        return
+
+    ensure_directories_exist(config)
+    server = Daemon(path, pdf_workers or config.pdf_workers, config.pdf_worker_max_tasks)
+    console.print(f"Daemon listening on {path} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    except RuntimeError as e:
+        console.print(f"[red]{e}[/red]")
+        raise SystemExit(1)
+
+
+def run() -> None:
+    """Entry point: hand the command to a running daemon if there is one, else run it here."""
+    argv = sys.argv[1:]
+    if argv[:1] != ["daemon"]:
+        try:
+            config = AppConfig.from_env()
+        except RuntimeError:
+            config = None  # running it here reports the configuration error
+        if config is not None and config.daemon_forward:
+            from .daemon import forward, socket_path
+
+            code = forward(argv, socket_path(config))
+            if code is not None:
+                raise SystemExit(code)
     main()
+
+
+if __name__ == "__main__":
+    run()
@@ -8,13 +8,38 @@ from dotenv import load_dotenv
 
 load_dotenv(override=False)
 
+PIPELINE_MODES = ("stepwise", "fused")
+
+# Every variable AppConfig.from_env reads; CLI commands forward exactly these to the daemon
+ENV_VARS = (
+    "ADAPTIVE_MAX_CONCURRENCY", "ARTIFACTS_ENABLED", "ARXIV_API_URL", "BACKEND_HEALTH_INTERVAL",
+    "BACKEND_HEALTH_TIMEOUT", "BACKEND_MAX_CONCURRENCY", "BACKEND_MAX_FAILURES", "BASE_URL", "CACHE_ENABLED",
+    "CACHE_MAX_DISK_ENTRIES", "CACHE_MAX_MEMORY_ENTRIES", "CACHE_TTL_SECONDS", "CHUNK_OVERLAP_TOKENS",
+    "CHUNK_TOKENS", "COALESCE_ENABLED", "COMPRESSION_ENABLED", "COMPRESSION_MAX_TOKENS", "COMPRESSION_MIN_TOKENS",
+    "COMPRESSION_RATIO", "DAEMON_FORWARD", "DAEMON_SOCKET", "DEDUP_ENABLED", "DEDUP_SECTION_THRESHOLD",
+    "DEDUP_THRESHOLD", "DEFAULT_ROLE", "DOWNLOAD_CONCURRENCY", "HTTP_KEEPALIVE_SECONDS", "HTTP_POOL_SIZE",
+    "HTTP_TIMEOUT_SECONDS", "JOB_MAX_FINISHED", "JOB_QUEUE_SIZE", "JOB_RETENTION_SECONDS", "JOB_WORKERS",
+    "LLM_MAX_RETRIES", "LLM_RETRY_BASE_DELAY", "LLM_RETRY_MAX_DELAY", "MAP_REDUCE", "MAX_CONCURRENCY",
+    "MAX_UPLOAD_MB", "MAX_WORDS", "OLLAMA_URLS", "OPENAI_API_KEY", "OPENAI_BASE_URLS", "OPENAI_MODEL", "OUTPUT_DIR",
+    "PACK_MAX_SECTION_TOKENS", "PACK_OUTPUT_TOKENS", "PACK_SECTIONS", "PDF_CACHE_ENABLED", "PDF_WORKERS",
+    "PDF_WORKER_MAX_TASKS", "PIPELINE_MODE", "PROVIDER", "RATE_LIMIT_RPM", "RATE_LIMIT_TPM",
+    "RESULTS_STORE_ENABLED", "ROUTER_SMALL_MAX_TOKENS", "ROUTER_SMALL_MODEL", "STAGE_MODELS", "TMP_DIR",
+)
+
+
+def _env_flag(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in {"1", "true", "yes", "on"}
+
 
 @dataclass(frozen=True)
 class AppConfig:
     openai_api_key: str
     openai_model: str = "gpt-4o-mini"
     provider: str = "ollama"  # "openai" or "ollama" - defaults to ollama for local development
-    base_url: str | None = None  # e.g., http://localhost:11434 for Ollama
+    base_url: str | None = None  # e.g., http://localhost:11434 for Ollama; a comma-separated list load-balances
     default_role: str = (
         "You are a research analyst in biomedical AI. Your outputs must be rigorous, "
         "concise, faithful to the paper, and useful for downstream research."
@@ -22,6 +47,58 @@ class AppConfig:
     max_words_default: int = 300
     output_dir: str = "output"
     tmp_dir: str = "tmp"
+    max_concurrency: int = 4  # concurrent LLM calls per provider/base_url in the async pipeline
+    cache_enabled: bool = True  # reuse LLM responses for identical prompts (stored under output_dir)
+    cache_ttl_seconds: int = 7 * 24 * 3600  # 0 disables expiry
+    cache_max_memory_entries: int = 1024
+    cache_max_disk_entries: int = 50000
+    pipeline_mode: str = "stepwise"  # "fused" = one or two JSON-structured calls, stepwise fallback
+    stage_models: str = ""  # "stage=[provider/]model,...", e.g. "sections=llama3.2:1b,consolidate=openai/gpt-4o"
+    router_small_model: str = ""  # [provider/]model for section calls with short prompts; empty = no automatic routing
+    router_small_max_tokens: int = 0  # longest prompt (tokens) sent to the small model; 0 = its chunk budget
+    map_reduce: bool = True  # chunk sections that exceed the model's input budget and summarize the chunks
+    chunk_tokens: int = 0  # per-chunk token budget; 0 picks one based on the model
+    chunk_overlap_tokens: int = 100
+    compression_enabled: bool = False  # extractively shrink sections (drop noise, duplicates, peripheral sentences) before prompting
+    compression_ratio: float = 0.5  # fraction of each section's tokens to keep
+    compression_max_tokens: int = 0  # hard cap per section after compression; 0 = no cap
+    compression_min_tokens: int = 300  # sections shorter than this only lose noise and duplicates
+    pack_sections: bool = False  # summarize short sections together in one call per group
+    pack_max_section_tokens: int = 400  # longer sections always get their own call
+    pack_output_tokens: int = 150  # budget reserved in a packed call for each section's summary
+    rate_limit_rpm: float = 0  # requests/minute per provider endpoint; 0 = unlimited
+    rate_limit_tpm: float = 0  # estimated tokens/minute per provider endpoint; 0 = unlimited
+    llm_max_retries: int = 4  # retries on 429/5xx/timeouts, with exponential backoff
+    llm_retry_base_delay: float = 1.0
+    llm_retry_max_delay: float = 60.0
+    adaptive_max_concurrency: int = 16  # ceiling for AIMD concurrency growth per provider
+    http_pool_size: int = 20  # keep-alive connections per pooled LLM client
+    http_keepalive_seconds: float = 30.0
+    http_timeout_seconds: float = 120.0
+    job_workers: int = 2  # background pipeline workers behind POST /jobs
+    job_queue_size: int = 100
+    job_retention_seconds: int = 3600  # how long finished jobs stay pollable
+    job_max_finished: int = 200
+    pdf_workers: int = 0  # web app's PDF parsing processes; 0 = CPU count
+    pdf_worker_max_tasks: int = 50  # PDFs a parsing process handles before it's replaced; 0 = never
+    max_upload_mb: float = 50  # largest PDF the web app accepts; bigger uploads get a 413
+    arxiv_api_url: str = "https://export.arxiv.org/api/query"
+    download_concurrency: int = 4  # parallel PDF downloads sharing one connection pool
+    pdf_cache_enabled: bool = True  # reuse PDFs already in tmp_dir when version and checksum match
+    artifacts_enabled: bool = True  # write per-stage outputs under output_dir/runs/ so CLI runs can --resume
+    results_store_enabled: bool = True  # index every result in output_dir/results.sqlite for `search` and /search
+    dedup_enabled: bool = True  # reuse results of near-identical papers (other arXiv versions, re-uploads)
+    dedup_threshold: float = 0.5  # estimated Jaccard similarity of the whole paper to count as another version of it
+    dedup_section_threshold: float = 0.9  # sections less similar than this are summarized again
+    coalesce_enabled: bool = True  # identical analyses and LLM calls already in flight are shared, not repeated
+    ollama_urls: str = ""  # Ollama backends, "url[=max_concurrency],..."; empty = BASE_URL or localhost:11434
+    openai_urls: str = ""  # OpenAI-compatible backends in the same form; empty = BASE_URL or api.openai.com
+    backend_max_concurrency: int = 0  # in-flight calls per backend without an explicit cap; 0 = MAX_CONCURRENCY
+    backend_health_interval: float = 15.0  # seconds between backend health/model probes; 0 = no probes
+    backend_health_timeout: float = 2.0
+    backend_max_failures: int = 3  # consecutive connection errors/timeouts before a backend is evicted
+    daemon_socket: str = ""  # Unix socket of `summazier.cli daemon`; empty = summazier-<uid>.sock in the temp dir
+    daemon_forward: bool = True  # CLI runs go to the daemon when one is listening
 
     @staticmethod
     def from_env() -> "AppConfig":
@@ -44,6 +121,58 @@ class AppConfig:
             max_words_default=int(os.getenv("MAX_WORDS", str(AppConfig.max_words_default))),
             output_dir=os.getenv("OUTPUT_DIR", "output"),
             tmp_dir=os.getenv("TMP_DIR", "tmp"),
+            max_concurrency=int(os.getenv("MAX_CONCURRENCY", str(AppConfig.max_concurrency))),
+            cache_enabled=_env_flag("CACHE_ENABLED", AppConfig.cache_enabled),
+            cache_ttl_seconds=int(os.getenv("CACHE_TTL_SECONDS", str(AppConfig.cache_ttl_seconds))),
+            cache_max_memory_entries=int(os.getenv("CACHE_MAX_MEMORY_ENTRIES", str(AppConfig.cache_max_memory_entries))),
+            cache_max_disk_entries=int(os.getenv("CACHE_MAX_DISK_ENTRIES", str(AppConfig.cache_max_disk_entries))),
+            pipeline_mode=os.getenv("PIPELINE_MODE", AppConfig.pipeline_mode).strip().lower(),
+            stage_models=os.getenv("STAGE_MODELS", AppConfig.stage_models),
+            router_small_model=os.getenv("ROUTER_SMALL_MODEL", AppConfig.router_small_model).strip(),
+            router_small_max_tokens=int(os.getenv("ROUTER_SMALL_MAX_TOKENS", str(AppConfig.router_small_max_tokens))),
+            map_reduce=_env_flag("MAP_REDUCE", AppConfig.map_reduce),
+            chunk_tokens=int(os.getenv("CHUNK_TOKENS", str(AppConfig.chunk_tokens))),
+            chunk_overlap_tokens=int(os.getenv("CHUNK_OVERLAP_TOKENS", str(AppConfig.chunk_overlap_tokens))),
+            compression_enabled=_env_flag("COMPRESSION_ENABLED", AppConfig.compression_enabled),
+            compression_ratio=float(os.getenv("COMPRESSION_RATIO", str(AppConfig.compression_ratio))),
+            compression_max_tokens=int(os.getenv("COMPRESSION_MAX_TOKENS", str(AppConfig.compression_max_tokens))),
+            compression_min_tokens=int(os.getenv("COMPRESSION_MIN_TOKENS", str(AppConfig.compression_min_tokens))),
+            pack_sections=_env_flag("PACK_SECTIONS", AppConfig.pack_sections),
+            pack_max_section_tokens=int(os.getenv("PACK_MAX_SECTION_TOKENS", str(AppConfig.pack_max_section_tokens))),
+            pack_output_tokens=int(os.getenv("PACK_OUTPUT_TOKENS", str(AppConfig.pack_output_tokens))),
+            rate_limit_rpm=float(os.getenv("RATE_LIMIT_RPM", str(AppConfig.rate_limit_rpm))),
+            rate_limit_tpm=float(os.getenv("RATE_LIMIT_TPM", str(AppConfig.rate_limit_tpm))),
+            llm_max_retries=int(os.getenv("LLM_MAX_RETRIES", str(AppConfig.llm_max_retries))),
+            llm_retry_base_delay=float(os.getenv("LLM_RETRY_BASE_DELAY", str(AppConfig.llm_retry_base_delay))),
+            llm_retry_max_delay=float(os.getenv("LLM_RETRY_MAX_DELAY", str(AppConfig.llm_retry_max_delay))),
+            adaptive_max_concurrency=int(os.getenv("ADAPTIVE_MAX_CONCURRENCY", str(AppConfig.adaptive_max_concurrency))),
+            http_pool_size=int(os.getenv("HTTP_POOL_SIZE", str(AppConfig.http_pool_size))),
+            http_keepalive_seconds=float(os.getenv("HTTP_KEEPALIVE_SECONDS", str(AppConfig.http_keepalive_seconds))),
+            http_timeout_seconds=float(os.getenv("HTTP_TIMEOUT_SECONDS", str(AppConfig.http_timeout_seconds))),
+            job_workers=int(os.getenv("JOB_WORKERS", str(AppConfig.job_workers))),
+            job_queue_size=int(os.getenv("JOB_QUEUE_SIZE", str(AppConfig.job_queue_size))),
+            job_retention_seconds=int(os.getenv("JOB_RETENTION_SECONDS", str(AppConfig.job_retention_seconds))),
+            job_max_finished=int(os.getenv("JOB_MAX_FINISHED", str(AppConfig.job_max_finished))),
+            pdf_workers=int(os.getenv("PDF_WORKERS", str(AppConfig.pdf_workers))),
+            pdf_worker_max_tasks=int(os.getenv("PDF_WORKER_MAX_TASKS", str(AppConfig.pdf_worker_max_tasks))),
+            max_upload_mb=float(os.getenv("MAX_UPLOAD_MB", str(AppConfig.max_upload_mb))),
+            arxiv_api_url=os.getenv("ARXIV_API_URL", AppConfig.arxiv_api_url),
+            download_concurrency=int(os.getenv("DOWNLOAD_CONCURRENCY", str(AppConfig.download_concurrency))),
+            pdf_cache_enabled=_env_flag("PDF_CACHE_ENABLED", AppConfig.pdf_cache_enabled),
+            artifacts_enabled=_env_flag("ARTIFACTS_ENABLED", AppConfig.artifacts_enabled),
+            results_store_enabled=_env_flag("RESULTS_STORE_ENABLED", AppConfig.results_store_enabled),
+            dedup_enabled=_env_flag("DEDUP_ENABLED", AppConfig.dedup_enabled),
+            dedup_threshold=float(os.getenv("DEDUP_THRESHOLD", str(AppConfig.dedup_threshold))),
+            dedup_section_threshold=float(os.getenv("DEDUP_SECTION_THRESHOLD", str(AppConfig.dedup_section_threshold))),
+            coalesce_enabled=_env_flag("COALESCE_ENABLED", AppConfig.coalesce_enabled),
+            ollama_urls=os.getenv("OLLAMA_URLS", AppConfig.ollama_urls),
+            openai_urls=os.getenv("OPENAI_BASE_URLS", AppConfig.openai_urls),
+            backend_max_concurrency=int(os.getenv("BACKEND_MAX_CONCURRENCY", str(AppConfig.backend_max_concurrency))),
+            backend_health_interval=float(os.getenv("BACKEND_HEALTH_INTERVAL", str(AppConfig.backend_health_interval))),
+            backend_health_timeout=float(os.getenv("BACKEND_HEALTH_TIMEOUT", str(AppConfig.backend_health_timeout))),
+            backend_max_failures=int(os.getenv("BACKEND_MAX_FAILURES", str(AppConfig.backend_max_failures))),
+            daemon_socket=os.getenv("DAEMON_SOCKET", AppConfig.daemon_socket),
+            daemon_forward=_env_flag("DAEMON_FORWARD", AppConfig.daemon_forward),
         )
 
 
@@ -0,0 +1,340 @@
+from __future__ import annotations
+
+import asyncio
+import importlib
+import io
+import json
+import logging
+import os
+import shutil
+import socket
+import socketserver
+import stat
+import struct
+import sys
+import tempfile
+import threading
+import time
+import traceback
+from typing import Any, BinaryIO, Callable, Dict, List, Optional
+
+from .config import ENV_VARS, AppConfig
+
+logger = logging.getLogger(__name__)
+
+# Frames from the daemon: kind (1 byte) + payload length (4 bytes, big-endian) + payload.
+# "O"/"E" carry stdout/stderr bytes; "X" ends the job with its exit code.
+_HEADER = struct.Struct("!cI")
+
+# Imported before the first job so no forwarded command pays for them
+_PRELOAD = (
+    "summazier.pipeline",
+    "summazier.batch",
+    "summazier.arxiv_client",
+    "summazier.results_store",
+    "langchain_openai",
+    "langchain_community.chat_models",
+)
+
+
+# Besides ENV_VARS, forwarded for the terminal (rich, click) and the HTTP clients (httpx, openai)
+_CLIENT_ENV = (
+    "TERM", "COLORTERM", "COLUMNS", "LINES", "NO_COLOR", "FORCE_COLOR", "LANG", "LC_ALL",
+    "HTTP_PROXY", "HTTPS_PROXY", "NO_PROXY", "ALL_PROXY", "http_proxy", "https_proxy", "no_proxy", "all_proxy",
+    "SSL_CERT_FILE", "SSL_CERT_DIR", "OPENAI_ORG_ID", "OPENAI_PROJECT_ID",
+)
+FORWARDED_ENV = frozenset(ENV_VARS) | frozenset(_CLIENT_ENV)
+
+
+def _default_dir() -> str:
+    # Private to this user: $XDG_RUNTIME_DIR, else a 0700 directory of our own under the temp directory
+    return os.getenv("XDG_RUNTIME_DIR") or os.path.join(tempfile.gettempdir(), f"summazier-{os.getuid()}")
+
+
+def socket_path(config: Optional[AppConfig] = None) -> str:
+    """The daemon's socket: ``DAEMON_SOCKET``, else ``summazier.sock`` in a per-user private directory."""
+    configured = config.daemon_socket if config is not None else os.getenv("DAEMON_SOCKET", "")
+    return configured or os.path.join(_default_dir(), "summazier.sock")
+
+
+def _private_dir(directory: str) -> None:
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    st = os.lstat(directory)
+    if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid():
+        raise RuntimeError(f"{directory} is not a directory owned by this user")
+    if stat.S_IMODE(st.st_mode) & 0o077:
+        os.chmod(directory, 0o700)
+
+
+def _untrusted(path: str) -> str:
+    """Why the socket at ``path`` must not be sent this user's environment; empty if it may."""
+    st = os.lstat(path)
+    if not stat.S_ISSOCK(st.st_mode):
+        return "not a socket"
+    if st.st_uid != os.getuid():
+        return "owned by another user"
+    if stat.S_IMODE(st.st_mode) & 0o077:
+        return f"mode {stat.S_IMODE(st.st_mode):o} lets other users connect"
+    return ""
+
+
+def _peer_uid(sock: socket.socket) -> Optional[int]:
+    # The listening process's uid, where the platform reports it (Linux)
+    if not hasattr(socket, "SO_PEERCRED"):
+        return None
+    creds = sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+    return struct.unpack("3i", creds)[1]
+
+
+def _read_frame(stream: BinaryIO) -> Optional[tuple]:
+    header = stream.read(_HEADER.size)
+    if len(header) < _HEADER.size:
+        return None
+    kind, length = _HEADER.unpack(header)
+    return kind, stream.read(length)
+
+
+class _FrameWriter(io.RawIOBase):
+    """Write end of one of the client's streams; looks like a terminal when the client's is one."""
+
+    def __init__(self, send: Callable[[bytes, bytes], None], kind: bytes, tty: bool) -> None:
+        self._send = send
+        self._kind = kind
+        self._tty = tty
+
+    def writable(self) -> bool:
+        return True
+
+    def isatty(self) -> bool:
+        return self._tty
+
+    def write(self, data: Any) -> int:
+        data = bytes(data)
+        if data:
+            self._send(self._kind, data)
+        return len(data)
+
+
+def _text_stream(send: Callable[[bytes, bytes], None], kind: bytes, tty: bool) -> io.TextIOWrapper:
+    return io.TextIOWrapper(
+        io.BufferedWriter(_FrameWriter(send, kind, tty)), encoding="utf-8", errors="replace", line_buffering=True
+    )
+
+
+class _Server(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    server: _Server
+
+    def handle(self) -> None:
+        lock = threading.Lock()
+
+        def send(kind: bytes, data: bytes) -> None:
+            with lock:
+                self.wfile.write(_HEADER.pack(kind, len(data)) + data)
+                self.wfile.flush()
+
+        try:
+            request = json.loads(self.rfile.readline() or b"{}")
+        except ValueError:
+            send(b"E", b"Malformed daemon request\n")
+            send(b"X", b"2")
+            return
+        try:
+            code = self.server.owner.handle(request, send)  # type: ignore[attr-defined]
+            send(b"X", str(code).encode())
+        except OSError:
+            pass  # client went away mid-job
+
+
+class Daemon:
+    """Long-lived process that runs CLI commands for short-lived clients over a Unix socket.
+
+    LLM clients, the LLM cache, the fingerprint index, the results store and a warm PDF
+    worker pool survive between commands, and nothing is imported per command. Commands
+    run one at a time: each swaps in the client's environment, working directory and
+    output streams, which are process-wide.
+    """
+
+    def __init__(self, path: str, pdf_workers: Optional[int] = None, pdf_worker_max_tasks: Optional[int] = None) -> None:
+        self.path = path
+        self.pdf_workers = pdf_workers
+        self.pdf_worker_max_tasks = pdf_worker_max_tasks
+        self.started = time.time()
+        self.jobs = 0
+        self.failed = 0
+        self._lock = threading.Lock()
+        self._server: Optional[_Server] = None
+        self._pool: Any = None
+
+    def _warm(self) -> None:
+        from .workers import PdfWorkerPool, set_shared_pool
+
+        for name in _PRELOAD:
+            try:
+                importlib.import_module(name)
+            except ImportError:
+                pass  # provider backend not installed; commands using it report that themselves
+        self._pool = PdfWorkerPool(self.pdf_workers, self.pdf_worker_max_tasks)
+        asyncio.run(self._pool.start())
+        set_shared_pool(self._pool)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pid": os.getpid(),
+            "socket": self.path,
+            "uptime_seconds": round(time.time() - self.started, 1),
+            "jobs": self.jobs,
+            "failed": self.failed,
+            "pdf_pool": self._pool.stats() if self._pool is not None else None,
+        }
+
+    def handle(self, request: Dict[str, Any], send: Callable[[bytes, bytes], None]) -> int:
+        op = request.get("op", "run")
+        if op == "status":
+            send(b"O", (json.dumps(self.stats()) + "\n").encode())
+            return 0
+        if op == "stop":
+            assert self._server is not None
+            threading.Thread(target=self._server.shutdown, daemon=True).start()
+            return 0
+        return self.run(request.get("argv") or [], request.get("cwd") or os.getcwd(), request.get("env") or {},
+                        bool(request.get("tty")), send)
+
+    def run(
+        self,
+        argv: List[str],
+        cwd: str,
+        env: Dict[str, str],
+        tty: bool,
+        send: Callable[[bytes, bytes], None],
+    ) -> int:
+        from rich.console import Console
+
+        from . import cli
+
+        with self._lock:
+            saved_env = dict(os.environ)
+            saved_cwd = os.getcwd()
+            saved_streams = sys.stdout, sys.stderr
+            out, err = _text_stream(send, b"O", tty), _text_stream(send, b"E", tty)
+            code = 0
+            try:
+                # The daemon's own PATH, HOME, ...; the app's settings only as the client has them
+                os.environ.clear()
+                os.environ.update({k: v for k, v in saved_env.items() if k not in FORWARDED_ENV})
+                os.environ.update({k: v for k, v in env.items() if k in FORWARDED_ENV})
+                os.chdir(cwd)
+                sys.stdout, sys.stderr = out, err
+                cli.console = Console()  # picks up the client's terminal, width and color settings
+                try:
+                    cli.main.main(args=argv, prog_name="python -m summazier.cli", standalone_mode=True)
+                except SystemExit as e:
+                    if isinstance(e.code, int):
+                        code = e.code
+                    elif e.code is not None:
+                        print(e.code, file=err)
+                        code = 1
+                except Exception:
+                    traceback.print_exc(file=err)
+                    code = 1
+                for stream in (out, err):
+                    stream.flush()
+            finally:
+                sys.stdout, sys.stderr = saved_streams
+                os.chdir(saved_cwd)
+                os.environ.clear()
+                os.environ.update(saved_env)
+                self.jobs += 1
+                self.failed += code != 0
+        return code
+
+    def serve_forever(self) -> None:
+        directory = os.path.dirname(os.path.abspath(self.path))
+        if directory == os.path.abspath(_default_dir()):
+            _private_dir(directory)
+        if forward_request({"op": "status"}, self.path, io.BytesIO(), io.BytesIO()) is not None:
+            raise RuntimeError(f"A daemon is already listening on {self.path}")
+        if os.path.lexists(self.path):
+            os.unlink(self.path)  # left behind by a daemon that didn't exit cleanly
+        self._warm()
+        # Jobs run with the client's environment (API keys included): only this user may connect,
+        # from the moment the socket exists
+        umask = os.umask(0o077)
+        try:
+            self._server = _Server(self.path, _Handler)
+        finally:
+            os.umask(umask)
+        self._server.owner = self  # type: ignore[attr-defined]
+        os.chmod(self.path, 0o600)
+        logger.info("summazier daemon listening on %s", self.path)
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+            from .workers import set_shared_pool
+
+            set_shared_pool(None)
+            asyncio.run(self._pool.stop())
+
+
+def forward_request(
+    request: Dict[str, Any],
+    path: str,
+    stdout: Optional[BinaryIO] = None,
+    stderr: Optional[BinaryIO] = None,
+) -> Optional[int]:
+    """Send one request to the daemon and relay its output.
+
+    ``None`` if no daemon is listening, or if the socket isn't this user's alone: requests
+    carry the environment, API keys included.
+    """
+    stdout = stdout or sys.stdout.buffer
+    stderr = stderr or sys.stderr.buffer
+    try:
+        problem = _untrusted(path)
+    except OSError:
+        return None
+    if problem:
+        stderr.write(f"Not using the daemon socket {path}: {problem}\n".encode())
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+        uid = _peer_uid(sock)
+    except OSError:
+        sock.close()
+        return None
+    if uid is not None and uid != os.getuid():
+        sock.close()
+        stderr.write(f"Not using the daemon socket {path}: served by another user\n".encode())
+        return None
+    with sock, sock.makefile("rb") as reader:
+        sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        while True:
+            frame = _read_frame(reader)
+            if frame is None:
+                stderr.write(b"summazier daemon closed the connection\n")
+                return 1
+            kind, data = frame
+            if kind == b"X":
+                return int(data or b"0")
+            target = stdout if kind == b"O" else stderr
+            target.write(data)
+            target.flush()
+
+
+def forward(argv: List[str], path: str) -> Optional[int]:
+    """Run a CLI command in the daemon at ``path`` with this process's cwd, environment and terminal."""
+    tty = sys.stdout.isatty()
+    env = {k: v for k, v in os.environ.items() if k in FORWARDED_ENV}
+    if tty:
+        env.setdefault("COLUMNS", str(shutil.get_terminal_size().columns))
+    try:
+        return forward_request({"argv": argv, "cwd": os.getcwd(), "env": env, "tty": tty}, path)
+    except KeyboardInterrupt:
+        return 130
@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from .config import AppConfig
+
+NUM_PERM = 128
+BANDS = 64  # LSH bands of NUM_PERM // BANDS rows; pairs above ~0.3 Jaccard almost always share one
+SHINGLE_WORDS = 5
+
+_WORD = re.compile(r"\w+")
+_rng = np.random.RandomState(20240229)
+# Fixed seed: signatures are stored on disk and compared across processes
+_A = _rng.randint(1, np.iinfo(np.int64).max, size=NUM_PERM, dtype=np.int64).astype(np.uint64) | np.uint64(1)
+_B = _rng.randint(0, np.iinfo(np.int64).max, size=NUM_PERM, dtype=np.int64).astype(np.uint64)
+_EMPTY = np.full(NUM_PERM, np.iinfo(np.uint64).max, dtype=np.uint64)
+
+
+def _shingles(text: str) -> np.ndarray:
+    words = _WORD.findall(text.lower())
+    if len(words) <= SHINGLE_WORDS:
+        grams = {" ".join(words)} if words else set()
+    else:
+        grams = {" ".join(words[i : i + SHINGLE_WORDS]) for i in range(len(words) - SHINGLE_WORDS + 1)}
+    return np.fromiter(
+        (int.from_bytes(hashlib.blake2b(g.encode("utf-8"), digest_size=8).digest(), "little") for g in grams),
+        dtype=np.uint64,
+        count=len(grams),
+    )
+
+
+def minhash(text: str) -> np.ndarray:
+    """MinHash signature of ``text``'s word 5-gram shingles (case and punctuation ignored)."""
+    hashes = _shingles(text)
+    if not hashes.size:
+        return _EMPTY.copy()
+    sig = _EMPTY.copy()
+    # Universal hashing mod 2**64 (numpy wraps); chunked so long papers don't build a huge matrix
+    with np.errstate(over="ignore"):
+        for start in range(0, hashes.size, 4096):
+            block = hashes[start : start + 4096]
+            np.minimum(sig, (np.outer(_A, block) + _B[:, None]).min(axis=1), out=sig)
+    return sig
+
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of the texts behind two signatures."""
+    return float(np.count_nonzero(a == b)) / NUM_PERM
+
+
+def _bands(sig: np.ndarray) -> List[str]:
+    rows = NUM_PERM // BANDS
+    return [f"{i}:{hashlib.sha1(sig[i * rows : (i + 1) * rows].tobytes()).hexdigest()[:16]}" for i in range(BANDS)]
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def content_hash(sections: Dict[str, str]) -> str:
+    payload = json.dumps(sections, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class Match:
+    """A stored paper near enough to reuse: its result and which sections still match."""
+
+    content_hash: str
+    similarity: float
+    result: Dict[str, Any]
+    # Section name -> stored summary, for sections whose text is near-identical
+    reusable: Dict[str, str] = field(default_factory=dict)
+    changed: List[str] = field(default_factory=list)
+    # Same sections, nothing changed and the same settings for every later stage
+    complete: bool = False
+
+
+class FingerprintIndex:
+    """MinHash fingerprints of summarized papers, with their results, in SQLite.
+
+    Rows are keyed by the exact section texts plus a hash of the settings that produced the
+    result; LSH bands over the whole-paper signature find candidates. ``threshold`` decides
+    whether two papers are versions of each other, ``section_threshold`` whether a section's
+    stored summary still stands, so one rewritten section doesn't discard the rest.
+    """
+
+    def __init__(self, path: str, threshold: float = 0.5, section_threshold: float = 0.9) -> None:
+        self.path = path
+        self.threshold = threshold
+        self.section_threshold = section_threshold
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.partial_hits = 0
+        self.misses = 0
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS papers ("
+            " id INTEGER PRIMARY KEY, content_hash TEXT NOT NULL, params TEXT NOT NULL,"
+            " result_params TEXT NOT NULL, signature BLOB NOT NULL, sections TEXT NOT NULL,"
+            " result TEXT NOT NULL, created REAL NOT NULL,"
+            " UNIQUE (content_hash, result_params))"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS bands ("
+            " band TEXT NOT NULL, paper INTEGER NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS bands_band ON bands(band)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS bands_paper ON bands(paper)")
+
+    def lookup(self, sections: Dict[str, str], params: str, result_params: str) -> Optional[Match]:
+        """The most similar stored paper summarized with the same ``params``, if above the threshold.
+
+        Among equally similar papers, one produced with the same ``result_params`` wins.
+        """
+        sig = minhash("\n\n".join(sections.values()))
+        marks = ",".join("?" * BANDS)
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT DISTINCT p.content_hash, p.result_params, p.signature, p.sections, p.result"
+                f" FROM bands b JOIN papers p ON p.id = b.paper WHERE b.band IN ({marks}) AND p.params = ?",
+                (*_bands(sig), params),
+            ).fetchall()
+        best = None
+        for row in rows:
+            rank = (similarity(sig, np.frombuffer(row[2], dtype=np.uint64)), row[1] == result_params)
+            if rank[0] >= self.threshold and (best is None or rank > best[0]):
+                best = (rank, row)
+        if best is None:
+            self.misses += 1
+            return None
+
+        (score, _), (stored_hash, stored_result_params, _, stored_sections, stored_result) = best
+        stored = json.loads(stored_sections)
+        result = json.loads(stored_result)
+        match = Match(content_hash=stored_hash, similarity=round(score, 4), result=result)
+        for key, text in sections.items():
+            entry = stored.get(key)
+            if entry is not None and (
+                entry["sha256"] == _sha256(text)
+                or similarity(minhash(text), np.frombuffer(bytes.fromhex(entry["signature"]), dtype=np.uint64))
+                >= self.section_threshold
+            ):
+                match.reusable[key] = result["section_summaries"].get(key, "")
+            else:
+                match.changed.append(key)
+        match.complete = not match.changed and set(stored) == set(sections) and stored_result_params == result_params
+        if match.complete:
+            self.hits += 1
+        elif match.reusable:
+            self.partial_hits += 1
+        else:
+            self.misses += 1
+        return match
+
+    def add(self, sections: Dict[str, str], params: str, result_params: str, result: Dict[str, Any]) -> None:
+        sig = minhash("\n\n".join(sections.values()))
+        section_sigs = {
+            key: {"sha256": _sha256(text), "signature": minhash(text).tobytes().hex()} for key, text in sections.items()
+        }
+        with self._lock:
+            self._db.execute("BEGIN")
+            try:
+                # Same text with the same settings: the newer result replaces the old one
+                key = content_hash(sections)
+                old = self._db.execute(
+                    "SELECT id FROM papers WHERE content_hash = ? AND result_params = ?", (key, result_params)
+                ).fetchone()
+                if old is not None:
+                    self._db.execute("DELETE FROM bands WHERE paper = ?", old)
+                    self._db.execute("DELETE FROM papers WHERE id = ?", old)
+                cur = self._db.execute(
+                    "INSERT INTO papers"
+                    " (content_hash, params, result_params, signature, sections, result, created)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        key,
+                        params,
+                        result_params,
+                        sig.tobytes(),
+                        json.dumps(section_sigs),
+                        json.dumps(result, ensure_ascii=False),
+                        time.time(),
+                    ),
+                )
+                self._db.executemany(
+                    "INSERT INTO bands (band, paper) VALUES (?, ?)", [(band, cur.lastrowid) for band in _bands(sig)]
+                )
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            papers = self._db.execute("SELECT COUNT(*) FROM papers").fetchone()[0]
+        return {"papers": papers, "hits": self.hits, "partial_hits": self.partial_hits, "misses": self.misses}
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+_indexes: Dict[str, FingerprintIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_index(config: AppConfig) -> FingerprintIndex:
+    """Return the process-wide fingerprint index for ``config.output_dir``, creating it on first use."""
+    path = os.path.abspath(os.path.join(config.output_dir, "fingerprints.sqlite"))
+    with _indexes_lock:
+        index = _indexes.get(path)
+        if index is None:
+            index = FingerprintIndex(path, config.dedup_threshold, config.dedup_section_threshold)
+            _indexes[path] = index
+        return index
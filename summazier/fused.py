@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import json
+import re
+from typing import Dict, List, Union
+
+from pydantic import BaseModel, Field, ValidationError, field_validator
+
+from .chunking import estimate_tokens
+from .config import PIPELINE_MODES  # noqa: F401  (defined with the config so the CLI needn't import pydantic)
+
+_FENCE = re.compile(r"^```(?:json)?\s*|\s*```$", re.IGNORECASE)
+_NUMBERING = re.compile(r"^\s*(?:\d+[.)]|[-*])\s*")
+
+
+class FusedSynthesis(BaseModel):
+    consolidated: str = Field(min_length=1)
+    refined: str = Field(min_length=1)
+    questions: List[str] = Field(min_length=1)
+
+    @field_validator("questions", mode="before")
+    @classmethod
+    def _split_questions(cls, value: Union[str, List[str]]) -> List[str]:
+        # Small models sometimes return the numbered list as one string
+        if isinstance(value, str):
+            value = value.splitlines()
+        return [q for q in (_NUMBERING.sub("", str(v)).strip() for v in value) if q]
+
+
+class FusedOutput(FusedSynthesis):
+    section_summaries: Dict[str, str]
+
+
+def fits_single_call(sections: Dict[str, str], budget: int) -> bool:
+    """Whether all section text can go into one prompt for a model with this chunk budget."""
+    return sum(estimate_tokens(text) for text in sections.values()) <= budget
+
+
+def _load_json(text: str) -> object:
+    text = _FENCE.sub("", text.strip())
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        # Tolerate chatter around the object
+        start, end = text.find("{"), text.rfind("}")
+        if start < 0 or end <= start:
+            raise ValueError("Response contains no JSON object")
+        try:
+            return json.loads(text[start:end + 1])
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Response is not valid JSON: {e}") from e
+
+
+def parse_synthesis(text: str) -> FusedSynthesis:
+    try:
+        return FusedSynthesis.model_validate(_load_json(text))
+    except ValidationError as e:
+        raise ValueError(f"Response does not match the schema: {e}") from e
+
+
+def parse_fused(text: str, wanted: List[str]) -> FusedOutput:
+    """Parse and validate a fused response; raises ValueError if any wanted section is missing."""
+    try:
+        out = FusedOutput.model_validate(_load_json(text))
+    except ValidationError as e:
+        raise ValueError(f"Response does not match the schema: {e}") from e
+    summaries = {k.strip().lower(): v.strip() for k, v in out.section_summaries.items()}
+    missing = [k for k in wanted if not summaries.get(k)]
+    if missing:
+        raise ValueError(f"Response is missing section summaries: {', '.join(missing)}")
+    out.section_summaries = {k: summaries[k] for k in wanted}
+    return out
+
+
+def format_questions(questions: List[str]) -> str:
+    # Same shape the stepwise questions prompt asks for
+    return "\n".join(f"{i}. {q}" for i, q in enumerate(questions, start=1))
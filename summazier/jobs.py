@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from . import metrics
+from .artifacts import file_sha256
+from .config import AppConfig
+from .pdf_utils import extract_text_from_pdf, split_into_sections
+from .pipeline import PipelineResult, ProgressCallback, run_pipeline_async
+from .results_store import record_result, upload_payload
+from .singleflight import ANALYSES, analysis_key
+from .workers import PdfWorkerPool
+
+logger = logging.getLogger(__name__)
+
+
+class QueueFullError(RuntimeError):
+    pass
+
+
+@dataclass
+class Job:
+    id: str
+    pdf_path: str
+    params: Dict[str, Any]
+    filename: str = ""
+    status: str = "queued"  # queued -> running -> done | failed
+    stage: str = "queued"
+    progress: float = 0.0
+    created: float = field(default_factory=time.time)
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    result: Optional[PipelineResult] = None
+    error: str = ""
+    coalesced: bool = False  # shared the result of an identical job or /analyze request in flight
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in ("done", "failed")
+
+    def to_dict(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = {
+            "job_id": self.id,
+            "status": self.status,
+            "stage": self.stage,
+            "progress": round(self.progress, 3),
+            "created": self.created,
+            "started": self.started,
+            "finished": self.finished,
+        }
+        if self.coalesced:
+            out["coalesced"] = True
+        if self.result is not None:
+            out["result"] = self.result.to_dict()
+        if self.error:
+            out["error"] = self.error
+        return out
+
+
+# Runs one job to completion; reports progress through the callback.
+JobRunner = Callable[[Job, ProgressCallback], Awaitable[PipelineResult]]
+
+
+class JobManager:
+    """Fixed-size worker pool draining a bounded queue of pipeline jobs.
+
+    Finished jobs are kept for ``retention_seconds`` (at most ``max_finished`` of them)
+    so clients can poll for results, then evicted oldest first.
+    """
+
+    def __init__(
+        self,
+        config: AppConfig,
+        workers: Optional[int] = None,
+        max_queue: Optional[int] = None,
+        retention_seconds: Optional[float] = None,
+        max_finished: Optional[int] = None,
+        runner: Optional[JobRunner] = None,
+        pdf_pool: Optional[PdfWorkerPool] = None,
+    ) -> None:
+        self.config = config
+        self.pdf_pool = pdf_pool
+        self.workers = workers or config.job_workers
+        self.max_queue = max_queue or config.job_queue_size
+        self.retention_seconds = config.job_retention_seconds if retention_seconds is None else retention_seconds
+        self.max_finished = max_finished or config.job_max_finished
+        self.runner: JobRunner = runner or self._run_pipeline
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._queue: "Optional[asyncio.Queue[Job]]" = None
+        self._tasks: List["asyncio.Task[None]"] = []
+        # Per analysis key: progress callbacks of every job sharing it, and the last report
+        self._watchers: Dict[str, List[ProgressCallback]] = {}
+        self._latest: Dict[str, Tuple[str, float]] = {}
+        self.completed = 0
+        self.failed = 0
+
+    async def start(self) -> None:
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        # Drop uploads for jobs that never ran
+        for job in self._jobs.values():
+            if not job.is_finished:
+                self._remove_upload(job)
+
+    def submit(self, pdf_path: str, params: Dict[str, Any], filename: str = "") -> Job:
+        if self._queue is None:
+            raise RuntimeError("JobManager is not started")
+        self._evict()
+        job = Job(id=uuid.uuid4().hex, pdf_path=pdf_path, params=params, filename=filename)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise QueueFullError(f"Job queue is full ({self.max_queue} pending)")
+        self._jobs[job.id] = job
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        self._evict()
+        return self._jobs.get(job_id)
+
+    def stats(self) -> Dict[str, int]:
+        running = sum(1 for j in self._jobs.values() if j.status == "running")
+        return {
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "queue_capacity": self.max_queue,
+            "workers": self.workers,
+            "running": running,
+            "retained_finished": sum(1 for j in self._jobs.values() if j.is_finished),
+            "completed": self.completed,
+            "failed": self.failed,
+        }
+
+    async def _worker(self) -> None:
+        assert self._queue is not None
+        while True:
+            job = await self._queue.get()
+            job.status = "running"
+            job.started = time.time()
+
+            def on_progress(stage: str, fraction: float, job: Job = job) -> None:
+                job.stage = stage
+                job.progress = fraction
+
+            try:
+                job.result = await self.runner(job, on_progress)
+                job.status = "done"
+                job.stage = "done"
+                job.progress = 1.0
+                self.completed += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.exception("Job %s failed", job.id)
+                job.status = "failed"
+                job.error = str(e)
+                self.failed += 1
+            finally:
+                job.finished = time.time()
+                self._remove_upload(job)
+                self._queue.task_done()
+
+    async def _run_pipeline(self, job: Job, on_progress: ProgressCallback) -> PipelineResult:
+        if not self.config.coalesce_enabled:
+            return await self._analyze(job, on_progress)
+        digest = await asyncio.to_thread(file_sha256, job.pdf_path)
+        key = analysis_key(digest, job.params)
+        # Jobs joining a running analysis report its progress, from where it is now
+        watchers = self._watchers.setdefault(key, [])
+        watchers.append(on_progress)
+        if key in self._latest:
+            on_progress(*self._latest[key])
+
+        def broadcast(stage: str, fraction: float) -> None:
+            self._latest[key] = (stage, fraction)
+            for watcher in list(self._watchers.get(key, ())):
+                watcher(stage, fraction)
+
+        try:
+            result, job.coalesced = await ANALYSES.run(key, lambda: self._analyze(job, broadcast))
+        finally:
+            watchers.remove(on_progress)
+            if not watchers:
+                del self._watchers[key]
+                self._latest.pop(key, None)
+        return result
+
+    async def _analyze(self, job: Job, on_progress: ProgressCallback) -> PipelineResult:
+        on_progress("extract", 0.0)
+        with metrics.track_run() as run:
+            if self.pdf_pool is not None:
+                sections_map = await self.pdf_pool.parse(job.pdf_path)
+            else:
+                with metrics.stage("extract"):
+                    text = await asyncio.to_thread(extract_text_from_pdf, job.pdf_path)
+                with metrics.stage("split"):
+                    sections_map = await asyncio.to_thread(split_into_sections, text)
+            result = await run_pipeline_async(
+                config=self.config,
+                sections=sections_map,
+                on_progress=on_progress,
+                **job.params,
+            )
+        result.timings = run.breakdown()
+        payload = upload_payload(job.filename, sections_map, result.to_dict())
+        model = job.params.get("model") or self.config.openai_model
+        await asyncio.to_thread(record_result, self.config, payload, model, "jobs")
+        return result
+
+    def _remove_upload(self, job: Job) -> None:
+        try:
+            os.unlink(job.pdf_path)
+        except OSError:
+            pass
+
+    def _evict(self) -> None:
+        now = time.time()
+        finished = [j for j in self._jobs.values() if j.is_finished]
+        expired = [j for j in finished if j.finished is not None and now - j.finished > self.retention_seconds]
+        overflow = len(finished) - len(expired) - self.max_finished
+        if overflow > 0:
+            expired_ids = {j.id for j in expired}
+            remaining = sorted((j for j in finished if j.id not in expired_ids), key=lambda j: j.finished or 0)
+            expired.extend(remaining[:overflow])
+        for job in expired:
+            self._jobs.pop(job.id, None)
@@ -1,41 +1,720 @@
 from __future__ import annotations
 
-from typing import Optional
+import asyncio
+import hashlib
+import logging
+import random
+import re
+import threading
+import time
+import weakref
+from contextlib import nullcontext
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar
 
-from langchain_openai import ChatOpenAI
-from langchain_core.messages import SystemMessage, HumanMessage
+import httpx
 
-try:
-    from langchain_community.chat_models import ChatOllama  # type: ignore
-except Exception:  # pragma: no cover
-    ChatOllama = None  # type: ignore
+from . import metrics
+from .cache import LLMCache
+from .chunking import estimate_tokens
+from .singleflight import LeaderGone, SingleFlight
+
+if TYPE_CHECKING:
+    from .balancer import BackendPool
+
+# Provider backends (langchain_openai, langchain_community) are imported on first use in
+# _build_chat: together they take about a second to import, and a run needs at most one.
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class PoolSettings:
+    max_connections: int = 20
+    keepalive_seconds: float = 30.0
+    timeout_seconds: float = 120.0
+
+    def limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_connections,
+            keepalive_expiry=self.keepalive_seconds,
+        )
+
+
+# (provider, model, base_url, temperature, api key fingerprint, pool settings)
+ClientKey = Tuple[str, str, str, float, str, PoolSettings]
+
+
+class ClientRegistry:
+    """Process-wide pool of chat models so requests reuse warm HTTP connections.
+
+    OpenAI chat models get a shared keep-alive ``httpx`` pool. Async pools are bound
+    to the event loop that created them, so async chat models are kept per loop and
+    dropped once their loop is closed. :class:`PoolSettings` are part of the key, so a
+    caller with other settings (a daemon command with a changed env) gets its own pool.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._sync: Dict[ClientKey, Any] = {}
+        self._async: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[ClientKey, Any]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._http_clients: List[httpx.Client] = []
+        self._async_http_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, List[httpx.AsyncClient]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self.created = 0
+        self.reused = 0
+
+    @staticmethod
+    def make_key(
+        provider: str, model: str, base_url: Optional[str], temperature: float, api_key: str, pool: PoolSettings
+    ) -> ClientKey:
+        fingerprint = hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16] if api_key else ""
+        return (provider, model, base_url or "", temperature, fingerprint, pool)
+
+    def _evict_closed_loops(self) -> None:
+        # Each asyncio.run() (every daemon command) leaves a closed loop behind; its clients
+        # reference it, so the weak keys alone would never let go. Caller holds the lock.
+        for loop in [loop for loop in list(self._async.keys()) if loop.is_closed()]:
+            self._async.pop(loop, None)
+            self._async_http_clients.pop(loop, None)
+
+    def chat(
+        self,
+        provider: str,
+        model: str,
+        api_key: str,
+        base_url: Optional[str],
+        temperature: float,
+        pool: PoolSettings,
+    ) -> Any:
+        key = self.make_key(provider, model, base_url, temperature, api_key, pool)
+        with self._lock:
+            chat = self._sync.get(key)
+            if chat is not None:
+                self.reused += 1
+                return chat
+            http_client = None
+            if provider == "openai":
+                http_client = httpx.Client(limits=pool.limits(), timeout=pool.timeout_seconds)
+                self._http_clients.append(http_client)
+            chat = _build_chat(
+                provider, model, api_key, base_url, temperature,
+                http_client=http_client, timeout_seconds=pool.timeout_seconds,
+            )
+            self._sync[key] = chat
+            self.created += 1
+            return chat
+
+    def async_chat(
+        self,
+        provider: str,
+        model: str,
+        api_key: str,
+        base_url: Optional[str],
+        temperature: float,
+        pool: PoolSettings,
+    ) -> Any:
+        if provider != "openai":
+            # ChatOllama holds no loop-bound state
+            return self.chat(provider, model, api_key, base_url, temperature, pool)
+        loop = asyncio.get_running_loop()
+        key = self.make_key(provider, model, base_url, temperature, api_key, pool)
+        with self._lock:
+            self._evict_closed_loops()
+            per_loop = self._async.setdefault(loop, {})
+            chat = per_loop.get(key)
+            if chat is not None:
+                self.reused += 1
+                return chat
+            http_client = httpx.AsyncClient(limits=pool.limits(), timeout=pool.timeout_seconds)
+            self._async_http_clients.setdefault(loop, []).append(http_client)
+            chat = _build_chat(
+                provider, model, api_key, base_url, temperature,
+                http_async_client=http_client, timeout_seconds=pool.timeout_seconds,
+            )
+            per_loop[key] = chat
+            self.created += 1
+            return chat
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            self._evict_closed_loops()
+            return {
+                "sync_clients": len(self._sync),
+                "async_clients": sum(len(v) for v in self._async.values()),
+                "created": self.created,
+                "reused": self.reused,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            for client in self._http_clients:
+                client.close()
+            self._http_clients = []
+            self._sync.clear()
+
+    async def aclose_loop(self) -> None:
+        """Close the async pools owned by the running loop; call before the loop ends."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            clients = self._async_http_clients.pop(loop, [])
+            self._async.pop(loop, None)
+        for client in clients:
+            await client.aclose()
+
+    async def aclose(self) -> None:
+        """Close async pools owned by the running loop, then the sync ones."""
+        await self.aclose_loop()
+        self.close()
+
+
+registry = ClientRegistry()
+
+
+def _build_chat(
+    provider: str,
+    model: str,
+    api_key: str,
+    base_url: Optional[str],
+    temperature: float,
+    http_client: Optional[httpx.Client] = None,
+    http_async_client: Optional[httpx.AsyncClient] = None,
+    timeout_seconds: float = PoolSettings.timeout_seconds,
+) -> Any:
+    if provider == "openai":
+        kwargs: Dict[str, Any] = {
+            "model": model,
+            "api_key": api_key,
+            "temperature": temperature,
+            "timeout": timeout_seconds,
+        }
+        if base_url:
+            # Any OpenAI-compatible server, e.g. vLLM or a local proxy (http://host:port/v1)
+            kwargs["base_url"] = base_url
+        if http_client is not None:
+            kwargs["http_client"] = http_client
+        if http_async_client is not None:
+            kwargs["http_async_client"] = http_async_client
+        # Retries are handled by ProviderLimiter so backoff is shared across callers
+        kwargs["max_retries"] = 0
+        from langchain_openai import ChatOpenAI
+
+        return ChatOpenAI(**kwargs)
+    elif provider == "ollama":
+        try:
+            from langchain_community.chat_models import ChatOllama
+        except ImportError as e:
+            raise RuntimeError("ChatOllama is not available. Install langchain-community and run Ollama.") from e
+        # base_url like http://localhost:11434
+        kwargs = {"model": model, "temperature": temperature, "timeout": int(timeout_seconds)}
+        if base_url:
+            kwargs["base_url"] = base_url
+        return ChatOllama(**kwargs)
+    else:
+        raise ValueError("Unsupported provider. Use 'openai' or 'ollama'.")
+
+
+def _messages(system: str, prompt: str) -> List[Any]:
+    from langchain_core.messages import HumanMessage, SystemMessage
+
+    return [SystemMessage(content=system), HumanMessage(content=prompt)]
+
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class LimiterSettings:
+    requests_per_minute: float = 0  # 0 = unlimited
+    tokens_per_minute: float = 0  # estimated prompt + completion tokens; 0 = unlimited
+    max_retries: int = 4
+    base_delay_seconds: float = 1.0
+    max_delay_seconds: float = 60.0
+    initial_concurrency: int = 4
+    min_concurrency: int = 1
+    max_concurrency: int = 16
+
+
+class TokenBucket:
+    """Classic token bucket refilled continuously at ``rate_per_minute``.
+
+    ``reserve`` always succeeds and returns how long the caller must wait, letting
+    the balance go negative so waiting callers queue up fairly.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None) -> None:
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # A single request larger than the bucket would otherwise wait forever
+            self._tokens -= min(amount, self.capacity)
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+
+class AdaptiveConcurrency:
+    """AIMD concurrency limit: +1 per window of successes, halved on throttling."""
+
+    def __init__(self, initial: int, min_limit: int = 1, max_limit: int = 16, cooldown_seconds: float = 2.0) -> None:
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = float(min(max(initial, self.min_limit), self.max_limit))
+        self.in_flight = 0
+        self.cooldown_seconds = cooldown_seconds
+        self._last_decrease = 0.0
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            if self.in_flight < int(self.limit):
+                self.in_flight += 1
+                return True
+            return False
+
+    def release(self, outcome: str) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            if outcome == "success":
+                self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+            elif outcome in ("throttle", "timeout"):
+                # One decrease per cooldown, so a burst of 429s from one overload counts once
+                now = time.monotonic()
+                if now - self._last_decrease >= self.cooldown_seconds:
+                    self.limit = max(self.min_limit, self.limit / 2)
+                    self._last_decrease = now
+
+
+_STATUS_IN_MESSAGE = re.compile(r"status code (\d{3})")
+
+
+def classify_error(exc: BaseException) -> Tuple[Optional[str], Optional[float]]:
+    """Return (kind, retry_after_seconds); kind is throttle, timeout, transient or None."""
+    status = getattr(exc, "status_code", None)
+    response = getattr(exc, "response", None)
+    if status is None and response is not None:
+        status = getattr(response, "status_code", None) or getattr(response, "status", None)
+    if status is None:
+        match = _STATUS_IN_MESSAGE.search(str(exc))  # ChatOllama reports HTTP errors as ValueError text
+        if match:
+            status = int(match.group(1))
+
+    retry_after = None
+    headers = getattr(response, "headers", None)
+    if headers is not None:
+        value = headers.get("retry-after")
+        try:
+            retry_after = float(value) if value is not None else None
+        except ValueError:
+            retry_after = None
+
+    if status in (429, 503):
+        return "throttle", retry_after
+    if isinstance(status, int) and status >= 500:
+        return "transient", retry_after
+    if isinstance(exc, (asyncio.TimeoutError, TimeoutError, httpx.TimeoutException)) or "Timeout" in type(exc).__name__:
+        return "timeout", retry_after
+    if isinstance(exc, (ConnectionError, httpx.TransportError)) or "Connection" in type(exc).__name__:
+        return "transient", retry_after
+    return None, None
+
+
+class ProviderLimiter:
+    """Shared per-provider gate: request/token buckets, adaptive concurrency and retries."""
+
+    def __init__(self, name: str, settings: LimiterSettings) -> None:
+        self.name = name
+        self.settings = settings
+        self.requests = TokenBucket(settings.requests_per_minute) if settings.requests_per_minute > 0 else None
+        self.tokens = TokenBucket(settings.tokens_per_minute) if settings.tokens_per_minute > 0 else None
+        self.concurrency = AdaptiveConcurrency(
+            settings.initial_concurrency, settings.min_concurrency, settings.max_concurrency
+        )
+        self._paused_until = 0.0
+        self.calls = 0
+        self.retries = 0
+        self.throttled = 0
+        self.failures = 0
+
+    def _bucket_wait(self, est_tokens: int) -> float:
+        wait = max(0.0, self._paused_until - time.monotonic())
+        if self.requests is not None:
+            wait = max(wait, self.requests.reserve(1))
+        if self.tokens is not None:
+            wait = max(wait, self.tokens.reserve(est_tokens))
+        return wait
+
+    async def acquire_async(self, est_tokens: int) -> None:
+        wait = self._bucket_wait(est_tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        while not self.concurrency.try_acquire():
+            await asyncio.sleep(0.05)
+
+    def acquire(self, est_tokens: int) -> None:
+        wait = self._bucket_wait(est_tokens)
+        if wait > 0:
+            time.sleep(wait)
+        while not self.concurrency.try_acquire():
+            time.sleep(0.05)
+
+    def release(self, outcome: str) -> None:
+        self.concurrency.release(outcome)
+
+    def retry_delay(self, exc: BaseException, attempt: int) -> Optional[float]:
+        """Record a failure; return seconds to wait before retrying, or None to give up."""
+        kind, retry_after = classify_error(exc)
+        if kind == "throttle":
+            self.throttled += 1
+        if kind is None or attempt >= self.settings.max_retries:
+            self.failures += 1
+            return None
+        self.retries += 1
+        delay = min(self.settings.max_delay_seconds, self.settings.base_delay_seconds * (2 ** attempt))
+        delay *= random.uniform(0.5, 1.0)
+        if retry_after is not None:
+            delay = min(self.settings.max_delay_seconds, retry_after) + random.uniform(0, 0.5)
+            # Everyone sharing this provider holds off, not just the caller that got the 429
+            self._paused_until = max(self._paused_until, time.monotonic() + delay)
+        logger.warning("%s: %s (attempt %d), retrying in %.1fs", self.name, kind, attempt + 1, delay)
+        return delay
+
+    async def acall(self, fn: Callable[[], Awaitable[T]], est_tokens: int) -> T:
+        attempt = 0
+        while True:
+            await self.acquire_async(est_tokens)
+            self.calls += 1
+            try:
+                result = await fn()
+            except Exception as e:
+                self.release(classify_error(e)[0] or "error")
+                delay = self.retry_delay(e, attempt)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            self.release("success")
+            return result
+
+    def call(self, fn: Callable[[], T], est_tokens: int) -> T:
+        attempt = 0
+        while True:
+            self.acquire(est_tokens)
+            self.calls += 1
+            try:
+                result = fn()
+            except Exception as e:
+                self.release(classify_error(e)[0] or "error")
+                delay = self.retry_delay(e, attempt)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                attempt += 1
+                continue
+            self.release("success")
+            return result
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "concurrency_limit": round(self.concurrency.limit, 2),
+            "in_flight": self.concurrency.in_flight,
+            "calls": self.calls,
+            "retries": self.retries,
+            "throttled": self.throttled,
+            "failures": self.failures,
+        }
+
+
+_limiters: Dict[Tuple[str, str], ProviderLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(provider: str, base_url: Optional[str], settings: LimiterSettings) -> ProviderLimiter:
+    """Process-wide limiter for a provider endpoint, rebuilt when called with other settings.
+
+    A long-lived process (the CLI daemon) sees each command's env; a changed rate limit
+    or retry policy takes effect instead of the first command's sticking.
+    """
+    key = (provider, base_url or "")
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None or limiter.settings != settings:
+            limiter = ProviderLimiter(f"{provider}@{base_url}" if base_url else provider, settings)
+            _limiters[key] = limiter
+        return limiter
+
+
+def limiter_stats() -> Dict[str, Dict[str, Any]]:
+    with _limiters_lock:
+        return {limiter.name: limiter.stats() for limiter in _limiters.values()}
+
+
+# Rough allowance for the completion when budgeting tokens per minute
+_EXPECTED_COMPLETION_TOKENS = 512
+
+
+def _reported_usage(message: Any) -> Optional[Tuple[int, int]]:
+    # langchain-core normalizes usage for some providers; fall back to raw metadata
+    usage = getattr(message, "usage_metadata", None)
+    if usage:
+        return int(usage.get("input_tokens", 0)), int(usage.get("output_tokens", 0))
+    meta = getattr(message, "response_metadata", None) or {}
+    token_usage = meta.get("token_usage")  # OpenAI
+    if token_usage:
+        return int(token_usage.get("prompt_tokens", 0)), int(token_usage.get("completion_tokens", 0))
+    if "eval_count" in meta or "prompt_eval_count" in meta:  # Ollama
+        return int(meta.get("prompt_eval_count") or 0), int(meta.get("eval_count") or 0)
+    return None
 
 
 class LLMClient:
-    def __init__(self, api_key: str, model: str = "gpt-4o-mini", provider: str = "openai", base_url: Optional[str] = None) -> None:
+    def __init__(
+        self,
+        api_key: str,
+        model: str = "gpt-4o-mini",
+        provider: str = "openai",
+        base_url: Optional[str] = None,
+        temperature: float = 0.2,
+        cache: Optional[LLMCache] = None,
+        pool: Optional[PoolSettings] = None,
+        limiter: Optional[ProviderLimiter] = None,
+        backends: Optional["BackendPool"] = None,
+        inflight: Optional[SingleFlight] = None,
+    ) -> None:
         self.provider = provider
-        if provider == "openai":
-            self._chat = ChatOpenAI(model=model, api_key=api_key, temperature=0.2)
-        elif provider == "ollama":
-            if ChatOllama is None:
-                raise RuntimeError("ChatOllama is not available. Install langchain-community and run Ollama.")
-            # base_url like http://localhost:11434
-            kwargs = {"model": model, "temperature": 0.2}
-            if base_url:
-                kwargs["base_url"] = base_url
-            self._chat = ChatOllama(**kwargs)
-        else:
-            raise ValueError("Unsupported provider. Use 'openai' or 'ollama'.")
+        self.model = model
+        # With several backends, the pool's name stands in for the URL in cache keys
+        self.base_url = backends.name if backends is not None else base_url
+        self.temperature = temperature
+        self.cache = cache
+        self.limiter = limiter
+        self.backends = backends
+        # Identical calls already in flight (from any pipeline) are joined instead of repeated
+        self.inflight = inflight
+        self._api_key = api_key
+        self._pool = pool or PoolSettings()
+        self._chat = None if backends is not None else self._sync_chat(base_url)
 
-    async def acomplete(self, system: str, prompt: str) -> str:
-        messages = [SystemMessage(content=system), HumanMessage(content=prompt)]
-        resp = await self._chat.ainvoke(messages)
-        return resp.content or ""
+    def _sync_chat(self, base_url: Optional[str]) -> Any:
+        return registry.chat(self.provider, self.model, self._api_key, base_url, self.temperature, self._pool)
 
-    def complete(self, system: str, prompt: str) -> str:
-        messages = [SystemMessage(content=system), HumanMessage(content=prompt)]
-        resp = self._chat.invoke(messages)
-        return resp.content or ""
+    def _async_chat(self, base_url: Optional[str]) -> Any:
+        return registry.async_chat(self.provider, self.model, self._api_key, base_url, self.temperature, self._pool)
+
+    def _routed(self) -> Any:
+        """Context manager yielding the URL to send one call to (a pool slot when load-balancing)."""
+        return self.backends.use(self.model) if self.backends is not None else nullcontext(self.base_url)
+
+    def _arouted(self) -> Any:
+        return self.backends.ause(self.model) if self.backends is not None else nullcontext(self.base_url)
+
+    def cache_key(self, system: str, prompt: str, json_mode: bool = False) -> str:
+        return LLMCache.make_key(self.provider, self.model, self.base_url, self.temperature, system, prompt, json_mode)
+
+    def _flight_key(self, system: str, prompt: str, json_mode: bool) -> str:
+        return self.cache_key(system, prompt, json_mode)
+
+    def _cached(self, system: str, prompt: str, json_mode: bool) -> Tuple[Optional[str], Optional[str]]:
+        if self.cache is None:
+            return None, None
+        key = self.cache_key(system, prompt, json_mode)
+        return key, self.cache.get(key)
+
+    def _store(self, key: Optional[str], out: str) -> None:
+        if key is not None and out:
+            self.cache.set(key, out)
+
+    # The disk tier is SQLite: keep its reads and writes off the event loop
+    async def _acached(self, system: str, prompt: str, json_mode: bool) -> Tuple[Optional[str], Optional[str]]:
+        if self.cache is None:
+            return None, None
+        return await asyncio.to_thread(self._cached, system, prompt, json_mode)
+
+    async def _astore(self, key: Optional[str], out: str) -> None:
+        if key is not None and out:
+            await asyncio.to_thread(self.cache.set, key, out)
+
+    @staticmethod
+    def _estimate(system: str, prompt: str) -> int:
+        return estimate_tokens(system) + estimate_tokens(prompt) + _EXPECTED_COMPLETION_TOKENS
+
+    def _record(self, system: str, prompt: str, out: str, seconds: float, message: Any) -> None:
+        usage = _reported_usage(message)
+        if usage is None:
+            usage = (estimate_tokens(system) + estimate_tokens(prompt), estimate_tokens(out))
+        metrics.record_llm_call(self.provider, self.model, seconds, usage[0], usage[1])
+
+    def _record_hit(self) -> None:
+        metrics.record_llm_call(self.provider, self.model, 0.0, 0, 0, cached=True)
+
+    def _json_bound(self, chat: Any, json_mode: bool) -> Any:
+        # Ask the provider to constrain output to a JSON object
+        if not json_mode:
+            return chat
+        if self.provider == "openai":
+            return chat.bind(response_format={"type": "json_object"})
+        return chat.bind(format="json")
+
+    async def acomplete(
+        self, system: str, prompt: str, json_mode: bool = False, gate: Optional[asyncio.Semaphore] = None
+    ) -> str:
+        """Generate a reply. ``gate`` is held only while this call generates one itself: not
+        for cache hits, nor while waiting on an identical call already in flight."""
+        key, cached = await self._acached(system, prompt, json_mode)
+        if cached is not None:
+            self._record_hit()
+            return cached
+        if self.inflight is None:
+            return await self._agenerate(system, prompt, json_mode, key, gate)
+        out, _ = await self.inflight.run(
+            self._flight_key(system, prompt, json_mode), lambda: self._agenerate(system, prompt, json_mode, key, gate)
+        )
+        return out
+
+    async def _agenerate(
+        self, system: str, prompt: str, json_mode: bool, key: Optional[str], gate: Optional[asyncio.Semaphore]
+    ) -> str:
+        messages = _messages(system, prompt)
+
+        async def invoke() -> Any:
+            async with self._arouted() as url:
+                return await self._json_bound(self._async_chat(url), json_mode).ainvoke(messages)
+
+        async with gate or nullcontext():
+            start = time.perf_counter()
+            if self.limiter is not None:
+                resp = await self.limiter.acall(invoke, self._estimate(system, prompt))
+            else:
+                resp = await invoke()
+        out = resp.content or ""
+        self._record(system, prompt, out, time.perf_counter() - start, resp)
+        await self._astore(key, out)
+        return out
+
+    async def astream(
+        self, system: str, prompt: str, gate: Optional[asyncio.Semaphore] = None
+    ) -> AsyncIterator[str]:
+        """Stream a reply; ``gate`` as for :meth:`acomplete`."""
+        key, cached = await self._acached(system, prompt, False)
+        if cached is not None:
+            self._record_hit()
+            yield cached
+            return
+        if self.inflight is None:
+            async for token in self._astream(system, prompt, key, gate):
+                yield token
+            return
+        flight_key = self._flight_key(system, prompt, False)
+        future, leader = self.inflight.begin(flight_key)
+        if not leader:
+            # Joined late: the text arrives in one piece, like a cache hit
+            try:
+                out = await self.inflight.wait(future)
+            except LeaderGone:
+                pass
+            else:
+                yield out
+                return
+            async for token in self._astream(system, prompt, key, gate):
+                yield token
+            return
+        parts: List[str] = []
+        try:
+            async for token in self._astream(system, prompt, key, gate):
+                parts.append(token)
+                yield token
+        except BaseException as e:
+            self.inflight.finish(flight_key, future, error=e)
+            raise
+        self.inflight.finish(flight_key, future, "".join(parts))
+
+    async def _astream(
+        self, system: str, prompt: str, key: Optional[str], gate: Optional[asyncio.Semaphore]
+    ) -> AsyncIterator[str]:
+        messages = _messages(system, prompt)
+        start = time.perf_counter()
+        usage_chunk: Any = None
+        attempt = 0
+        async with gate or nullcontext():
+            while True:
+                if self.limiter is not None:
+                    await self.limiter.acquire_async(self._estimate(system, prompt))
+                    self.limiter.calls += 1
+                parts: List[str] = []
+                outcome = "error"
+                retry_in: Optional[float] = None
+                try:
+                    async with self._arouted() as url:
+                        async for chunk in self._async_chat(url).astream(messages):
+                            if _reported_usage(chunk) is not None:
+                                usage_chunk = chunk
+                            token = chunk.content or ""
+                            if token:
+                                parts.append(token)
+                                yield token
+                    outcome = "success"
+                except Exception as e:
+                    if self.limiter is None:
+                        raise
+                    outcome = classify_error(e)[0] or "error"
+                    # Once tokens reached the caller a retry would duplicate them
+                    retry_in = None if parts else self.limiter.retry_delay(e, attempt)
+                    if retry_in is None:
+                        raise
+                finally:
+                    # Also runs if the consumer stops iterating early
+                    if self.limiter is not None:
+                        self.limiter.release(outcome)
+                if retry_in is None:
+                    break
+                await asyncio.sleep(retry_in)
+                attempt += 1
+        out = "".join(parts)
+        self._record(system, prompt, out, time.perf_counter() - start, usage_chunk)
+        await self._astore(key, out)
+
+    def complete(self, system: str, prompt: str, json_mode: bool = False) -> str:
+        key, cached = self._cached(system, prompt, json_mode)
+        if cached is not None:
+            self._record_hit()
+            return cached
+        if self.inflight is None:
+            return self._generate(system, prompt, json_mode, key)
+        out, _ = self.inflight.call(
+            self._flight_key(system, prompt, json_mode), lambda: self._generate(system, prompt, json_mode, key)
+        )
+        return out
+
+    def _generate(self, system: str, prompt: str, json_mode: bool, key: Optional[str]) -> str:
+        messages = _messages(system, prompt)
+
+        def invoke() -> Any:
+            with self._routed() as url:
+                chat = self._chat if self.backends is None else self._sync_chat(url)
+                return self._json_bound(chat, json_mode).invoke(messages)
+
+        start = time.perf_counter()
+        if self.limiter is not None:
+            resp = self.limiter.call(invoke, self._estimate(system, prompt))
+        else:
+            resp = invoke()
+        out = resp.content or ""
+        self._record(system, prompt, out, time.perf_counter() - start, resp)
+        self._store(key, out)
+        return out
 
 
 def enforce_word_limit(text: str, max_words: int) -> str:
@@ -0,0 +1,309 @@
+from __future__ import annotations
+
+import contextvars
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Minimal Prometheus text-format metrics; avoids adding prometheus_client as a dependency.
+
+LabelValues = Tuple[str, ...]
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+RATE_BUCKETS = (1, 5, 10, 20, 50, 100, 200, 500)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(n, "")) for n in self.labels)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"] + self._samples()
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()) -> None:
+        super().__init__(name, help, labels)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            return [f"{self.name}{_format_labels(self.labels, k)} {_format_value(v)}" for k, v in self._values.items()]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, **labels: str) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS) -> None:
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        self._counts: Dict[LabelValues, List[int]] = {}
+        self._sums: Dict[LabelValues, float] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            counts = self._counts.setdefault(key, [0] * len(self.buckets))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+            self._sums[key] = self._sums.get(key, 0.0) + value
+
+    def _samples(self) -> List[str]:
+        lines = []
+        with self._lock:
+            for key, counts in self._counts.items():
+                for bound, count in zip(self.buckets, counts):
+                    le = 'le="' + _format_value(bound) + '"'
+                    lines.append(f"{self.name}_bucket{_format_labels(self.labels, key, le)} {count}")
+                lines.append(f"{self.name}_sum{_format_labels(self.labels, key)} {_format_value(self._sums[key])}")
+                lines.append(f"{self.name}_count{_format_labels(self.labels, key)} {counts[-1]}")
+        return lines
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric) -> Any:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+STAGE_SECONDS = REGISTRY.register(
+    Histogram("summazier_stage_seconds", "Wall time per pipeline stage", ["stage"])
+)
+LLM_CALL_SECONDS = REGISTRY.register(
+    Histogram("summazier_llm_call_seconds", "Latency of LLM calls", ["provider", "model", "stage"])
+)
+LLM_TOKENS = REGISTRY.register(
+    Counter("summazier_llm_tokens_total", "LLM tokens by kind (prompt/completion)", ["provider", "model", "kind"])
+)
+LLM_TOKENS_PER_SECOND = REGISTRY.register(
+    Histogram("summazier_llm_tokens_per_second", "Completion tokens per second", ["provider", "model"], RATE_BUCKETS)
+)
+LLM_CACHE = REGISTRY.register(
+    Counter("summazier_llm_cache_requests_total", "LLM cache lookups by result", ["result"])
+)
+LLM_CONCURRENCY_LIMIT = REGISTRY.register(
+    Gauge("summazier_llm_concurrency_limit", "Current adaptive concurrency limit", ["endpoint"])
+)
+BACKEND_REQUESTS = REGISTRY.register(
+    Counter("summazier_backend_requests_total", "LLM calls routed to each backend by outcome", ["backend", "outcome"])
+)
+BACKEND_IN_FLIGHT = REGISTRY.register(Gauge("summazier_backend_in_flight", "LLM calls in flight per backend", ["backend"]))
+BACKEND_HEALTHY = REGISTRY.register(
+    Gauge("summazier_backend_healthy", "1 if the backend passed its last health check", ["backend"])
+)
+COALESCED_REQUESTS = REGISTRY.register(
+    Counter("summazier_coalesced_requests_total", "Requests that joined an identical one already in flight", ["kind"])
+)
+FUSED_FALLBACKS = REGISTRY.register(
+    Counter("summazier_fused_fallbacks_total", "Fused-mode responses that failed validation", ["stage"])
+)
+PACKED_SECTIONS = REGISTRY.register(
+    Counter(
+        "summazier_packed_sections_total",
+        "Sections summarized in a packed call, or summarized alone after the packed reply left them out",
+        ["outcome"],
+    )
+)
+ARTIFACT_REUSE = REGISTRY.register(
+    Counter("summazier_artifact_reuse_total", "Stages loaded from the run artifact store instead of recomputed", ["stage"])
+)
+COMPRESSION_TOKENS = REGISTRY.register(
+    Counter("summazier_compression_tokens_total", "Section tokens before and after compression", ["kind"])
+)
+DEDUP_LOOKUPS = REGISTRY.register(
+    Counter("summazier_dedup_lookups_total", "Near-duplicate paper lookups by result (hit/partial/miss)", ["result"])
+)
+JOBS_QUEUE_DEPTH = REGISTRY.register(Gauge("summazier_jobs_queue_depth", "Jobs waiting for a worker"))
+JOBS_RUNNING = REGISTRY.register(Gauge("summazier_jobs_running", "Jobs currently running"))
+PDF_POOL_QUEUE_DEPTH = REGISTRY.register(
+    Gauge("summazier_pdf_pool_queue_depth", "PDFs waiting for a free parsing worker")
+)
+PDF_POOL_BUSY = REGISTRY.register(Gauge("summazier_pdf_pool_busy", "Parsing workers currently busy"))
+PDF_POOL_WAIT_SECONDS = REGISTRY.register(
+    Histogram("summazier_pdf_pool_wait_seconds", "Time a PDF spent queued or in transit to a parsing worker")
+)
+
+
+class RunMetrics:
+    """Per-run breakdown collected alongside the process-wide metrics."""
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.stages: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def _stage(self, stage: str) -> Dict[str, float]:
+        return self.stages.setdefault(
+            stage,
+            {"seconds": 0.0, "llm_calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "cache_hits": 0},
+        )
+
+    def add_time(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            self._stage(stage)["seconds"] += seconds
+
+    def add_call(self, stage: str, prompt_tokens: int, completion_tokens: int, cached: bool) -> None:
+        with self._lock:
+            entry = self._stage(stage)
+            entry["llm_calls"] += 1
+            entry["prompt_tokens"] += prompt_tokens
+            entry["completion_tokens"] += completion_tokens
+            if cached:
+                entry["cache_hits"] += 1
+
+    def breakdown(self) -> Dict[str, Any]:
+        with self._lock:
+            stages = {name: dict(values) for name, values in self.stages.items()}
+        for values in stages.values():
+            values["seconds"] = round(values["seconds"], 4)
+            seconds = values["seconds"]
+            values["tokens_per_second"] = (
+                round(values["completion_tokens"] / seconds, 2) if seconds > 0 and values["completion_tokens"] else None
+            )
+        return {
+            "total_seconds": round(time.perf_counter() - self.started, 4),
+            "llm_calls": sum(int(v["llm_calls"]) for v in stages.values()),
+            "prompt_tokens": sum(int(v["prompt_tokens"]) for v in stages.values()),
+            "completion_tokens": sum(int(v["completion_tokens"]) for v in stages.values()),
+            "cache_hits": sum(int(v["cache_hits"]) for v in stages.values()),
+            "stages": stages,
+        }
+
+
+_current_run: "contextvars.ContextVar[Optional[RunMetrics]]" = contextvars.ContextVar("summazier_run", default=None)
+_current_stage: "contextvars.ContextVar[str]" = contextvars.ContextVar("summazier_stage", default="")
+
+
+def current_run() -> Optional[RunMetrics]:
+    return _current_run.get()
+
+
+@contextmanager
+def track_run() -> Iterator[RunMetrics]:
+    """Collect a per-run breakdown; nested calls share the outermost run."""
+    run = _current_run.get()
+    if run is not None:
+        yield run
+        return
+    run = RunMetrics()
+    token = _current_run.set(run)
+    try:
+        yield run
+    finally:
+        _current_run.reset(token)
+
+
+@contextmanager
+def use_run(run: RunMetrics) -> Iterator[RunMetrics]:
+    """Make ``run`` the current run, e.g. when one item's stages run in different tasks."""
+    token = _current_run.set(run)
+    try:
+        yield run
+    finally:
+        _current_run.reset(token)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Time a stage; LLM calls made inside are attributed to it."""
+    token = _current_stage.set(name)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        _current_stage.reset(token)
+        observe_stage(name, elapsed)
+
+
+def observe_stage(name: str, seconds: float) -> None:
+    """Record a stage timed elsewhere (e.g. in a worker process)."""
+    STAGE_SECONDS.observe(seconds, stage=name.split(":", 1)[0])
+    run = _current_run.get()
+    if run is not None:
+        run.add_time(name, seconds)
+
+
+def record_llm_call(
+    provider: str,
+    model: str,
+    seconds: float,
+    prompt_tokens: int,
+    completion_tokens: int,
+    cached: bool = False,
+) -> None:
+    stage_name = _current_stage.get() or "other"
+    LLM_CACHE.inc(result="hit" if cached else "miss")
+    if not cached:
+        LLM_CALL_SECONDS.observe(seconds, provider=provider, model=model, stage=stage_name.split(":", 1)[0])
+        LLM_TOKENS.inc(prompt_tokens, provider=provider, model=model, kind="prompt")
+        LLM_TOKENS.inc(completion_tokens, provider=provider, model=model, kind="completion")
+        if seconds > 0 and completion_tokens:
+            LLM_TOKENS_PER_SECOND.observe(completion_tokens / seconds, provider=provider, model=model)
+    run = _current_run.get()
+    if run is not None:
+        run.add_call(stage_name, prompt_tokens, completion_tokens, cached)
+
+
+def render() -> str:
+    return REGISTRY.render()
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import re
+from typing import Dict, List
+
+from .chunking import estimate_tokens
+
+# Role preamble, instructions and headings of a packed prompt, on top of the section text
+PROMPT_OVERHEAD_TOKENS = 150
+
+_HEADING = re.compile(r"^[\s#*]*=+\s*(.+?)\s*=+[\s*]*$", re.MULTILINE)
+
+
+def heading(key: str) -> str:
+    return f"=== {key.upper()} ==="
+
+
+def plan_packs(
+    sections: Dict[str, str],
+    budget: int,
+    max_section_tokens: int,
+    output_tokens: int,
+) -> List[Dict[str, str]]:
+    """Group short sections so each group fits one call of a model with this chunk budget.
+
+    A section is short when it has at most ``max_section_tokens``; each one packed also
+    reserves ``output_tokens`` of the budget for its summary, since small local models
+    share one context window between prompt and reply. Groups are filled largest first
+    and keep the sections' original order; sections that end up alone are left out and
+    summarized on their own as usual.
+    """
+    order = list(sections)
+    cost = {key: estimate_tokens(text) + output_tokens for key, text in sections.items()}
+    capacity = budget - PROMPT_OVERHEAD_TOKENS
+    short = [key for key in order if estimate_tokens(sections[key]) <= max_section_tokens and cost[key] <= capacity]
+    bins: List[List[str]] = []
+    room: List[int] = []
+    for key in sorted(short, key=lambda k: cost[k], reverse=True):
+        for i, free in enumerate(room):
+            if cost[key] <= free:
+                bins[i].append(key)
+                room[i] -= cost[key]
+                break
+        else:
+            bins.append([key])
+            room.append(capacity - cost[key])
+    return [{key: sections[key] for key in sorted(group, key=order.index)} for group in bins if len(group) > 1]
+
+
+def parse_packed(text: str, keys: List[str]) -> Dict[str, str]:
+    """Split a packed reply on its ``=== KEY ===`` headings.
+
+    Returns the non-empty summaries found for ``keys``; sections the reply leaves out
+    (or garbles the heading of) are missing from the result.
+    """
+    wanted = {key.lower(): key for key in keys}
+    out: Dict[str, str] = {}
+    matches = list(_HEADING.finditer(text))
+    for i, match in enumerate(matches):
+        key = wanted.get(match.group(1).strip().lower())
+        if key is None or key in out:
+            continue
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+        summary = text[match.end():end].strip()
+        if summary:
+            out[key] = summary
+    return out
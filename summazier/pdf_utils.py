@@ -1,69 +1,199 @@
 from __future__ import annotations
 
-from typing import Dict
+import io
+import os
+import re  # stdlib re is ~4x faster than `regex` for the heading scan
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import IO, Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
 
 from pypdf import PdfReader
-import regex as re
 
 
-def extract_text_from_pdf(pdf_path: str) -> str:
-    reader = PdfReader(pdf_path)
-    pages = []
-    for page in reader.pages:
-        pages.append(page.extract_text() or "")
+# Below this many pages, process start-up costs more than it saves.
+PARALLEL_MIN_PAGES = 32
+# Don't hand a worker fewer pages than this.
+MIN_PAGES_PER_WORKER = 8
+
+# A path, the PDF's bytes, or a binary file-like object (e.g. an upload's spooled file)
+PdfSource = Union[str, "os.PathLike[str]", bytes, bytearray, memoryview, IO[bytes]]
+
+
+@contextmanager
+def _pdf_stream(source: PdfSource) -> Iterator[IO[bytes]]:
+    # pypdf reads a whole file into memory when given a path; a handle is read in place
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            yield f
+    elif isinstance(source, (bytes, bytearray, memoryview)):
+        yield io.BytesIO(source)  # shares the buffer for bytes
+    else:
+        source.seek(0)
+        yield source
+
+
+def _extract_page_range(pdf_path: str, start: int, end: int) -> List[str]:
+    # Runs in a worker process: open the file once and extract a contiguous range.
+    with _pdf_stream(pdf_path) as stream:
+        reader = PdfReader(stream)
+        return [reader.pages[i].extract_text() or "" for i in range(start, end)]
+
+
+def _partition_pages(num_pages: int, parts: int) -> List[Tuple[int, int]]:
+    size, extra = divmod(num_pages, parts)
+    ranges = []
+    start = 0
+    for i in range(parts):
+        end = start + size + (1 if i < extra else 0)
+        ranges.append((start, end))
+        start = end
+    return ranges
+
+
+def extract_text_from_pdf(
+    source: PdfSource,
+    workers: Optional[int] = None,
+    min_pages_for_parallel: int = PARALLEL_MIN_PAGES,
+) -> str:
+    """Extract page text from a path, bytes, or seekable binary file object.
+
+    Large files given by path are split across worker processes; in-memory and
+    file-object sources are always extracted in this process.
+    """
+    with _pdf_stream(source) as stream:
+        reader = PdfReader(stream)
+        num_pages = len(reader.pages)
+
+        if workers is None:
+            workers = os.cpu_count() or 1
+        workers = min(workers, num_pages // MIN_PAGES_PER_WORKER)
+        if not isinstance(source, (str, os.PathLike)):
+            workers = 1
+
+        if workers <= 1 or num_pages < min_pages_for_parallel:
+            pages = []
+            for page in reader.pages:
+                pages.append(page.extract_text() or "")
+            return "\n\n".join(pages)
+
+    pdf_path = os.fspath(source)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(_extract_page_range, pdf_path, start, end)
+            for start, end in _partition_pages(num_pages, workers)
+        ]
+        # Futures are in page order, so concatenating results preserves it
+        pages = [text for future in futures for text in future.result()]
     return "\n\n".join(pages)
 
 
+# Heading text (lowercase, single spaces) -> section key
+HEADING_KEYS = {
+    "abstract": "abstract",
+    "summary": "abstract",  # only as the first heading; a later one is a conclusion
+    "introduction": "introduction",
+    "background": "introduction",
+    "related work": "introduction",
+    "method": "methods",
+    "methods": "methods",
+    "methodology": "methods",
+    "materials and methods": "methods",
+    "methods and materials": "methods",
+    "experiments": "methods",
+    "experimental setup": "methods",
+    "results": "results",
+    "results and discussion": "results",
+    "evaluation": "results",
+    "discussion": "discussion",
+    "limitations": "discussion",
+    "conclusion": "conclusion",
+    "conclusions": "conclusion",
+    "concluding remarks": "conclusion",
+    "acknowledgment": "other",
+    "acknowledgments": "other",
+    "acknowledgement": "other",
+    "acknowledgements": "other",
+    "references": "other",
+    "bibliography": "other",
+}
+SECTION_KEYS = ("abstract", "introduction", "methods", "results", "discussion", "conclusion", "other")
+
+_HEADING_NAMES = "|".join(
+    name.replace(" ", r"[ \t]+") for name in sorted(HEADING_KEYS, key=len, reverse=True)
+)
+# One pass over the text finds every heading: a line holding only a known name, optionally
+# numbered ("3 Methods", "2.1 Results", "III. RESULTS"; Roman numerals uppercase only, so
+# "Civil ..." isn't one), or an inline "Abstract: ..." / "Abstract We ..." lead-in.
+_HEADING = re.compile(
+    r"^[ \t]*(?:"
+    r"(?:(?:\d+(?:\.\d+)*|(?-i:[IVXLC]+))\.?[ \t]+)?(?P<name>" + _HEADING_NAMES + r")[ \t]*[:.]?[ \t]*$"
+    r"|(?P<inline>abstract)[ \t]*[:.\u2014\u2013-][ \t]*"
+    r"|(?P<lead>(?-i:Abstract|ABSTRACT))[ \t]+(?=\S)"
+    r")",
+    re.IGNORECASE | re.MULTILINE,
+)
+_WHITESPACE = re.compile(r"\s+")
+
+
+class SectionSpan(NamedTuple):
+    label: str  # one of SECTION_KEYS
+    start: int
+    end: int
+
+
+def find_section_spans(text: str) -> List[SectionSpan]:
+    """Locate sections as ``(label, start, end)`` offsets into ``text`` without copying it."""
+    spans: List[SectionSpan] = []
+    label = "other"  # title, authors etc. before the first heading
+    body_start = 0
+    seen_abstract = False
+    loose_abstract = False  # opened by a bare "Abstract We ..." line, which may be a title instead
+    first = True
+    for m in _HEADING.finditer(text):
+        lead = m.group("lead")
+        name = _WHITESPACE.sub(" ", (m.group("name") or m.group("inline") or lead).lower())
+        key = HEADING_KEYS[name]
+        if name == "summary" and not first:
+            key = "conclusion"  # only a paper's opening "Summary" stands in for the abstract
+        first = False
+        if key == "abstract":
+            # "Abstract" only opens one section; later mentions are body text, unless a real
+            # heading follows a bare lead-in directly ("Abstract Interpretation of ...": a title)
+            if seen_abstract:
+                if lead or not (loose_abstract and label == "abstract"):
+                    continue
+                label = "other"
+            seen_abstract = True
+            loose_abstract = lead is not None
+        if m.start() > body_start:
+            spans.append(SectionSpan(label, body_start, m.start()))
+        label = key
+        body_start = m.end()
+    if body_start < len(text):
+        spans.append(SectionSpan(label, body_start, len(text)))
+    return spans
+
+
+@dataclass
+class SectionIndex:
+    """Section spans over the original text; section strings are built only when asked for."""
+
+    text: str
+    spans: List[SectionSpan]
+
+    def section(self, key: str) -> str:
+        parts = [self.text[s.start:s.end].strip() for s in self.spans if s.label == key]
+        return "\n\n".join(p for p in parts if p)
+
+    def to_dict(self) -> Dict[str, str]:
+        return {key: self.section(key) for key in SECTION_KEYS}
+
+
+def index_sections(text: str) -> SectionIndex:
+    return SectionIndex(text, find_section_spans(text))
+
+
 def split_into_sections(text: str) -> Dict[str, str]:
     # Heuristic section splitter for academic papers; best-effort.
-    content = text
-    # Normalize headings to uppercase to improve matching
-    normalized = re.sub(r"\n\s*\n", "\n\n", content)
-
-    sections = {
-        "abstract": "",
-        "introduction": "",
-        "methods": "",
-        "results": "",
-        "discussion": "",
-        "conclusion": "",
-        "other": "",
-    }
-
-    # Try to find an abstract block first
-    abs_match = re.search(r"(?is)\babstract\b\s*[:\-]?\s*(.+?)(?=\n\n\s*\b(introduction|background)\b|\Z)", normalized)
-    if abs_match:
-        sections["abstract"] = abs_match.group(1).strip()
-
-    # Generic splitter by headings
-    pattern = re.compile(
-        r"(?im)^(abstract|introduction|background|methods?|materials and methods|experiments|results|discussion|conclusion|acknowledgments?|references)\s*$"
-    )
-    parts = []
-    last_idx = 0
-    current_label = "other"
-    for m in pattern.finditer(normalized):
-        if m.start() > last_idx:
-            parts.append((current_label, normalized[last_idx:m.start()].strip()))
-        current_label = m.group(1).lower()
-        last_idx = m.end()
-    # tail
-    if last_idx < len(normalized):
-        parts.append((current_label, normalized[last_idx:].strip()))
-
-    for label, body in parts:
-        if not body:
-            continue
-        label_key = (
-            "methods"
-            if label in {"method", "methods", "materials and methods", "experiments"}
-            else "results" if label == "results" else "discussion" if label == "discussion" else "introduction" if label in {"introduction", "background"} else "conclusion" if label == "conclusion" else "other"
-        )
-        # Prefer the abstract we already captured
-        if label_key == "abstract":
-            if not sections["abstract"]:
-                sections["abstract"] = body
-        else:
-            sections[label_key] = (sections[label_key] + "\n\n" + body).strip()
-
-    return sections
+    return index_sections(text).to_dict()
@@ -1,16 +1,51 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Dict, Optional, Iterable
+import asyncio
+import logging
+import weakref
+from dataclasses import asdict, dataclass, field, replace
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Iterable, List, Tuple
 
+from . import metrics
+from .artifacts import ArtifactStore, acheckpoint, checkpoint, input_key
+from .balancer import backend_specs, get_backend_pool
+from .cache import get_cache
+from .chunking import chunk_budget_for_model, chunk_text, group_for_reduce
+from .compression import compress_text
 from .config import AppConfig
-from .llm import LLMClient
+from .fingerprint import FingerprintIndex, Match, get_index
+from .fused import PIPELINE_MODES, FusedOutput, FusedSynthesis, fits_single_call, format_questions, parse_fused, parse_synthesis
+from .llm import LimiterSettings, LLMClient, PoolSettings, get_limiter
+from .packing import parse_packed, plan_packs
 from .prompts import (
     stepwise_summary_prompt,
+    packed_summary_prompt,
+    chunk_summary_prompt,
+    reduce_summaries_prompt,
     consolidate_prompt,
     refinement_prompt,
     questions_prompt,
+    fused_prompt,
+    fused_synthesis_prompt,
 )
+from .routing import ModelRouter, ModelSpec, parse_model, parse_stage_models
+from .singleflight import LLM_CALLS
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_SECTIONS = ["abstract", "methods", "results", "discussion"]
+
+SECTION_SYSTEM = "You summarize scientific text."
+CONSOLIDATE_SYSTEM = "You write structured scientific summaries."
+REFINE_SYSTEM = "You refine text with strict word limits."
+QUESTIONS_SYSTEM = "You generate research questions."
+FUSED_SYSTEM = "You analyze scientific papers and reply only with a JSON object."
+
+# Called as on_progress(stage, fraction_complete) as the pipeline advances
+ProgressCallback = Callable[[str, float], None]
+# Receives event dicts ({"event": "token" | "section" | "stage" | "stage_done", ...})
+EventCallback = Callable[[Dict[str, Any]], None]
 
 
 @dataclass
@@ -19,6 +54,352 @@ class PipelineResult:
     consolidated: str
     refined: str
     questions: str
+    # Which path produced the result: "stepwise", "fused" (one call) or "fused_synthesis"
+    # (stepwise sections, then one call for the rest)
+    mode: str = "stepwise"
+    # Token counts before/after extractive compression, overall and per section (empty when off)
+    compression: Dict[str, Any] = field(default_factory=dict)
+    # Set when a near-identical, already summarized paper was found: its similarity and
+    # which sections were reused or summarized again
+    dedup: Dict[str, Any] = field(default_factory=dict)
+    # Per-stage wall time, LLM calls, token counts and cache hits for this run
+    timings: Dict[str, Any] = field(default_factory=dict)
+    # "provider/model" that answered each stage ("section:abstract", "consolidate", ...)
+    models: Dict[str, str] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+# One semaphore per (provider, base_url) and event loop, so concurrent pipelines
+# in the same process share the limit instead of each getting their own.
+_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Tuple[str, str], asyncio.Semaphore]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _provider_semaphore(provider: str, base_url: Optional[str], limit: int) -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    # A semaphore that was waited on references its loop, so closed loops are dropped explicitly
+    for closed in [other for other in list(_semaphores.keys()) if other.is_closed()]:
+        _semaphores.pop(closed, None)
+    per_loop = _semaphores.setdefault(loop, {})
+    key = (provider, base_url or "")
+    sem = per_loop.get(key)
+    if sem is None:
+        sem = asyncio.Semaphore(max(1, limit))
+        per_loop[key] = sem
+    return sem
+
+
+def _limiter_settings(config: AppConfig) -> LimiterSettings:
+    return LimiterSettings(
+        requests_per_minute=config.rate_limit_rpm,
+        tokens_per_minute=config.rate_limit_tpm,
+        max_retries=config.llm_max_retries,
+        base_delay_seconds=config.llm_retry_base_delay,
+        max_delay_seconds=config.llm_retry_max_delay,
+        initial_concurrency=config.max_concurrency,
+        max_concurrency=config.adaptive_max_concurrency,
+    )
+
+
+def _make_client(
+    config: AppConfig,
+    model: Optional[str],
+    provider: Optional[str],
+    base_url: Optional[str],
+    use_cache: bool = True,
+) -> LLMClient:
+    provider = provider or config.provider
+    # BASE_URL belongs to the configured default provider; don't send OpenAI calls to Ollama
+    specs = backend_specs(config, provider, base_url)
+    backends = None
+    settings = _limiter_settings(config)
+    if len(specs) > 1:
+        backends = get_backend_pool(config, provider, specs)
+        base_url = backends.name
+        # Retries and rate limits stay shared; the fleet as a whole may run every backend's cap at once
+        settings = replace(
+            settings,
+            initial_concurrency=backends.capacity,
+            max_concurrency=max(backends.capacity, settings.max_concurrency),
+        )
+    else:
+        base_url = specs[0][0] if specs else None
+    return LLMClient(
+        api_key=config.openai_api_key,
+        model=model or config.openai_model,
+        provider=provider,
+        base_url=base_url,
+        cache=get_cache(config) if (use_cache and config.cache_enabled) else None,
+        pool=PoolSettings(
+            max_connections=config.http_pool_size,
+            keepalive_seconds=config.http_keepalive_seconds,
+            timeout_seconds=config.http_timeout_seconds,
+        ),
+        limiter=get_limiter(provider, base_url, settings),
+        backends=backends,
+        inflight=LLM_CALLS if config.coalesce_enabled else None,
+    )
+
+
+def _make_router(
+    config: AppConfig,
+    model: Optional[str],
+    provider: Optional[str],
+    base_url: Optional[str],
+    use_cache: bool,
+    stage_models: Optional[str],
+    small_model: Optional[str],
+) -> ModelRouter:
+    default = _make_client(config, model, provider, base_url, use_cache)
+
+    def client_for(spec: ModelSpec) -> LLMClient:
+        stage_provider = spec[0] or default.provider
+        # An explicit base_url belongs to the run's provider, like BASE_URL does
+        url = base_url if stage_provider == default.provider else None
+        return _make_client(config, spec[1], stage_provider, url, use_cache)
+
+    stages = parse_stage_models(config.stage_models if stage_models is None else stage_models)
+    small_spec = config.router_small_model if small_model is None else small_model
+    small = client_for(parse_model(small_spec)) if small_spec else None
+    small_max_tokens = 0
+    if small is not None:
+        small_max_tokens = config.router_small_max_tokens or chunk_budget_for_model(small.model)
+    return ModelRouter(default, {stage: client_for(spec) for stage, spec in stages.items()}, small, small_max_tokens)
+
+
+def _wanted_sections(only_sections: Optional[Iterable[str]]) -> List[str]:
+    return list(only_sections) if only_sections else list(DEFAULT_SECTIONS)
+
+
+def _section_chunks(config: AppConfig, text: str, budget: int, map_reduce: Optional[bool]) -> List[str]:
+    enabled = config.map_reduce if map_reduce is None else map_reduce
+    if not enabled:
+        return [text]
+    return chunk_text(text, budget, config.chunk_overlap_tokens) or [text]
+
+
+def _pipeline_mode(config: AppConfig, mode: Optional[str]) -> str:
+    mode = (mode or config.pipeline_mode).lower()
+    if mode not in PIPELINE_MODES:
+        raise ValueError(f"Unknown pipeline mode {mode!r}; use one of: {', '.join(PIPELINE_MODES)}")
+    return mode
+
+
+def _present_sections(sections: Dict[str, str], wanted: List[str]) -> Dict[str, str]:
+    return {key: sections[key].strip() for key in wanted if sections.get(key, "").strip()}
+
+
+def _compress_sections(
+    config: AppConfig, present: Dict[str, str], compress: Optional[bool]
+) -> Tuple[Dict[str, str], Dict[str, Any]]:
+    enabled = config.compression_enabled if compress is None else compress
+    if not enabled or not present:
+        return present, {}
+    out: Dict[str, str] = {}
+    per_section: Dict[str, Any] = {}
+    with metrics.stage("compress"):
+        for key, text in present.items():
+            result = compress_text(
+                text,
+                ratio=config.compression_ratio,
+                max_tokens=config.compression_max_tokens,
+                min_tokens=config.compression_min_tokens,
+            )
+            # A section that is all noise keeps its text rather than vanishing from the summary
+            out[key] = result.text or text
+            per_section[key] = result.to_dict()
+    original = sum(stats["original_tokens"] for stats in per_section.values())
+    kept = sum(stats["kept_tokens"] for stats in per_section.values())
+    metrics.COMPRESSION_TOKENS.inc(original, kind="original")
+    metrics.COMPRESSION_TOKENS.inc(kept, kind="kept")
+    return out, {
+        "original_tokens": original,
+        "kept_tokens": kept,
+        "ratio": round(kept / original, 4) if original else 1.0,
+        "sections": per_section,
+    }
+
+
+def _dedup_keys(
+    config: AppConfig,
+    router: ModelRouter,
+    role: Optional[str],
+    max_words: int,
+    num_questions: int,
+    budget: int,
+    map_reduce: Optional[bool],
+    compress: Optional[bool],
+    packing: bool,
+    mode: str,
+    wanted: List[str],
+) -> Tuple[str, str]:
+    # Settings a section summary depends on, then everything the rest of the result depends on
+    sections = _section_inputs(config, router, role, "", max_words, budget, map_reduce)
+    compressed = config.compression_enabled if compress is None else compress
+    if compressed:
+        sections["compression"] = [config.compression_ratio, config.compression_max_tokens, config.compression_min_tokens]
+    if packing:
+        sections["pack"] = [config.pack_max_section_tokens, config.pack_output_tokens]
+    params = input_key("dedup", sections)
+    rest: Dict[str, Any] = {"params": params, "num_questions": num_questions, "mode": mode, "sections": wanted}
+    if router.signature():
+        rest["models"] = router.signature()
+    return params, input_key("dedup", rest)
+
+
+def _find_duplicate(
+    config: AppConfig,
+    dedup: Optional[bool],
+    use_cache: bool,
+    present: Dict[str, str],
+    keys: Tuple[str, str],
+) -> Tuple[Optional[FingerprintIndex], Optional[Match]]:
+    enabled = config.dedup_enabled if dedup is None else dedup
+    if not enabled or not present:
+        return None, None
+    index = get_index(config)
+    if not use_cache:
+        return index, None  # still record the fresh result for later runs
+    with metrics.stage("dedup"):
+        match = index.lookup(present, *keys)
+    if match is None or not match.reusable:
+        metrics.DEDUP_LOOKUPS.inc(result="miss")
+        return index, None
+    metrics.DEDUP_LOOKUPS.inc(result="hit" if match.complete else "partial")
+    return index, match
+
+
+def _pack_groups(config: AppConfig, packing: bool, sections: Dict[str, str], budget: int) -> List[Dict[str, str]]:
+    if not packing:
+        return []
+    return plan_packs(sections, budget, config.pack_max_section_tokens, config.pack_output_tokens)
+
+
+def _unpacked(raw: str, keys: List[str]) -> Dict[str, str]:
+    summaries = parse_packed(raw, keys)
+    missing = [key for key in keys if key not in summaries]
+    if missing:
+        logger.warning("Packed reply is missing %s; summarizing them separately", ", ".join(missing))
+    metrics.PACKED_SECTIONS.inc(len(summaries), outcome="packed")
+    metrics.PACKED_SECTIONS.inc(len(missing), outcome="fallback")
+    return summaries
+
+
+def _dedup_info(match: Optional[Match]) -> Dict[str, Any]:
+    if match is None:
+        return {}
+    return {
+        "matched": match.content_hash,
+        "similarity": match.similarity,
+        "reused_sections": sorted(match.reusable),
+        "changed_sections": match.changed,
+        "complete": match.complete,
+    }
+
+
+_REUSED_FIELDS = ("section_summaries", "consolidated", "refined", "questions", "mode", "models")
+
+
+def _reused_result(match: Match, run: metrics.RunMetrics) -> PipelineResult:
+    stored = match.result
+    return PipelineResult(
+        section_summaries=stored["section_summaries"],
+        consolidated=stored["consolidated"],
+        refined=stored["refined"],
+        questions=stored["questions"],
+        mode=stored["mode"],
+        models=stored.get("models", {}),
+        dedup=_dedup_info(match),
+        timings=run.breakdown(),
+    )
+
+
+def _finish(
+    index: Optional[FingerprintIndex],
+    match: Optional[Match],
+    present: Dict[str, str],
+    keys: Tuple[str, str],
+    models: Dict[str, str],
+    result: PipelineResult,
+) -> PipelineResult:
+    result.dedup = _dedup_info(match)
+    result.models = models
+    if index is not None:
+        stored = result.to_dict()
+        index.add(present, *keys, {k: stored[k] for k in _REUSED_FIELDS})
+    return result
+
+
+def _parsed(parse: Callable[[], Any], stage: str) -> Any:
+    # Any validation problem means falling back to the stepwise path, never failing the run
+    try:
+        return parse()
+    except ValueError as e:
+        logger.warning("Fused %s response unusable, falling back to stepwise: %s", stage, e)
+        metrics.FUSED_FALLBACKS.inc(stage=stage)
+        return None
+
+
+def _synthesis_result(
+    summary_sections: Dict[str, str],
+    out: FusedSynthesis,
+    mode: str,
+    compression: Dict[str, Any],
+    run: metrics.RunMetrics,
+) -> PipelineResult:
+    return PipelineResult(
+        section_summaries=summary_sections,
+        consolidated=out.consolidated.strip(),
+        refined=out.refined.strip(),
+        questions=format_questions(out.questions),
+        mode=mode,
+        compression=compression,
+        timings=run.breakdown(),
+    )
+
+
+def _stage_inputs(router: ModelRouter, stage: str, role: Optional[str], **inputs: Any) -> Dict[str, Any]:
+    # What a stage's output depends on; the artifact store keys on a hash of this
+    return {**router.inputs(stage), "role": role, **inputs}
+
+
+def _section_inputs(
+    config: AppConfig,
+    router: ModelRouter,
+    role: Optional[str],
+    text: str,
+    max_words: int,
+    budget: int,
+    map_reduce: Optional[bool],
+) -> Dict[str, Any]:
+    return _stage_inputs(
+        router,
+        "sections",
+        role,
+        text=text,
+        max_words=max_words,
+        budget=budget,
+        overlap=config.chunk_overlap_tokens,
+        map_reduce=config.map_reduce if map_reduce is None else map_reduce,
+    )
+
+
+def _validated(data: Optional[Dict[str, Any]], model: Any) -> Any:
+    return None if data is None else model.model_validate(data)
+
+
+def _consolidate(role: Optional[str], summary_sections: Dict[str, str], max_words: int) -> str:
+    return consolidate_prompt(
+        role,
+        summary_sections.get("abstract", ""),
+        summary_sections.get("methods", ""),
+        summary_sections.get("results", ""),
+        summary_sections.get("discussion", ""),
+        max_words=max_words,
+    )
 
 
 def run_pipeline_sync(
@@ -31,54 +412,465 @@ def run_pipeline_sync(
     provider: Optional[str] = None,
     base_url: Optional[str] = None,
     only_sections: Optional[Iterable[str]] = None,
+    use_cache: bool = True,
+    map_reduce: Optional[bool] = None,
+    compress: Optional[bool] = None,
+    pack: Optional[bool] = None,
+    dedup: Optional[bool] = None,
+    mode: Optional[str] = None,
+    stage_models: Optional[str] = None,
+    small_model: Optional[str] = None,
+    artifacts: Optional[ArtifactStore] = None,
 ) -> PipelineResult:
-    client = LLMClient(
-        api_key=config.openai_api_key,
-        model=model or config.openai_model,
-        provider=(provider or config.provider),
-        base_url=(base_url or config.base_url),
+    router = _make_router(config, model, provider, base_url, use_cache, stage_models, small_model)
+    budget = chunk_budget_for_model(router.stage_client("sections").model, config.chunk_tokens)
+    fused_budget = chunk_budget_for_model(router.stage_client("fused").model, config.chunk_tokens)
+    mode = _pipeline_mode(config, mode)
+    fused = mode == "fused"
+    wanted = _wanted_sections(only_sections)
+    present = _present_sections(sections, wanted)
+    packing = config.pack_sections if pack is None else pack
+    keys = _dedup_keys(
+        config, router, role, max_words, num_questions, budget, map_reduce, compress, packing, mode, wanted
+    )
+
+    def complete(stage: str, system: str, prompt: str, json_mode: bool = False) -> str:
+        return router.client(stage, prompt).complete(system=system, prompt=prompt, json_mode=json_mode)
+
+    def summarize(key: str, text: str) -> str:
+        stage = f"section:{key}"
+        chunks = _section_chunks(config, text, budget, map_reduce)
+        if len(chunks) == 1:
+            prompt = stepwise_summary_prompt(role, key, text, max_words)
+            return complete(stage, SECTION_SYSTEM, prompt).strip()
+        # Map: one call per chunk; reduce: merge partial summaries until one remains
+        partials = [
+            complete(stage, SECTION_SYSTEM, chunk_summary_prompt(role, key, chunk, i, len(chunks))).strip()
+            for i, chunk in enumerate(chunks, start=1)
+        ]
+        while True:
+            groups = group_for_reduce(partials, budget)
+            partials = [
+                complete(stage, SECTION_SYSTEM, reduce_summaries_prompt(role, key, group)).strip() for group in groups
+            ]
+            if len(partials) == 1:
+                return partials[0]
+
+    def summarize_pack(group: Dict[str, str]) -> Dict[str, str]:
+        name = "section:" + "+".join(group)
+        with metrics.stage(name):
+            return checkpoint(
+                artifacts,
+                name,
+                _stage_inputs(router, "sections", role, sections=group, max_words=max_words),
+                lambda: _unpacked(complete(name, SECTION_SYSTEM, packed_summary_prompt(role, group)), list(group)),
+            )
+
+    def fused_call() -> Optional[Dict[str, Any]]:
+        raw = complete("fused", FUSED_SYSTEM, fused_prompt(role, present, num_questions), json_mode=True)
+        out = _parsed(lambda: parse_fused(raw, list(present)), "fused")
+        return None if out is None else out.model_dump()
+
+    def synthesis_call(summary_sections: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        prompt = fused_synthesis_prompt(role, summary_sections, num_questions)
+        raw = complete("synthesis", FUSED_SYSTEM, prompt, json_mode=True)
+        out = _parsed(lambda: parse_synthesis(raw), "synthesis")
+        return None if out is None else out.model_dump()
+
+    with metrics.track_run() as run:
+        index, match = _find_duplicate(config, dedup, use_cache, present, keys)
+        if match is not None and match.complete:
+            return _reused_result(match, run)
+        reuse = match.reusable if match is not None else {}
+        original = present
+        present, compression = _compress_sections(config, present, compress)
+        # The single fused call would redo reused sections; reuse them and synthesize the rest instead
+        if fused and not reuse and present and fits_single_call(present, fused_budget):
+            # Everything in one call when the whole paper fits the model's budget
+            with metrics.stage("fused"):
+                data = checkpoint(
+                    artifacts,
+                    "fused",
+                    _stage_inputs(router, "fused", role, sections=present, num_questions=num_questions),
+                    fused_call,
+                )
+            out = _validated(data, FusedOutput)
+            if out is not None:
+                summaries = {key: out.section_summaries.get(key, "") for key in wanted}
+                result = _synthesis_result(summaries, out, "fused", compression, run)
+                return _finish(index, match, original, keys, router.models, result)
+            fused = False  # a model that can't produce the schema once likely won't on retry
+
+        # Stepwise summaries; with packing, short sections share calls first
+        summary_sections = {}
+        todo = {key: present[key] for key in wanted if key not in reuse and present.get(key)}
+        with metrics.stage("sections"):
+            packed: Dict[str, str] = {}
+            for group in _pack_groups(config, packing, todo, budget):
+                packed.update(summarize_pack(group))
+            for key in wanted:
+                text = present.get(key, "")
+                if key in reuse or not text:
+                    summary_sections[key] = reuse.get(key, "")
+                    continue
+                if key in packed:
+                    summary_sections[key] = packed[key]
+                    continue
+                with metrics.stage(f"section:{key}"):
+                    summary_sections[key] = checkpoint(
+                        artifacts,
+                        f"section:{key}",
+                        _section_inputs(config, router, role, text, max_words, budget, map_reduce),
+                        lambda: summarize(key, text),
+                    )
+
+        if fused:
+            with metrics.stage("synthesis"):
+                data = checkpoint(
+                    artifacts,
+                    "synthesis",
+                    _stage_inputs(router, "synthesis", role, sections=summary_sections, num_questions=num_questions),
+                    lambda: synthesis_call(summary_sections),
+                )
+            synthesis = _validated(data, FusedSynthesis)
+            if synthesis is not None:
+                result = _synthesis_result(summary_sections, synthesis, "fused_synthesis", compression, run)
+                return _finish(index, match, original, keys, router.models, result)
+
+        # Consolidation uses whatever sections we produced
+        with metrics.stage("consolidate"):
+            consolidated = checkpoint(
+                artifacts,
+                "consolidate",
+                _stage_inputs(router, "consolidate", role, sections=summary_sections, max_words=max_words),
+                lambda: complete(
+                    "consolidate", CONSOLIDATE_SYSTEM, _consolidate(role, summary_sections, max_words)
+                ).strip(),
+            )
+
+        # Refinement
+        with metrics.stage("refine"):
+            refined = checkpoint(
+                artifacts,
+                "refine",
+                _stage_inputs(router, "refine", role, consolidated=consolidated, max_words=max_words),
+                lambda: complete("refine", REFINE_SYSTEM, refinement_prompt(role, consolidated, max_words)).strip(),
+            )
+
+        # Questions
+        with metrics.stage("questions"):
+            questions = checkpoint(
+                artifacts,
+                "questions",
+                _stage_inputs(router, "questions", role, refined=refined, num_questions=num_questions),
+                lambda: complete(
+                    "questions", QUESTIONS_SYSTEM, questions_prompt(role, refined, num_questions=num_questions)
+                ).strip(),
+            )
+
+    result = PipelineResult(
+        section_summaries=summary_sections,
+        consolidated=consolidated,
+        refined=refined,
+        questions=questions,
+        compression=compression,
+        timings=run.breakdown(),
+    )
+    return _finish(index, match, original, keys, router.models, result)
+
+
+async def run_pipeline_async(
+    config: AppConfig,
+    sections: Dict[str, str],
+    role: Optional[str] = None,
+    model: Optional[str] = None,
+    max_words: int = 300,
+    num_questions: int = 5,
+    provider: Optional[str] = None,
+    base_url: Optional[str] = None,
+    only_sections: Optional[Iterable[str]] = None,
+    max_concurrency: Optional[int] = None,
+    use_cache: bool = True,
+    map_reduce: Optional[bool] = None,
+    compress: Optional[bool] = None,
+    pack: Optional[bool] = None,
+    dedup: Optional[bool] = None,
+    mode: Optional[str] = None,
+    stage_models: Optional[str] = None,
+    small_model: Optional[str] = None,
+    artifacts: Optional[ArtifactStore] = None,
+    on_progress: Optional[ProgressCallback] = None,
+    on_event: Optional[EventCallback] = None,
+) -> PipelineResult:
+    router = _make_router(config, model, provider, base_url, use_cache, stage_models, small_model)
+    mode = _pipeline_mode(config, mode)
+    fused = mode == "fused"
+    emit = on_event or (lambda event: None)
+
+    def report(stage: str, fraction: float) -> None:
+        if on_progress is not None:
+            on_progress(stage, fraction)
+        emit({"event": "stage", "stage": stage, "progress": round(fraction, 3)})
+
+    def semaphore(client: LLMClient) -> asyncio.Semaphore:
+        return _provider_semaphore(
+            client.provider,
+            client.base_url,
+            max_concurrency or (client.backends.capacity if client.backends is not None else config.max_concurrency),
+        )
+
+    async def complete(
+        stage: str,
+        system: str,
+        prompt: str,
+        stream_as: Optional[Dict[str, Any]] = None,
+        json_mode: bool = False,
+    ) -> str:
+        client = router.client(stage, prompt)
+        # The provider slot is taken inside the client, only by calls that reach the provider:
+        # cache hits and calls joining an identical one in flight don't hold it while they wait
+        gate = semaphore(client)
+        # With an event listener, user-visible calls stream their tokens as they arrive
+        if on_event is None or stream_as is None:
+            out = await client.acomplete(system=system, prompt=prompt, json_mode=json_mode, gate=gate)
+        else:
+            parts = []
+            async for token in client.astream(system=system, prompt=prompt, gate=gate):
+                parts.append(token)
+                emit({"event": "token", **stream_as, "text": token})
+            out = "".join(parts)
+        return out.strip()
+
+    budget = chunk_budget_for_model(router.stage_client("sections").model, config.chunk_tokens)
+    fused_budget = chunk_budget_for_model(router.stage_client("fused").model, config.chunk_tokens)
+    wanted = _wanted_sections(only_sections)
+    present = _present_sections(sections, wanted)
+    packing = config.pack_sections if pack is None else pack
+    keys = _dedup_keys(
+        config, router, role, max_words, num_questions, budget, map_reduce, compress, packing, mode, wanted
     )
 
-    # Stepwise summaries
-    wanted = list(only_sections) if only_sections else ["abstract", "methods", "results", "discussion"]
-    summary_sections = {}
-    for key in wanted:
-        text = sections.get(key, "").strip()
+    async def summarize(key: str) -> str:
+        text = present.get(key, "")
         if not text:
-            summary_sections[key] = ""
-            continue
-        prompt = stepwise_summary_prompt(role, key, text, max_words)
-        out = client.complete(system="You summarize scientific text.", prompt=prompt)
-        summary_sections[key] = out.strip()
-
-    # Consolidation uses whatever sections we produced
-    consolidated = client.complete(
-        system="You write structured scientific summaries.",
-        prompt=consolidate_prompt(
-            role,
-            summary_sections.get("abstract", ""),
-            summary_sections.get("methods", ""),
-            summary_sections.get("results", ""),
-            summary_sections.get("discussion", ""),
-            max_words=max_words,
-        ),
-    ).strip()
+            return ""
+        stage = f"section:{key}"
+        stream_as = {"stage": "sections", "section": key}
+        chunks = _section_chunks(config, text, budget, map_reduce)
+        if len(chunks) == 1:
+            return await complete(stage, SECTION_SYSTEM, stepwise_summary_prompt(role, key, text, max_words), stream_as)
+        # Map all chunks concurrently, then reduce level by level
+        partials = await asyncio.gather(
+            *(
+                complete(stage, SECTION_SYSTEM, chunk_summary_prompt(role, key, chunk, i, len(chunks)))
+                for i, chunk in enumerate(chunks, start=1)
+            )
+        )
+        while True:
+            groups = group_for_reduce(list(partials), budget)
+            final = stream_as if len(groups) == 1 else None
+            partials = await asyncio.gather(
+                *(complete(stage, SECTION_SYSTEM, reduce_summaries_prompt(role, key, group), final) for group in groups)
+            )
+            if len(partials) == 1:
+                return partials[0]
 
-    # Refinement
-    refined = client.complete(
-        system="You refine text with strict word limits.",
-        prompt=refinement_prompt(role, consolidated, max_words),
-    ).strip()
+    async def fused_call() -> Optional[Dict[str, Any]]:
+        raw = await complete("fused", FUSED_SYSTEM, fused_prompt(role, present, num_questions), json_mode=True)
+        out = _parsed(lambda: parse_fused(raw, list(present)), "fused")
+        return None if out is None else out.model_dump()
 
-    # Questions
-    questions = client.complete(
-        system="You generate research questions.",
-        prompt=questions_prompt(role, refined, num_questions=num_questions),
-    ).strip()
+    async def synthesis_call(summary_sections: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        raw = await complete(
+            "synthesis", FUSED_SYSTEM, fused_synthesis_prompt(role, summary_sections, num_questions), json_mode=True
+        )
+        out = _parsed(lambda: parse_synthesis(raw), "synthesis")
+        return None if out is None else out.model_dump()
 
-    return PipelineResult(
+    def emit_fused(result: PipelineResult) -> PipelineResult:
+        # Fused calls aren't streamed (partial JSON isn't useful); report the pieces at the end
+        emit({"event": "stage_done", "stage": "consolidate", "text": result.consolidated})
+        emit({"event": "stage_done", "stage": "refine", "text": result.refined})
+        emit({"event": "stage_done", "stage": "questions", "text": result.questions})
+        report("done", 1.0)
+        return result
+
+    def emit_reused(result: PipelineResult) -> PipelineResult:
+        for key, text in result.section_summaries.items():
+            emit({"event": "section", "section": key, "text": text})
+        return emit_fused(result)
+
+    # Section summaries are independent, so fan them all out at once;
+    # the semaphore bounds how many actually hit the provider together.
+    done = 0
+
+    def section_done(key: str, out: str) -> str:
+        nonlocal done
+        done += 1
+        emit({"event": "section", "section": key, "text": out})
+        report("sections", 0.7 * done / len(wanted))
+        return out
+
+    async def summarize_and_report(key: str) -> Dict[str, str]:
+        with metrics.stage(f"section:{key}"):
+            text = present.get(key, "")
+            if key in reuse:
+                out = reuse[key]
+            elif text:
+                inputs = _section_inputs(config, router, role, text, max_words, budget, map_reduce)
+                out = await acheckpoint(artifacts, f"section:{key}", inputs, lambda: summarize(key))
+            else:
+                out = ""
+        return {key: section_done(key, out)}
+
+    async def pack_call(name: str, group: Dict[str, str]) -> Dict[str, str]:
+        return _unpacked(await complete(name, SECTION_SYSTEM, packed_summary_prompt(role, group)), list(group))
+
+    async def summarize_pack(group: Dict[str, str]) -> Dict[str, str]:
+        # Packed replies aren't streamed token by token; each section is sent once parsed
+        name = "section:" + "+".join(group)
+        with metrics.stage(name):
+            inputs = _stage_inputs(router, "sections", role, sections=group, max_words=max_words)
+            packed = await acheckpoint(artifacts, name, inputs, lambda: pack_call(name, group))
+        out = {key: section_done(key, packed[key]) for key in group if key in packed}
+        # Sections the reply left out get their own call
+        for rest in await asyncio.gather(*(summarize_and_report(key) for key in group if key not in packed)):
+            out.update(rest)
+        return out
+
+    with metrics.track_run() as run:
+        # SQLite lookups and MinHash over the whole paper: off the event loop
+        index, match = await asyncio.to_thread(_find_duplicate, config, dedup, use_cache, present, keys)
+        if match is not None and match.complete:
+            return emit_reused(_reused_result(match, run))
+        reuse = match.reusable if match is not None else {}
+        original = present
+        present, compression = _compress_sections(config, present, compress)
+        # The single fused call would redo reused sections; reuse them and synthesize the rest instead
+        if fused and not reuse and present and fits_single_call(present, fused_budget):
+            report("fused", 0.0)
+            with metrics.stage("fused"):
+                data = await acheckpoint(
+                    artifacts,
+                    "fused",
+                    _stage_inputs(router, "fused", role, sections=present, num_questions=num_questions),
+                    fused_call,
+                )
+            out = _validated(data, FusedOutput)
+            if out is not None:
+                summaries = {key: out.section_summaries.get(key, "") for key in wanted}
+                for key, text in summaries.items():
+                    emit({"event": "section", "section": key, "text": text})
+                result = _synthesis_result(summaries, out, "fused", compression, run)
+                return emit_fused(await asyncio.to_thread(_finish, index, match, original, keys, router.models, result))
+            fused = False  # a model that can't produce the schema once likely won't on retry
+
+        report("sections", 0.0)
+        todo = {key: present[key] for key in wanted if key not in reuse and present.get(key)}
+        groups = _pack_groups(config, packing, todo, budget)
+        packed_keys = {key for group in groups for key in group}
+        with metrics.stage("sections"):
+            outputs = await asyncio.gather(
+                *(summarize_pack(group) for group in groups),
+                *(summarize_and_report(key) for key in wanted if key not in packed_keys),
+            )
+        summarized = {key: out for part in outputs for key, out in part.items()}
+        summary_sections = {key: summarized[key] for key in wanted}
+
+        if fused:
+            report("synthesis", 0.7)
+            with metrics.stage("synthesis"):
+                data = await acheckpoint(
+                    artifacts,
+                    "synthesis",
+                    _stage_inputs(router, "synthesis", role, sections=summary_sections, num_questions=num_questions),
+                    lambda: synthesis_call(summary_sections),
+                )
+            synthesis = _validated(data, FusedSynthesis)
+            if synthesis is not None:
+                result = _synthesis_result(summary_sections, synthesis, "fused_synthesis", compression, run)
+                return emit_fused(await asyncio.to_thread(_finish, index, match, original, keys, router.models, result))
+
+        # The remaining stages each depend on the previous one
+        report("consolidate", 0.7)
+        with metrics.stage("consolidate"):
+            consolidated = await acheckpoint(
+                artifacts,
+                "consolidate",
+                _stage_inputs(router, "consolidate", role, sections=summary_sections, max_words=max_words),
+                lambda: complete(
+                    "consolidate",
+                    CONSOLIDATE_SYSTEM,
+                    _consolidate(role, summary_sections, max_words),
+                    {"stage": "consolidate"},
+                ),
+            )
+        emit({"event": "stage_done", "stage": "consolidate", "text": consolidated})
+        report("refine", 0.8)
+        with metrics.stage("refine"):
+            refined = await acheckpoint(
+                artifacts,
+                "refine",
+                _stage_inputs(router, "refine", role, consolidated=consolidated, max_words=max_words),
+                lambda: complete(
+                    "refine", REFINE_SYSTEM, refinement_prompt(role, consolidated, max_words), {"stage": "refine"}
+                ),
+            )
+        emit({"event": "stage_done", "stage": "refine", "text": refined})
+        report("questions", 0.9)
+        with metrics.stage("questions"):
+            questions = await acheckpoint(
+                artifacts,
+                "questions",
+                _stage_inputs(router, "questions", role, refined=refined, num_questions=num_questions),
+                lambda: complete(
+                    "questions",
+                    QUESTIONS_SYSTEM,
+                    questions_prompt(role, refined, num_questions=num_questions),
+                    {"stage": "questions"},
+                ),
+            )
+        emit({"event": "stage_done", "stage": "questions", "text": questions})
+        report("done", 1.0)
+
+    result = PipelineResult(
         section_summaries=summary_sections,
         consolidated=consolidated,
         refined=refined,
         questions=questions,
+        compression=compression,
+        timings=run.breakdown(),
     )
+    return await asyncio.to_thread(_finish, index, match, original, keys, router.models, result)
+
+
+async def stream_pipeline(config: AppConfig, sections: Dict[str, str], **kwargs: Any) -> AsyncIterator[Dict[str, Any]]:
+    """Run :func:`run_pipeline_async` and yield its events as they happen.
+
+    Yields ``stage``, ``token``, ``section`` and ``stage_done`` events, then a final
+    ``result`` event carrying the whole :class:`PipelineResult` (or an ``error`` event).
+    """
+    queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue()
+    task = asyncio.create_task(run_pipeline_async(config, sections, on_event=queue.put_nowait, **kwargs))
+    getter: "Optional[asyncio.Task[Dict[str, Any]]]" = None
+    try:
+        while True:
+            getter = asyncio.create_task(queue.get())
+            await asyncio.wait({getter, task}, return_when=asyncio.FIRST_COMPLETED)
+            if getter.done():
+                yield getter.result()
+                continue
+            getter.cancel()
+            # Pipeline finished; flush anything it emitted on the way out
+            while not queue.empty():
+                yield queue.get_nowait()
+            break
+        if task.exception() is not None:
+            yield {"event": "error", "error": str(task.exception())}
+        else:
+            yield {"event": "result", "result": task.result().to_dict()}
+    finally:
+        if getter is not None and not getter.done():
+            getter.cancel()
+        if not task.done():
+            task.cancel()
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Optional
+from typing import Dict, List, Optional
 
 
 def role_preamble(role: Optional[str]) -> str:
@@ -47,3 +47,69 @@ def questions_prompt(role: Optional[str], final_summary: str, num_questions: int
         "Formatting: Return as a numbered list, one question per line.\n\n"
         f"Summary:\n{final_summary}"
     )
+
+
+def chunk_summary_prompt(role: Optional[str], section_name: str, chunk_text: str, index: int, total: int) -> str:
+    return (
+        f"{role_preamble(role)}\n\n"
+        f"Task: Summarize part {index} of {total} of the {section_name} section of an academic paper.\n"
+        "Guidance: Capture all key details (setups, datasets, metrics, limitations) in this part only; "
+        "other parts are summarized separately.\n\n"
+        f"Section text (part {index}/{total}):\n" + chunk_text.strip()
+    )
+
+
+def reduce_summaries_prompt(role: Optional[str], section_name: str, partial_summaries: List[str]) -> str:
+    parts = "\n\n".join(f"Part {i} summary:\n{s.strip()}" for i, s in enumerate(partial_summaries, start=1))
+    return (
+        f"{role_preamble(role)}\n\n"
+        f"Task: Merge these partial summaries of the {section_name} section into one coherent summary.\n"
+        "Guidance: Keep every key detail, remove repetition, and preserve the original order of ideas.\n\n"
+        f"{parts}"
+    )
+
+
+def packed_summary_prompt(role: Optional[str], sections: Dict[str, str]) -> str:
+    headings = ", ".join(f"=== {k.upper()} ===" for k in sections)
+    body = "\n\n".join(f"### {k.capitalize()} section text\n{text.strip()}" for k, text in sections.items())
+    return (
+        f"{role_preamble(role)}\n\n"
+        "Task: Summarize each of the following sections of an academic paper separately.\n"
+        "Guidance: Capture all key details (setups, datasets, metrics, limitations) of each section. "
+        "No hard word limit.\n"
+        "Formatting: For each section, write its heading on its own line, then its summary. "
+        f"Headings, in order: {headings}\n\n"
+        f"{body}"
+    )
+
+
+def fused_prompt(role: Optional[str], sections: Dict[str, str], num_questions: int = 5) -> str:
+    keys = ", ".join(f'"{k}"' for k in sections)
+    body = "\n\n".join(f"=== {k.upper()} ===\n{text.strip()}" for k, text in sections.items())
+    return (
+        f"{role_preamble(role)}\n\n"
+        "Task: Analyze the paper sections below in one pass.\n"
+        "1. Summarize each section, capturing key details (setups, datasets, metrics, limitations).\n"
+        "2. Write a coherent, structured summary across sections, including limitations and future work.\n"
+        "3. Refine that summary for clarity, fidelity, and completeness.\n"
+        f"4. Propose {num_questions} specific, testable, impactful follow-up research questions.\n\n"
+        "Respond with a single JSON object and nothing else:\n"
+        '{"section_summaries": {<section>: <summary>}, "consolidated": <string>, '
+        '"refined": <string>, "questions": [<string>, ...]}\n'
+        f"section_summaries must have exactly these keys: {keys}.\n\n"
+        f"{body}"
+    )
+
+
+def fused_synthesis_prompt(role: Optional[str], summaries: Dict[str, str], num_questions: int = 5) -> str:
+    body = "\n\n".join(f"{k.capitalize()} summary:\n{text.strip()}" for k, text in summaries.items() if text)
+    return (
+        f"{role_preamble(role)}\n\n"
+        "Task: From the section summaries below:\n"
+        "1. Write a coherent, structured summary across sections, including limitations and future work.\n"
+        "2. Refine that summary for clarity, fidelity, and completeness.\n"
+        f"3. Propose {num_questions} specific, testable, impactful follow-up research questions.\n\n"
+        "Respond with a single JSON object and nothing else:\n"
+        '{"consolidated": <string>, "refined": <string>, "questions": [<string>, ...]}\n\n'
+        f"{body}"
+    )
@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+import glob
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional
+
+from .config import AppConfig
+from .fingerprint import content_hash
+
+logger = logging.getLogger(__name__)
+
+_VERSION = re.compile(r"v\d+$")
+_TOKEN = re.compile(r"\w+\*?", re.UNICODE)
+
+# Columns of the full-text table; "body" holds every summary the pipeline produced
+FTS_COLUMNS = ("title", "authors", "abstract", "body", "questions")
+
+
+def _base_id(paper_id: str) -> str:
+    return _VERSION.sub("", paper_id)
+
+
+def fts_query(text: str) -> str:
+    """Turn free text into an FTS5 query: every word must match; a trailing ``*`` keeps a prefix search."""
+    terms = []
+    for token in _TOKEN.findall(text):
+        prefix = token.endswith("*")
+        word = token.rstrip("*")
+        if word:
+            terms.append(f'"{word}"' + ("*" if prefix else ""))
+    return " ".join(terms)
+
+
+def _body(result: Dict[str, Any]) -> str:
+    parts = [result.get("refined", ""), result.get("consolidated", "")]
+    parts.extend((result.get("section_summaries") or {}).values())
+    return "\n\n".join(p for p in parts if p)
+
+
+class ResultsStore:
+    """Every pipeline result with its paper metadata, searchable by keyword, author or ID.
+
+    One row per paper and model (a rerun replaces the earlier row) in SQLite, mirrored
+    into an FTS5 table over titles, authors, abstracts, summaries and questions.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " id INTEGER PRIMARY KEY, paper_id TEXT NOT NULL, base_id TEXT NOT NULL,"
+            " title TEXT NOT NULL, authors TEXT NOT NULL, model TEXT NOT NULL, mode TEXT NOT NULL,"
+            " source TEXT NOT NULL, created REAL NOT NULL, payload TEXT NOT NULL,"
+            " UNIQUE (paper_id, model))"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS results_base_id ON results(base_id)")
+        self._db.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS results_fts USING fts5({', '.join(FTS_COLUMNS)},"
+            " tokenize='porter unicode61')"
+        )
+
+    def add(self, payload: Dict[str, Any], model: str = "", source: str = "") -> int:
+        """Store a ``{"paper": {...}, **PipelineResult.to_dict()}`` payload; returns its row id."""
+        paper = payload.get("paper") or {}
+        paper_id = paper.get("arxiv_id") or paper.get("id")
+        if not paper_id:
+            raise ValueError("Result payload has no paper arxiv_id or id")
+        authors = list(paper.get("authors") or [])
+        with self._lock:
+            self._db.execute("BEGIN")
+            try:
+                old = self._db.execute(
+                    "SELECT id FROM results WHERE paper_id = ? AND model = ?", (paper_id, model)
+                ).fetchone()
+                if old is not None:
+                    self._db.execute("DELETE FROM results WHERE id = ?", (old["id"],))
+                    self._db.execute("DELETE FROM results_fts WHERE rowid = ?", (old["id"],))
+                cur = self._db.execute(
+                    "INSERT INTO results (paper_id, base_id, title, authors, model, mode, source, created, payload)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        paper_id,
+                        _base_id(paper_id),
+                        paper.get("title", ""),
+                        json.dumps(authors, ensure_ascii=False),
+                        model,
+                        payload.get("mode", "stepwise"),
+                        source,
+                        time.time(),
+                        json.dumps(payload, ensure_ascii=False),
+                    ),
+                )
+                self._db.execute(
+                    f"INSERT INTO results_fts (rowid, {', '.join(FTS_COLUMNS)}) VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        cur.lastrowid,
+                        paper.get("title", ""),
+                        "; ".join(authors),
+                        paper.get("summary", ""),
+                        _body(payload),
+                        payload.get("questions", ""),
+                    ),
+                )
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+        return int(cur.lastrowid)
+
+    def _select(
+        self,
+        columns: str,
+        query: str,
+        author: str,
+        paper_id: str,
+        limit: Optional[int],
+    ) -> List[sqlite3.Row]:
+        match = " AND ".join(
+            part
+            for part in (
+                fts_query(query),
+                f"authors : ({fts_query(author)})" if fts_query(author) else "",
+            )
+            if part
+        )
+        sql = f"SELECT {columns} FROM results r"
+        where: List[str] = []
+        args: List[Any] = []
+        if match:
+            sql += " JOIN results_fts ON results_fts.rowid = r.id"
+            where.append("results_fts MATCH ?")
+            args.append(match)
+        if paper_id:
+            # "1706.03762" finds every version; "1706.03762v2" only that one
+            where.append("(r.paper_id = ? OR r.base_id = ?)")
+            args.extend([paper_id, paper_id])
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY " + ("bm25(results_fts), " if match else "") + "r.created DESC"
+        if limit:
+            sql += " LIMIT ?"
+            args.append(limit)
+        with self._lock:
+            return self._db.execute(sql, args).fetchall()
+
+    def search(self, query: str = "", author: str = "", paper_id: str = "", limit: int = 20) -> List[Dict[str, Any]]:
+        """Best matches first (most recent first without a keyword query), with a highlighted snippet."""
+        snippet = "snippet(results_fts, 3, '[', ']', '…', 16)" if fts_query(query) else "''"
+        rows = self._select(
+            f"r.id, r.paper_id, r.title, r.authors, r.model, r.mode, r.source, r.created, {snippet} AS snippet",
+            query,
+            author,
+            paper_id,
+            limit,
+        )
+        return [
+            {
+                "id": row["id"],
+                "paper_id": row["paper_id"],
+                "title": row["title"],
+                "authors": json.loads(row["authors"]),
+                "model": row["model"],
+                "mode": row["mode"],
+                "source": row["source"],
+                "created": row["created"],
+                "snippet": row["snippet"],
+            }
+            for row in rows
+        ]
+
+    def get(self, row_id: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._db.execute("SELECT payload FROM results WHERE id = ?", (row_id,)).fetchone()
+        return None if row is None else json.loads(row["payload"])
+
+    def iter_payloads(self, query: str = "", author: str = "", paper_id: str = "") -> Iterator[Dict[str, Any]]:
+        for row in self._select("r.payload", query, author, paper_id, None):
+            yield json.loads(row["payload"])
+
+    def export(self, out: IO[str], query: str = "", author: str = "", paper_id: str = "") -> int:
+        """Write matching payloads to ``out`` as JSON lines; returns how many were written."""
+        count = 0
+        for payload in self.iter_payloads(query, author, paper_id):
+            out.write(json.dumps(payload, ensure_ascii=False) + "\n")
+            count += 1
+        return count
+
+    def ingest_files(self, paths: Iterable[str]) -> int:
+        """Add results saved by ``--save_json`` or ``batch``; other JSON files are skipped."""
+        added = 0
+        for path in paths:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    payload = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if isinstance(payload, dict) and isinstance(payload.get("paper"), dict) and "section_summaries" in payload:
+                try:
+                    self.add(payload, source="file")
+                except ValueError:
+                    continue
+                added += 1
+        return added
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            results, papers = self._db.execute("SELECT COUNT(*), COUNT(DISTINCT base_id) FROM results").fetchone()
+        return {"results": results, "papers": papers}
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+_stores: Dict[str, ResultsStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_results_store(config: AppConfig) -> ResultsStore:
+    """Return the process-wide results store for ``config.output_dir``, creating it on first use.
+
+    A new store starts with every result already saved as JSON under ``output_dir``.
+    """
+    path = os.path.abspath(os.path.join(config.output_dir, "results.sqlite"))
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            existed = os.path.exists(path)
+            store = ResultsStore(path)
+            if not existed:
+                store.ingest_files(sorted(glob.glob(os.path.join(config.output_dir, "*.json"))))
+            _stores[path] = store
+        return store
+
+
+def upload_payload(filename: str, sections: Dict[str, str], result: Dict[str, Any]) -> Dict[str, Any]:
+    # Uploads have no arXiv ID; the same text under any filename gets the same ID
+    paper = {"id": f"upload:{content_hash(sections)[:16]}", "title": filename or "upload", "authors": []}
+    return {"paper": paper, **result}
+
+
+def record_result(config: AppConfig, payload: Dict[str, Any], model: str = "", source: str = "") -> None:
+    """Add a finished run to the results store; a failure to index never fails the run."""
+    if not config.results_store_enabled:
+        return
+    try:
+        get_results_store(config).add(payload, model=model, source=source)
+    except (sqlite3.Error, ValueError) as e:
+        logger.warning("Could not add result to the results store: %s", e)
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Optional, Tuple
+
+from .chunking import estimate_tokens
+from .llm import LLMClient
+
+PROVIDERS = ("openai", "ollama")
+# Stages a model can be set for: section summaries (incl. map/reduce calls) and everything after them
+STAGES = ("sections", "fused", "synthesis", "consolidate", "refine", "questions")
+# Bulk stages the automatic router may hand to the small model; synthesis needs the strong one
+SMALL_MODEL_STAGES = ("sections",)
+
+ModelSpec = Tuple[Optional[str], str]
+
+
+def parse_model(spec: str) -> ModelSpec:
+    """``"ollama/llama3.2:1b"`` -> ``("ollama", "llama3.2:1b")``; ``"gpt-4o"`` -> ``(None, "gpt-4o")``."""
+    provider, sep, model = spec.strip().partition("/")
+    if sep and provider in PROVIDERS and model:
+        return provider, model
+    return None, spec.strip()
+
+
+def parse_stage_models(spec: str) -> Dict[str, ModelSpec]:
+    """``"sections=llama3.2:1b, consolidate=openai/gpt-4o"`` -> ``{stage: (provider, model)}``."""
+    stages: Dict[str, ModelSpec] = {}
+    for entry in spec.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        stage, sep, model = entry.partition("=")
+        stage = stage.strip().lower()
+        if not sep or not model.strip():
+            raise ValueError(f"Expected stage=[provider/]model, got {entry!r}")
+        if stage not in STAGES:
+            raise ValueError(f"Unknown stage {stage!r}; use one of: {', '.join(STAGES)}")
+        stages[stage] = parse_model(model)
+    return stages
+
+
+def stage_of(name: str) -> str:
+    # Metrics/artifact stage names ("section:abstract") -> the stage a model is configured for
+    return "sections" if name.startswith("section:") else name
+
+
+def describe(client: LLMClient) -> str:
+    return f"{client.provider}/{client.model}"
+
+
+class ModelRouter:
+    """Picks the client for each LLM call of one pipeline run.
+
+    A stage with its own model (``STAGE_MODELS``) always uses it; other stages use the
+    run's model. With a small model configured (``ROUTER_SMALL_MODEL``), section calls
+    whose prompt is at most ``small_max_tokens`` go to it instead, so bulk summarization
+    runs on the fast model and long inputs and synthesis stay on the strong one. Every
+    choice is recorded in :attr:`models` by stage name.
+    """
+
+    def __init__(
+        self,
+        default: LLMClient,
+        stages: Optional[Dict[str, LLMClient]] = None,
+        small: Optional[LLMClient] = None,
+        small_max_tokens: int = 0,
+    ) -> None:
+        self.default = default
+        self.stages = stages or {}
+        self.small = small
+        self.small_max_tokens = small_max_tokens
+        self.models: Dict[str, str] = {}
+
+    def stage_client(self, stage: str) -> LLMClient:
+        return self.stages.get(stage, self.default)
+
+    def _routed(self, stage: str) -> bool:
+        return self.small is not None and stage in SMALL_MODEL_STAGES and stage not in self.stages
+
+    def client(self, name: str, prompt: str) -> LLMClient:
+        """The client for one call of stage ``name`` (e.g. ``"section:methods"``, ``"refine"``)."""
+        stage = stage_of(name)
+        client = self.stage_client(stage)
+        if self._routed(stage) and estimate_tokens(prompt) <= self.small_max_tokens:
+            client = self.small  # type: ignore[assignment]
+        chosen = describe(client)
+        seen = self.models.get(name)
+        if seen is None:
+            self.models[name] = chosen
+        elif chosen not in seen.split(", "):
+            self.models[name] = f"{seen}, {chosen}"  # map/reduce calls of one section split across models
+        return client
+
+    def inputs(self, stage: str) -> Dict[str, Any]:
+        """What a stage's output depends on model-wise; keyed into artifacts and dedup lookups."""
+        client = self.stage_client(stage)
+        out: Dict[str, Any] = {"provider": client.provider, "model": client.model}
+        if self._routed(stage):
+            out["small_model"] = describe(self.small)  # type: ignore[arg-type]
+            out["small_max_tokens"] = self.small_max_tokens
+        return out
+
+    def signature(self) -> Dict[str, Any]:
+        """Models of every stage that doesn't use the run's model; empty when none is overridden."""
+        out: Dict[str, Any] = {stage: describe(client) for stage, client in sorted(self.stages.items())}
+        if self.small is not None:
+            out["small_model"] = [describe(self.small), self.small_max_tokens]
+        return out
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, TypeVar
+
+from . import metrics
+
+T = TypeVar("T")
+
+
+class LeaderGone(Exception):
+    """The call everyone was waiting on was cancelled; a waiter takes over."""
+
+
+class SingleFlight:
+    """Concurrent callers with the same key share one execution instead of each running it.
+
+    The first caller (the leader) runs the work; callers arriving while it is in flight wait
+    for its result, from any thread or event loop. Errors are shared too. If the leader is
+    cancelled (a client disconnected), one waiter runs the work instead.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls: Dict[str, Future] = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    def begin(self, key: str) -> Tuple[Future, bool]:
+        """Return the future for ``key`` and whether the caller leads (must then call :meth:`finish`)."""
+        with self._lock:
+            future = self._calls.get(key)
+            if future is None:
+                future = Future()
+                self._calls[key] = future
+                self.leaders += 1
+                return future, True
+            self.coalesced += 1
+        metrics.COALESCED_REQUESTS.inc(kind=self.name)
+        return future, False
+
+    def finish(self, key: str, future: Future, result: Any = None, error: Optional[BaseException] = None) -> None:
+        with self._lock:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+        if error is None:
+            future.set_result(result)
+        elif isinstance(error, Exception):
+            future.set_exception(error)
+        else:
+            future.set_exception(LeaderGone())
+
+    async def wait(self, future: Future) -> Any:
+        # shield: a waiter giving up must not cancel the shared future for the others
+        return await asyncio.shield(asyncio.wrap_future(future))
+
+    async def run(self, key: str, fn: Callable[[], Awaitable[T]]) -> Tuple[T, bool]:
+        """Await ``fn()``, or the identical call already in flight; returns (result, shared)."""
+        while True:
+            future, leader = self.begin(key)
+            if leader:
+                try:
+                    result = await fn()
+                except BaseException as e:
+                    self.finish(key, future, error=e)
+                    raise
+                self.finish(key, future, result)
+                return result, False
+            try:
+                return await self.wait(future), True
+            except LeaderGone:
+                continue
+
+    def call(self, key: str, fn: Callable[[], T]) -> Tuple[T, bool]:
+        """Blocking :meth:`run`."""
+        while True:
+            future, leader = self.begin(key)
+            if leader:
+                try:
+                    result = fn()
+                except BaseException as e:
+                    self.finish(key, future, error=e)
+                    raise
+                self.finish(key, future, result)
+                return result, False
+            try:
+                return future.result(), True
+            except LeaderGone:
+                continue
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"in_flight": len(self._calls), "leaders": self.leaders, "coalesced": self.coalesced}
+
+
+# Whole analyses (parse + pipeline) of the same PDF with the same settings, across /analyze and /jobs
+ANALYSES = SingleFlight("analysis")
+# Identical prompts to the same model, across every pipeline in the process
+LLM_CALLS = SingleFlight("llm_call")
+
+
+def analysis_key(pdf_sha256: str, params: Dict[str, Any]) -> str:
+    payload = json.dumps([pdf_sha256, params], sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def coalescing_stats() -> Dict[str, Dict[str, int]]:
+    return {flight.name: flight.stats() for flight in (ANALYSES, LLM_CALLS)}
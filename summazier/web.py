@@ -1,19 +1,99 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import json
+import logging
 import os
-import tempfile
-from typing import Optional
+import time
+import uuid
+from contextlib import asynccontextmanager
+from typing import IO, Any, Dict, List, Optional
 
-from fastapi import FastAPI, File, Form, HTTPException, UploadFile
-from fastapi.responses import HTMLResponse
+from fastapi import FastAPI, File, Form, HTTPException, Query, UploadFile
+from fastapi.responses import HTMLResponse, JSONResponse, PlainTextResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
+from starlette.background import BackgroundTask
 
+from . import metrics
 from .config import AppConfig, ensure_directories_exist
-from .pdf_utils import extract_text_from_pdf, split_into_sections
-from .pipeline import run_pipeline_sync, run_pipeline_async
+from .jobs import JobManager, QueueFullError
+from .balancer import backend_stats, close_backend_pools
+from .llm import limiter_stats, registry
+from .fused import PIPELINE_MODES
+from .pipeline import PipelineResult, run_pipeline_sync, run_pipeline_async, stream_pipeline
+from .results_store import get_results_store, record_result, upload_payload
+from .routing import parse_stage_models
+from .singleflight import ANALYSES, analysis_key, coalescing_stats
+from .workers import PdfWorkerPool
 
-app = FastAPI(title="Summazier - Research Paper Summarizer")
+logger = logging.getLogger(__name__)
+
+UPLOAD_CHUNK_BYTES = 1 << 20
+# Uploads up to this size are sent to a parsing worker as bytes; bigger ones go via a file
+INLINE_UPLOAD_BYTES = 1 << 20
+# Slack for the other form fields and multipart framing when checking Content-Length
+FORM_OVERHEAD_BYTES = 64 * 1024
+
+DEFAULT_ROLE_FORM = (
+    "You are a research analyst in biomedical AI. Your outputs must be rigorous, concise, "
+    "faithful to the paper, and useful for downstream research."
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load config once; LLM clients and their connection pools live for the whole process
+    config = AppConfig.from_env()
+    ensure_directories_exist(config)
+    app.state.config = config
+    if config.results_store_enabled:
+        # Opening a new store ingests every saved result; do it now, not in the first request
+        await asyncio.to_thread(get_results_store, config)
+    # PDF parsing is CPU-bound; keep it off the event loop in warm worker processes
+    app.state.pdf_pool = PdfWorkerPool(config.pdf_workers, config.pdf_worker_max_tasks)
+    await app.state.pdf_pool.start()
+    app.state.jobs = JobManager(config, pdf_pool=app.state.pdf_pool)
+    await app.state.jobs.start()
+    try:
+        yield
+    finally:
+        await app.state.jobs.stop()
+        await app.state.pdf_pool.stop()
+        await registry.aclose()
+        await asyncio.to_thread(close_backend_pools)
+
+
+app = FastAPI(title="Summazier - Research Paper Summarizer", lifespan=lifespan)
+
+
+def _max_upload_bytes(config: AppConfig) -> int:
+    return int(config.max_upload_mb * 1024 * 1024)
+
+
+def _too_large(config: AppConfig) -> HTTPException:
+    return HTTPException(status_code=413, detail=f"PDF is larger than the {config.max_upload_mb:g} MB limit")
+
+
+class UploadSizeLimit:
+    """Answer 413 to POSTs whose Content-Length is over the limit, before the multipart parser spools them."""
+
+    def __init__(self, app: Any) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] == "http" and scope["method"] == "POST":
+            length = dict(scope["headers"]).get(b"content-length", b"")
+            config: AppConfig = scope["app"].state.config
+            if length.isdigit() and int(length) > _max_upload_bytes(config) + FORM_OVERHEAD_BYTES:
+                response = JSONResponse({"detail": _too_large(config).detail}, status_code=413)
+                await response(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
+
+
+app.add_middleware(UploadSizeLimit)
 
 # Create templates directory
 templates_dir = os.path.join(os.path.dirname(__file__), "templates")
@@ -95,6 +175,30 @@ async def home():
                         <label for="num_questions">Number of Research Questions:</label>
                         <input type="number" id="num_questions" name="num_questions" value="5" min="1" max="10"> 
                     </div>
+                    <div class="form-group">
+                        <label for="mode">Pipeline Mode:</label>
+                        <select id="mode" name="mode">
+                            <option value="stepwise" selected>Stepwise (one call per stage)</option>
+                            <option value="fused">Fused (fewer round trips)</option>
+                        </select>
+                    </div>
+                    <div class="form-group">
+                        <label for="stage_models">Per-stage Models (optional):</label>
+                        <input type="text" id="stage_models" name="stage_models" placeholder="sections=llama3.2:1b,consolidate=openai/gpt-4o">
+                    </div>
+                    <div class="form-group">
+                        <label for="small_model">Small Model for Short Sections (optional):</label>
+                        <input type="text" id="small_model" name="small_model" placeholder="llama3.2:1b">
+                    </div>
+                    <div class="form-group">
+                        <label for="no_cache"><input type="checkbox" id="no_cache" name="no_cache" value="true" style="width: auto;"> Bypass response cache</label>
+                    </div>
+                    <div class="form-group">
+                        <label for="compress"><input type="checkbox" id="compress" name="compress" value="true" style="width: auto;"> Compress sections before prompting</label>
+                    </div>
+                    <div class="form-group">
+                        <label for="pack"><input type="checkbox" id="pack" name="pack" value="true" style="width: auto;"> Summarize short sections together</label>
+                    </div>
                 </div>
 
                 <button type="submit">🚀 Analyze Paper</button>
@@ -106,6 +210,54 @@ async def home():
         </div>
 
         <script>
+            const stageLabels = { consolidate: '📋 Consolidated Summary', refine: '✨ Refined Summary', questions: '❓ Research Questions' };
+            const titleCase = (key) => key.charAt(0).toUpperCase() + key.slice(1);
+
+            function renderSkeleton(results) {
+                results.innerHTML = `
+                    <h2>📊 Analysis Results</h2>
+                    <div class="section"> <h3>📝 Section Summaries</h3> <div id="sectionSummaries"></div> </div>
+                    ${Object.entries(stageLabels).map(([stage, label]) =>
+                        `<div class="section"> <h3>${label}</h3> <div class="mono" id="stage-${stage}"></div> </div>`
+                    ).join('')}
+                `;
+            }
+
+            function sectionBox(key) {
+                let box = document.getElementById(`section-${key}`);
+                if (!box) {
+                    const wrapper = document.createElement('div');
+                    const heading = document.createElement('h4');
+                    heading.textContent = titleCase(key);
+                    box = document.createElement('div');
+                    box.className = 'mono';
+                    box.id = `section-${key}`;
+                    wrapper.append(heading, box);
+                    document.getElementById('sectionSummaries').append(wrapper);
+                }
+                return box;
+            }
+
+            function handleEvent(data, loading) {
+                if (data.event === 'stage') {
+                    loading.textContent = `⏳ ${titleCase(data.stage)}... ${Math.round(data.progress * 100)}%`;
+                } else if (data.event === 'token') {
+                    const box = data.stage === 'sections' ? sectionBox(data.section) : document.getElementById(`stage-${data.stage}`);
+                    box.textContent += data.text;
+                } else if (data.event === 'section') {
+                    sectionBox(data.section).textContent = data.text;
+                } else if (data.event === 'stage_done') {
+                    document.getElementById(`stage-${data.stage}`).textContent = data.text;
+                } else if (data.event === 'result' && new Set(Object.values(data.result.models)).size > 1) {
+                    const models = document.createElement('p');
+                    models.className = 'mono';
+                    models.textContent = 'Models: ' + Object.entries(data.result.models).map(([stage, m]) => `${stage}: ${m}`).join(', ');
+                    document.getElementById('results').append(models);
+                } else if (data.event === 'error') {
+                    throw new Error(data.error);
+                }
+            }
+
             document.getElementById('uploadForm').addEventListener('submit', async function(e) {
                 e.preventDefault();
                 
@@ -113,34 +265,35 @@ async def home():
                 const loading = document.getElementById('loading');
                 const results = document.getElementById('results');
                 
+                loading.textContent = '⏳ Processing your paper...';
                 loading.style.display = 'block';
-                results.style.display = 'none';
+                renderSkeleton(results);
+                results.style.display = 'block';
                 
                 try {
-                    const response = await fetch('/analyze', { method: 'POST', body: formData });
+                    // Server-Sent Events over a POST body: read the stream and split on blank lines
+                    const response = await fetch('/analyze/stream', { method: 'POST', body: formData });
                     if (!response.ok) throw new Error('Analysis failed');
-                    const data = await response.json();
-                    
+                    const reader = response.body.getReader();
+                    const decoder = new TextDecoder();
+                    let buffer = '';
+                    while (true) {
+                        const { value, done } = await reader.read();
+                        if (done) break;
+                        buffer += decoder.decode(value, { stream: true });
+                        let sep;
+                        while ((sep = buffer.indexOf('\\n\\n')) !== -1) {
+                            const block = buffer.slice(0, sep);
+                            buffer = buffer.slice(sep + 2);
+                            const dataLine = block.split('\\n').find((line) => line.startsWith('data: '));
+                            if (dataLine) handleEvent(JSON.parse(dataLine.slice(6)), loading);
+                        }
+                    }
                     loading.style.display = 'none';
-                    results.style.display = 'block';
-                    
-                    const summaries = Object.entries(data.section_summaries).map(([key, value]) => 
-                        value ? `<h4>${key.charAt(0).toUpperCase() + key.slice(1)}</h4><div class="mono">${value.replace(/</g, '&lt;')}</div>` : ''
-                    ).join('');
-                    
-                    const questionsHtml = `<div class="mono">${(data.questions || '').replace(/</g, '&lt;')}</div>`;
-                    
-                    results.innerHTML = `
-                        <h2>📊 Analysis Results</h2>
-                        <div class="section"> <h3>📝 Section Summaries</h3> ${summaries} </div>
-                        <div class="section"> <h3>📋 Consolidated Summary</h3> <div class="mono">${(data.consolidated || '').replace(/</g, '&lt;')}</div> </div>
-                        <div class="section"> <h3>✨ Refined Summary</h3> <div class="mono">${(data.refined || '').replace(/</g, '&lt;')}</div> </div>
-                        <div class="section"> <h3>❓ Research Questions</h3> ${questionsHtml} </div>
-                    `;
                 } catch (error) {
                     loading.style.display = 'none';
                     results.style.display = 'block';
-                    results.innerHTML = `<div class="error">Error: ${error.message}</div>`;
+                    results.innerHTML = `<div class="error">Error: ${error.message.replace(/</g, '&lt;')}</div>`;
                 }
             });
         </script>
@@ -149,84 +302,340 @@ async def home():
     """
 
 
+def _pipeline_params(
+    config: AppConfig,
+    role: str,
+    provider: str,
+    model: str,
+    sections: str,
+    num_questions: int,
+    no_cache: bool,
+    mode: Optional[str] = None,
+    compress: Optional[bool] = None,
+    pack: Optional[bool] = None,
+    stage_models: Optional[str] = None,
+    small_model: Optional[str] = None,
+) -> Dict[str, Any]:
+    if mode and mode not in PIPELINE_MODES:
+        raise HTTPException(status_code=400, detail=f"Unknown mode {mode!r}; expected one of {', '.join(PIPELINE_MODES)}")
+    try:
+        parse_stage_models(stage_models or "")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {
+        "role": role,
+        "model": model,
+        "max_words": 0,
+        "num_questions": num_questions,
+        "provider": provider,
+        "base_url": None,  # the provider's configured backends (BASE_URL, OLLAMA_URLS, ...)
+        "only_sections": [s.strip().lower() for s in sections.split(',') if s.strip()],
+        "use_cache": not no_cache,
+        "compress": compress,
+        "pack": pack,
+        "mode": mode or None,
+        # Blank form fields mean STAGE_MODELS / ROUTER_SMALL_MODEL
+        "stage_models": stage_models or None,
+        "small_model": small_model or None,
+    }
+
+
+def _upload_size(pdf_file: UploadFile, config: AppConfig) -> int:
+    # Starlette has already spooled the upload (to disk past 1 MB); check its size without reading it
+    f = pdf_file.file
+    f.seek(0, os.SEEK_END)
+    size = f.tell()
+    f.seek(0)
+    if size > _max_upload_bytes(config):
+        raise _too_large(config)
+    return size
+
+
+def _copy_upload(src: IO[bytes], dest_path: str, max_bytes: int) -> int:
+    copied = 0
+    src.seek(0)
+    with open(dest_path, "wb") as out:
+        while chunk := src.read(UPLOAD_CHUNK_BYTES):
+            copied += len(chunk)
+            if copied > max_bytes:
+                break
+            out.write(chunk)
+    return copied
+
+
+async def _save_upload(pdf_file: UploadFile, config: AppConfig) -> str:
+    # For work that outlives the request: copy to tmp_dir in fixed-size chunks, never the whole file at once
+    dest_dir = os.path.join(config.tmp_dir, "uploads")
+    os.makedirs(dest_dir, exist_ok=True)
+    dest_path = os.path.join(dest_dir, f"{uuid.uuid4().hex}.pdf")
+    max_bytes = _max_upload_bytes(config)
+    copied = await asyncio.to_thread(_copy_upload, pdf_file.file, dest_path, max_bytes)
+    if copied > max_bytes:
+        os.unlink(dest_path)
+        raise _too_large(config)
+    return dest_path
+
+
+def _upload_sha256(pdf_file: UploadFile, config: AppConfig) -> str:
+    _upload_size(pdf_file, config)
+    f = pdf_file.file
+    h = hashlib.sha256()
+    while chunk := f.read(UPLOAD_CHUNK_BYTES):
+        h.update(chunk)
+    f.seek(0)
+    return h.hexdigest()
+
+
+def _discard_upload(path: str) -> None:
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+async def _parse_upload(pdf_file: UploadFile, config: AppConfig) -> Dict[str, str]:
+    pool: PdfWorkerPool = app.state.pdf_pool
+    if _upload_size(pdf_file, config) <= INLINE_UPLOAD_BYTES:
+        return await pool.parse(pdf_file.file.read())
+    upload_path = await _save_upload(pdf_file, config)
+    try:
+        return await pool.parse(upload_path)
+    finally:
+        os.unlink(upload_path)
+
+
 @app.post("/analyze")
 async def analyze_paper(
     pdf_file: UploadFile = File(...),
-    role: str = Form("You are a research analyst in biomedical AI. Your outputs must be rigorous, concise, faithful to the paper, and useful for downstream research."),
+    role: str = Form(DEFAULT_ROLE_FORM),
     provider: str = Form("ollama"),
     model: str = Form("llama3.2:1b"),
     sections: str = Form("abstract,methods,results,discussion"),
     max_words: int = Form(0),
     num_questions: int = Form(5),
+    no_cache: bool = Form(False),
+    mode: Optional[str] = Form(None),
+    compress: Optional[bool] = Form(None),
+    pack: Optional[bool] = Form(None),
+    stage_models: Optional[str] = Form(None),
+    small_model: Optional[str] = Form(None),
 ):
     import traceback
     import logging
     logger = logging.getLogger(__name__)
     
     try:
-        # Load config
-        config = AppConfig.from_env()
-        ensure_directories_exist(config)
-        
-        # Save uploaded file temporarily
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_file:
-            content = await pdf_file.read()
-            tmp_file.write(content)
-            tmp_path = tmp_file.name
-        
-        try:
-            # Extract text and split sections
-            text = extract_text_from_pdf(tmp_path)
-            sections_map = split_into_sections(text)
-            
-            # Parse sections filter
-            only_sections = [s.strip().lower() for s in sections.split(',') if s.strip()]
-            
-            # Run pipeline (no word limit enforced)
-            # Prefer async (concurrent) flow for providers that support async calls.
-            # We now use async for both OpenAI and Ollama to parallelize section summaries.
-            if provider in ("openai", "ollama"):
-                result = await run_pipeline_async(
-                    config=config,
-                    sections=sections_map,
-                    role=role,
-                    model=model,
-                    max_words=0,
-                    num_questions=num_questions,
-                    provider=provider,
-                    base_url="http://localhost:11434" if provider == "ollama" else None,
-                    only_sections=only_sections,
-                )
-            else:
-                result = run_pipeline_sync(
-                    config=config,
-                    sections=sections_map,
-                    role=role,
-                    model=model,
-                    max_words=0,
-                    num_questions=num_questions,
-                    provider=provider,
-                    base_url="http://localhost:11434" if provider == "ollama" else None,
-                    only_sections=only_sections,
-                )
-            
-            return {
-                "success": True,
-                "section_summaries": result.section_summaries,
-                "consolidated": result.consolidated,
-                "refined": result.refined,
-                "questions": result.questions,
-            }
-            
-        finally:
-            # Clean up temp file
-            os.unlink(tmp_path)
-            
+        config: AppConfig = app.state.config
+        params = _pipeline_params(
+            config, role, provider, model, sections, num_questions, no_cache, mode, compress, pack, stage_models, small_model
+        )
+
+        async def analyze() -> PipelineResult:
+            with metrics.track_run() as run:
+                # Extract text and split sections (timed as "extract"/"split" by the worker)
+                sections_map = await _parse_upload(pdf_file, config)
+
+                # Run pipeline (no word limit enforced)
+                # Prefer async (concurrent) flow for providers that support async calls.
+                # We now use async for both OpenAI and Ollama to parallelize section summaries.
+                if provider in ("openai", "ollama"):
+                    result = await run_pipeline_async(config=config, sections=sections_map, **params)
+                else:
+                    result = run_pipeline_sync(config=config, sections=sections_map, **params)
+                payload = upload_payload(pdf_file.filename, sections_map, result.to_dict())
+                await asyncio.to_thread(record_result, config, payload, model or config.openai_model, "web")
+            result.timings = run.breakdown()
+            return result
+
+        if config.coalesce_enabled:
+            # The same PDF with the same settings already being analyzed: wait for that run instead
+            digest = await asyncio.to_thread(_upload_sha256, pdf_file, config)
+            result, coalesced = await ANALYSES.run(analysis_key(digest, params), analyze)
+        else:
+            result, coalesced = await analyze(), False
+
+        return {
+            "success": True,
+            "section_summaries": result.section_summaries,
+            "consolidated": result.consolidated,
+            "refined": result.refined,
+            "questions": result.questions,
+            "mode": result.mode,
+            "compression": result.compression,
+            "dedup": result.dedup,
+            "models": result.models,
+            "coalesced": coalesced,
+            "timings": result.timings,
+        }
+
+
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Analysis failed: {str(e)}\n{traceback.format_exc()}")
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
 
 
+
+def _sse(event: Dict[str, Any]) -> str:
+    return f"event: {event['event']}\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+
+
+@app.post("/analyze/stream")
+async def analyze_paper_stream(
+    pdf_file: UploadFile = File(...),
+    role: str = Form(DEFAULT_ROLE_FORM),
+    provider: str = Form("ollama"),
+    model: str = Form("llama3.2:1b"),
+    sections: str = Form("abstract,methods,results,discussion"),
+    max_words: int = Form(0),
+    num_questions: int = Form(5),
+    no_cache: bool = Form(False),
+    mode: Optional[str] = Form(None),
+    compress: Optional[bool] = Form(None),
+    pack: Optional[bool] = Form(None),
+    stage_models: Optional[str] = Form(None),
+    small_model: Optional[str] = Form(None),
+):
+    config: AppConfig = app.state.config
+    # Validate before saving: a 400 here must not leave the upload behind
+    params = _pipeline_params(
+        config, role, provider, model, sections, num_questions, no_cache, mode, compress, pack, stage_models, small_model
+    )
+    upload_path = await _save_upload(pdf_file, config)
+    filename = pdf_file.filename
+
+    async def events():
+        try:
+            yield _sse({"event": "stage", "stage": "extract", "progress": 0.0})
+            # No track_run here: a context var can't span the yields of this generator,
+            # so the result's timings cover the LLM stages only.
+            sections_map = await app.state.pdf_pool.parse(upload_path)
+            async for event in stream_pipeline(config, sections_map, **params):
+                if event["event"] == "result":
+                    payload = upload_payload(filename, sections_map, event["result"])
+                    await asyncio.to_thread(record_result, config, payload, model or config.openai_model, "web")
+                yield _sse(event)
+        except Exception as e:
+            logger.exception("Streaming analysis failed")
+            yield _sse({"event": "error", "error": f"Analysis failed: {e}"})
+
+    # A background task, not the generator's finally: it also runs when the client
+    # disconnects before the generator is first iterated
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        background=BackgroundTask(_discard_upload, upload_path),
+    )
+
+
+@app.post("/jobs", status_code=202)
+async def submit_job(
+    pdf_file: UploadFile = File(...),
+    role: str = Form(DEFAULT_ROLE_FORM),
+    provider: str = Form("ollama"),
+    model: str = Form("llama3.2:1b"),
+    sections: str = Form("abstract,methods,results,discussion"),
+    max_words: int = Form(0),
+    num_questions: int = Form(5),
+    no_cache: bool = Form(False),
+    mode: Optional[str] = Form(None),
+    compress: Optional[bool] = Form(None),
+    pack: Optional[bool] = Form(None),
+    stage_models: Optional[str] = Form(None),
+    small_model: Optional[str] = Form(None),
+):
+    jobs: JobManager = app.state.jobs
+    params = _pipeline_params(
+        jobs.config,
+        role,
+        provider,
+        model,
+        sections,
+        num_questions,
+        no_cache,
+        mode,
+        compress,
+        pack,
+        stage_models,
+        small_model,
+    )
+    upload_path = await _save_upload(pdf_file, jobs.config)
+    try:
+        job = jobs.submit(upload_path, params, filename=pdf_file.filename or "")
+    except QueueFullError as e:
+        os.unlink(upload_path)
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "30"})
+    return {"job_id": job.id, "status": job.status, "queue_depth": jobs.stats()["queue_depth"]}
+
+
+@app.get("/jobs")
+async def job_stats():
+    return app.state.jobs.stats()
+
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    job = app.state.jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired job id")
+    return job.to_dict()
+
+
+@app.get("/health")
+async def health():
+    # Answered on the event loop, so slow responses here mean something is blocking it
+    return {
+        "status": "ok",
+        "pdf_pool": app.state.pdf_pool.stats(),
+        "jobs": app.state.jobs.stats(),
+        "llm_backends": backend_stats(),
+        "coalescing": coalescing_stats(),
+    }
+
+
+@app.get("/search")
+async def search_results(
+    q: str = "",
+    author: str = "",
+    id: str = "",
+    limit: int = Query(20, ge=1, le=200),
+    full: bool = False,
+):
+    """Look up stored results by keywords, author or arXiv/upload ID; ``full`` includes each stored result."""
+    config: AppConfig = app.state.config
+    if not config.results_store_enabled:
+        raise HTTPException(status_code=404, detail="The results store is disabled (RESULTS_STORE_ENABLED=0)")
+    start = time.perf_counter()
+
+    def search() -> List[Dict[str, Any]]:
+        store = get_results_store(config)
+        hits = store.search(q, author, id, limit)
+        if full:
+            for hit in hits:
+                hit["result"] = store.get(hit["id"])
+        return hits
+
+    hits = await asyncio.to_thread(search)
+    return {"count": len(hits), "seconds": round(time.perf_counter() - start, 4), "results": hits}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    # Gauges are sampled at scrape time rather than updated on every change
+    job_stats = app.state.jobs.stats()
+    metrics.JOBS_QUEUE_DEPTH.set(job_stats["queue_depth"])
+    metrics.JOBS_RUNNING.set(job_stats["running"])
+    for endpoint, stats in limiter_stats().items():
+        metrics.LLM_CONCURRENCY_LIMIT.set(stats["concurrency_limit"], endpoint=endpoint)
+    for pool in backend_stats():
+        for backend in pool["backends"]:
+            metrics.BACKEND_IN_FLIGHT.set(backend["in_flight"], backend=backend["url"])
+            metrics.BACKEND_HEALTHY.set(int(backend["healthy"]), backend=backend["url"])
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import asyncio
+import io
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple, TypeVar
+
+from . import metrics
+from .pdf_utils import PdfSource, extract_text_from_pdf, split_into_sections
+
+T = TypeVar("T")
+
+
+def _warm() -> None:
+    # Runs once per worker process: pay pypdf's lazy imports before the first real request
+    from pypdf import PdfReader, PdfWriter
+
+    buf = io.BytesIO()
+    writer = PdfWriter()
+    writer.add_blank_page(width=72, height=72)
+    writer.write(buf)
+    buf.seek(0)
+    PdfReader(buf).pages[0].extract_text()
+
+
+def _ready() -> int:
+    return os.getpid()
+
+
+def parse_pdf(source: PdfSource) -> Tuple[Dict[str, str], Dict[str, float]]:
+    """Extract and split one PDF (a path or its bytes) inside a worker; returns the sections and per-stage seconds."""
+    start = time.perf_counter()
+    text = extract_text_from_pdf(source, workers=1)  # already in a pool; don't nest another
+    extracted = time.perf_counter()
+    sections = split_into_sections(text)
+    return sections, {"extract": extracted - start, "split": time.perf_counter() - extracted}
+
+
+def _extract(source: PdfSource) -> str:
+    return extract_text_from_pdf(source, workers=1)
+
+
+class PdfWorkerPool:
+    """Warm process pool for CPU-bound PDF work, shared by every request in the web app or daemon.
+
+    Workers are spawned and warmed at :meth:`start`, and each is replaced after
+    ``max_tasks_per_child`` PDFs so leaks in parsing can't grow a worker without bound.
+    """
+
+    def __init__(self, workers: Optional[int] = None, max_tasks_per_child: Optional[int] = None) -> None:
+        self.workers = max(1, workers or (os.cpu_count() or 1))
+        self.max_tasks_per_child = max_tasks_per_child or None
+        self.pending = 0
+        self.completed = 0
+        self.failed = 0
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    async def start(self) -> None:
+        if self._executor is not None:
+            return
+        # max_tasks_per_child needs a non-fork start method; spawn is also safe with the loop's threads
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_warm,
+            max_tasks_per_child=self.max_tasks_per_child,
+        )
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self._executor, _ready) for _ in range(self.workers)))
+
+    async def stop(self) -> None:
+        if self._executor is None:
+            return
+        executor, self._executor = self._executor, None
+        await asyncio.to_thread(executor.shutdown, wait=True, cancel_futures=True)
+
+    def _update_gauges(self) -> None:
+        metrics.PDF_POOL_QUEUE_DEPTH.set(max(0, self.pending - self.workers))
+        metrics.PDF_POOL_BUSY.set(min(self.pending, self.workers))
+
+    @property
+    def started(self) -> bool:
+        return self._executor is not None
+
+    @contextmanager
+    def _task(self) -> Iterator[ProcessPoolExecutor]:
+        if self._executor is None:
+            raise RuntimeError("PdfWorkerPool is not started")
+        self.pending += 1
+        self._update_gauges()
+        try:
+            yield self._executor
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self.pending -= 1
+            self._update_gauges()
+        self.completed += 1
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        with self._task() as executor:
+            return await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+
+    def run_sync(self, fn: Callable[..., T], *args: Any) -> T:
+        """Like :meth:`run`, blocking the calling thread instead of awaiting."""
+        with self._task() as executor:
+            return executor.submit(fn, *args).result()
+
+    async def parse(self, source: PdfSource) -> Dict[str, str]:
+        """Extract and split a PDF path or bytes in a worker, recording extract/split/queue time."""
+        start = time.perf_counter()
+        sections, seconds = await self.run(parse_pdf, source)
+        for name, elapsed in seconds.items():
+            metrics.observe_stage(name, elapsed)
+        metrics.PDF_POOL_WAIT_SECONDS.observe(max(0.0, time.perf_counter() - start - sum(seconds.values())))
+        return sections
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "max_tasks_per_child": self.max_tasks_per_child,
+            "queue_depth": max(0, self.pending - self.workers),
+            "busy": min(self.pending, self.workers),
+            "completed": self.completed,
+            "failed": self.failed,
+        }
+
+
+_shared: Optional[PdfWorkerPool] = None
+
+
+def set_shared_pool(pool: Optional[PdfWorkerPool]) -> None:
+    """Register the pool that :func:`extract_text` should use (the daemon's), or ``None`` to clear it."""
+    global _shared
+    _shared = pool
+
+
+def extract_text(source: PdfSource) -> str:
+    """Extract a PDF's text in the shared warm pool when one is running, else in this process."""
+    pool = _shared
+    if pool is None or not pool.started:
+        return extract_text_from_pdf(source)
+    return pool.run_sync(_extract, source)